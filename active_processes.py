@@ -1,7 +1,34 @@
+"""
+active_processes.py
+
+List the running processes, to help fill in apps_list.txt.
+
+    python active_processes.py          print the running processes once
+    python active_processes.py --live   stream processes starting and exiting
+
+Both write their findings to found_processes.txt. The live mode prints one
+JSON line per process that started or exited:
+
+    {"time": 1718726400.0, "event": "started", "pid": 4242,
+     "name": "javaw.exe", "exe": "C:/Program Files/Java/bin/javaw.exe"}
+
+and, when it is stopped, a ranking of the programs by the CPU time they kept
+using while it ran. Games tend to top it, so the untracked programs at the
+top are suggested for apps_list.txt.
+
+Every sample is one psutil.process_iter call fetching the name, create time
+and CPU times of each process in one batch; the executable path is only
+looked up for processes that just started, so it can run for hours.
+"""
+
+import argparse
+import json
 import sys
+import time
 from pathlib import Path
+from typing import Callable, NamedTuple, TextIO
 
-import psutil
+from samplers import pick_sampler
 
 # Detect if running as an EXE
 if getattr(sys, "frozen", False):
@@ -12,18 +39,34 @@
 # Define tracked games file path
 FILE = BASE_DIR / Path("found_processes.txt")
 
+ATTRS = ["name", "create_time", "cpu_times"]
+BUSY_SHARE = 0.25  # Share of one core above which a process counts as busy
+IGNORED = {"", "System Idle Process", "System", "Registry", "Idle"}
+
+
+class Sample(NamedTuple):
+    name: str
+    cpu: float  # User and system CPU seconds since the process started
+
+
+class Usage(NamedTuple):
+    name: str
+    exe: str
+    cpu_seconds: float  # CPU time used while being watched
+    busy_seconds: float  # Time spent above BUSY_SHARE of a core
+
 
 def running_process():
     """
     Print a list of currently running processes.
 
-    This function uses the psutil library to iterate over all currently
-    running processes on the system, collects their names, and prints
+    This function takes one snapshot of the process table with the cheapest
+    available sampler backend, collects the process names, and prints
     them in a sorted order. Empty process names are excluded from the
     output.
     """
 
-    running_games = {p.name() for p in psutil.process_iter()}
+    running_games = {entry.name for entry in pick_sampler().snapshot().values()}
     with FILE.open("w") as file:
         print("\n[Processes]")
 
@@ -33,5 +76,163 @@ def running_process():
                 file.write(game + "\n")
 
 
+def sample_processes() -> dict[tuple[int, float], Sample]:
+    """Sample every process in one pass, keyed by (pid, create time)."""
+    import psutil
+
+    table = {}
+    for proc in psutil.process_iter(attrs=ATTRS, ad_value=None):
+        info = proc.info
+        cpu = info["cpu_times"]
+        key = (proc.pid, info["create_time"] or 0.0)
+        table[key] = Sample(info["name"] or "", cpu.user + cpu.system if cpu else 0.0)
+    return table
+
+
+def process_exe(pid: int) -> str:
+    import psutil
+
+    try:
+        return psutil.Process(pid).exe()
+    except psutil.Error:
+        return ""
+
+
+class LiveMonitor:
+    """
+    Diff successive samples of the process table and keep the CPU time used
+    by each program while it is watched.
+    """
+
+    def __init__(self, exe: Callable[[int], str] = process_exe) -> None:
+        """
+        Parameters:
+        exe (Callable): Returns the executable path of a PID, or "".
+        """
+        self.exe = exe
+        self.table: dict[tuple[int, float], Sample] = {}
+        self.exes: dict[tuple[int, float], str] = {}
+        self.usage: dict[str, Usage] = {}
+
+    def update(
+        self, table: dict[tuple[int, float], Sample], elapsed: float, now: float
+    ) -> list[dict]:
+        """
+        Account for a new sample, taken `elapsed` seconds after the previous
+        one, and return the processes that started and exited in between.
+        The first sample only sets the baseline.
+        """
+        events = []
+        first = not self.table
+        for key in table.keys() - self.table.keys():
+            self.exes[key] = self.exe(key[0])
+            if not first:
+                events.append(self._event(now, "started", key, table[key]))
+        for key in self.table.keys() - table.keys():
+            events.append(self._event(now, "exited", key, self.table[key]))
+            del self.exes[key]
+
+        for key, sample in table.items():
+            before = self.table.get(key)
+            if before is not None and sample.name not in IGNORED:
+                self._credit(
+                    sample.name, self.exes[key], sample.cpu - before.cpu, elapsed
+                )
+        self.table = table
+        return events
+
+    def _event(
+        self, now: float, event: str, key: tuple[int, float], sample: Sample
+    ) -> dict:
+        return {
+            "time": now,
+            "event": event,
+            "pid": key[0],
+            "name": sample.name,
+            "exe": self.exes[key],
+        }
+
+    def _credit(self, name: str, exe: str, cpu: float, elapsed: float) -> None:
+        cpu = max(cpu, 0.0)
+        usage = self.usage.get(name) or Usage(name, exe, 0.0, 0.0)
+        busy = elapsed if elapsed and cpu / elapsed >= BUSY_SHARE else 0.0
+        self.usage[name] = Usage(
+            name, usage.exe or exe, usage.cpu_seconds + cpu, usage.busy_seconds + busy
+        )
+
+    def ranking(self, top: int = 10) -> list[Usage]:
+        """The programs that were busy the longest, then used the most CPU."""
+        ranked = sorted(
+            self.usage.values(),
+            key=lambda usage: (-usage.busy_seconds, -usage.cpu_seconds, usage.name),
+        )
+        return [usage for usage in ranked if usage.cpu_seconds > 0][:top]
+
+
+def live(
+    output: TextIO,
+    interval: float = 5.0,
+    duration: float | None = None,
+    top: int = 10,
+) -> list[Usage]:
+    """Stream process starts and exits as JSON lines until interrupted."""
+    monitor = LiveMonitor()
+    start = last = time.monotonic()
+    try:
+        while duration is None or last - start < duration:
+            table = sample_processes()
+            now = time.monotonic()
+            for event in monitor.update(table, now - last, time.time()):
+                output.write(json.dumps(event) + "\n")
+            output.flush()
+            last = now
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    return monitor.ranking(top)
+
+
+def suggest(ranking: list[Usage], apps_list: Path) -> list[dict]:
+    """Mark which of the ranked programs apps_list already tracks."""
+    from game_matcher import GameMatcher
+    from tracker_engine import load_tracked_games
+
+    matcher = GameMatcher(load_tracked_games(apps_list))
+    return [
+        {**usage._asdict(), "tracked": matcher.matches(usage.name, usage.exe)}
+        for usage in ranking
+    ]
+
+
+def main(argv: list[str] | None = None) -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(description="List the running processes.")
+    parser.add_argument("--live", action="store_true", help="stream starts and exits")
+    parser.add_argument("--interval", type=float, default=5.0)
+    parser.add_argument("--duration", type=float, default=None)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    if not args.live:
+        running_process()
+        return
+
+    output = args.output.open("a") if args.output else sys.stdout
+    try:
+        ranking = suggest(
+            live(output, args.interval, args.duration, args.top),
+            BASE_DIR / "apps_list.txt",
+        )
+        output.write(json.dumps({"event": "ranking", "programs": ranking}) + "\n")
+    finally:
+        if args.output:
+            output.close()
+
+    with FILE.open("w") as file:
+        for usage in ranking:
+            if not usage["tracked"]:
+                file.write(usage["name"] + "\n")
+
+
 if __name__ == "__main__":
-    running_process()
+    main()
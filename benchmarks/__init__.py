@@ -0,0 +1 @@
+"""Benchmarks of game_time_limiter, run with python -m benchmarks.<name>."""
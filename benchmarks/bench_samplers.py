@@ -0,0 +1,96 @@
+"""
+bench_samplers.py
+
+Compare the psutil and procfs sampler backends on a synthetic process table.
+
+Usage:
+    python -m benchmarks.bench_samplers [--sizes 1000 10000] [--repeat 5]
+
+Both backends read the same generated procfs tree: ProcSampler is pointed at
+it directly and psutil is redirected to it through psutil.PROCFS_PATH, so the
+comparison is like for like and does not depend on the host's process count.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from samplers import ProcSampler, PsutilSampler
+
+STAT_TEMPLATE = (
+    "{pid} ({name}) S 1 {pid} {pid} 0 -1 4194560 100 0 0 0 5 3 0 0 20 0 1 0 "
+    "{start} 10000000 500 18446744073709551615 0 0 0 0 0 0 0 0 0 0 0 0 17 0 "
+    "0 0 0 0 0\n"
+)
+
+
+def make_fake_procfs(root: Path, count: int) -> Path:
+    """Create a procfs-like tree with `count` processes under `root`."""
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "stat").write_text("cpu  0 0 0 0\nbtime 1700000000\n")
+    for pid in range(1, count + 1):
+        name = f"proc{pid}.exe"
+        proc_dir = root / str(pid)
+        proc_dir.mkdir()
+        (proc_dir / "comm").write_text(name + "\n")
+        (proc_dir / "stat").write_text(
+            STAT_TEMPLATE.format(pid=pid, name=name, start=pid * 10)
+        )
+        os.symlink(f"/opt/games/{name}", proc_dir / "exe")
+    return root
+
+
+def best_of(func, repeat: int) -> float:
+    """Return the fastest of `repeat` timed calls, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def bench(count: int, repeat: int) -> dict[str, float]:
+    """Time one full snapshot with each backend over `count` processes."""
+    import psutil
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = make_fake_procfs(Path(tmp) / "proc", count)
+        results = {}
+
+        procfs = ProcSampler(str(root))
+        results[procfs.name] = best_of(procfs.snapshot, repeat)
+
+        original = psutil.PROCFS_PATH
+        psutil.PROCFS_PATH = str(root)
+        try:
+            ps = PsutilSampler()
+            results[ps.name] = best_of(ps.snapshot, repeat)
+            results[f"{ps.name} (per-pid)"] = best_of(
+                lambda: ps.describe_many(ps.pids()), repeat
+            )
+        finally:
+            psutil.PROCFS_PATH = original
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    if not sys.platform.startswith("linux"):
+        sys.exit("The sampler benchmark needs a Linux host.")
+
+    print(f"{'processes':>10}  {'backend':<18} {'best (ms)':>10}")
+    for count in args.sizes:
+        for backend, seconds in bench(count, args.repeat).items():
+            print(f"{count:>10}  {backend:<18} {seconds * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+bench_startup.py
+
+Benchmark how long the tracker takes to start and write the results as JSON.
+
+Usage:
+    python -m benchmarks.bench_startup [--repeat 10] [--output startup.json]
+                                       [--compare old.json] [--status-budget 70]
+
+Every case runs in a fresh interpreter, like the EXE at logon, and is timed
+from the outside:
+
+    python            an interpreter that does nothing, for reference
+    import/<module>   importing game_time_limiter, tracker_engine or wx
+    status            python game_time_limiter.py --status
+    first_tick        building the engine from settings and running one tick
+                      on the real process table
+
+The output has the same layout as bench_tracker, so --compare works the same.
+`status` also has a budget: its best run may take at most --status-budget ms
+more than the bare interpreter, or the exit status is 1. It only reads the
+log and asks the service, so it must not import the engine or socketserver.
+"""
+
+import argparse
+import importlib.util
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.bench_tracker import compare, git_commit, measure
+
+ROOT = Path(__file__).resolve().parent.parent
+STATUS_BUDGET_MS = 70.0  # Over the bare interpreter, best run
+
+FIRST_TICK = """
+import sys
+from pathlib import Path
+from settings import Settings
+from tracker_engine import TrackerEngine
+tmp = Path(sys.argv[1])
+settings = Settings(
+    log_path=tmp / "GameTimeLog.json",
+    apps_list=Path("apps_list.txt"),
+    history_path=tmp / "GameTimeHistory.db",
+    metrics_path=tmp / "GameTimeMetrics.jsonl",
+)
+engine = TrackerEngine.from_settings(settings)
+engine.tick()
+engine.close()
+"""
+
+
+def run(args: list[str]) -> None:
+    subprocess.run(
+        [sys.executable, *args], cwd=ROOT, check=True, stdout=subprocess.DEVNULL
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None)
+    parser.add_argument("--threshold", type=float, default=1.25)
+    parser.add_argument("--status-budget", type=float, default=STATUS_BUDGET_MS)
+    args = parser.parse_args(argv)
+
+    cases = {
+        "python": ["-c", "pass"],
+        "import/game_time_limiter": ["-c", "import game_time_limiter"],
+        "import/tracker_engine": ["-c", "import tracker_engine"],
+        "status": ["game_time_limiter.py", "--status"],
+    }
+    if importlib.util.find_spec("wx") is not None:
+        cases["import/wx"] = ["-c", "import wx"]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        cases["first_tick"] = ["-c", FIRST_TICK, tmp]
+        for case, command in cases.items():
+            results[case] = measure(lambda: run(command), args.repeat)
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+        "status_budget_ms": args.status_budget,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output is not None:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+    failed = False
+    status_ms = results["status"]["best_ms"] - results["python"]["best_ms"]
+    if status_ms > args.status_budget:
+        print(
+            f"[BUDGET] status: {status_ms:.2f} ms over python, "
+            f"budget {args.status_budget:.2f} ms",
+            file=sys.stderr,
+        )
+        failed = True
+
+    if args.compare is not None:
+        regressions = compare(
+            json.loads(args.compare.read_text()), report, args.threshold
+        )
+        for line in regressions:
+            print(f"[REGRESSION] {line}", file=sys.stderr)
+        failed = failed or bool(regressions)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
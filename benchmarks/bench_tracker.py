@@ -0,0 +1,277 @@
+"""
+bench_tracker.py
+
+Benchmark the tracker's hot paths and write the results as JSON.
+
+Usage:
+    python -m benchmarks.bench_tracker [--sizes 100 1000 10000] [--repeat 20]
+                                       [--output bench.json] [--compare old.json]
+
+Cases:
+    tick/<n>          a steady-state engine tick over a table of n processes,
+                      a few of which start and exit between ticks
+    first_tick/<n>    the first tick, which indexes the whole table
+    limit_tick        a tick that reaches the limit and enforces it
+    log/save, log/load, journal/record
+                      persisting the playtime of 1000 games
+    apps_list/load    reading and compiling an apps_list of 5000 entries
+    apps_list/match   classifying 10000 processes against it
+    discovery         find_game_executables over a 2000-folder library
+    simulation/30_days
+                      replaying a generated month of play with simulate.py
+
+Process tables are in-memory samplers, so the numbers measure the tracker
+and not the host. Each case reports the best and median of `repeat` runs in
+milliseconds. With --compare, cases whose median got slower than the
+threshold are listed and the exit status is 1, so the suite can gate a commit.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_find_games import make_library
+from enforcer import EnforcementResult
+from find_games import find_game_executables
+from game_matcher import GameMatcher
+from samplers import ProcessEntry, Sampler
+from simulate import generate, simulate
+from tracker_engine import TrackerEngine, load_tracked_games
+from usage_journal import JsonLogStore, UsageJournal
+
+GAMES = ["javaw.exe", "RobloxPlayerBeta.exe", "InfinityNikki.exe"]
+CHURN = 5  # Processes that start and exit between two ticks
+
+
+class TableSampler(Sampler):
+    """An in-memory process table of `count` processes."""
+
+    name = "table"
+
+    def __init__(self, count: int) -> None:
+        self.procs = {
+            pid: ProcessEntry(f"proc{pid}.exe", float(pid), ppid=1)
+            for pid in range(1, count + 1)
+        }
+        self.procs[count + 1] = ProcessEntry("javaw.exe", 1.0, ppid=1)
+        self.next_pid = count + 2
+        self.helpers: list[int] = []
+
+    def churn(self, count: int) -> None:
+        """Replace the helpers started by the previous churn with new ones."""
+        for pid in self.helpers:
+            del self.procs[pid]
+        self.helpers = list(range(self.next_pid, self.next_pid + count))
+        for pid in self.helpers:
+            self.procs[pid] = ProcessEntry("helper.exe", 2.0, ppid=1)
+        self.next_pid += count
+
+    def pids(self) -> list[int]:
+        return list(self.procs)
+
+    def describe(self, pid: int) -> ProcessEntry | None:
+        return self.procs.get(pid)
+
+
+class NullEnforcer:
+    def enforce(self, targets: dict[int, float]) -> EnforcementResult:
+        return EnforcementResult(sorted(targets), [], [])
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def measure(func, repeat: int, setup=None) -> dict[str, float]:
+    """Time `repeat` calls of `func`, each after an untimed `setup`, in ms."""
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "best_ms": min(timings),
+        "median_ms": statistics.median(timings),
+        "runs": repeat,
+    }
+
+
+def make_engine(tmp: Path, count: int, limit_minutes: int = 120):
+    clock = Clock()
+    sampler = TableSampler(count)
+    engine = TrackerEngine(
+        GAMES,
+        limit_minutes,
+        store=JsonLogStore(tmp / "GameTimeLog.json"),
+        sampler=sampler,
+        enforcer=NullEnforcer(),
+        clock=clock,
+        wall_clock=clock,
+    )
+    return engine, sampler, clock
+
+
+def bench_ticks(tmp: Path, sizes: list[int], repeat: int) -> dict:
+    results = {}
+    for count in sizes:
+        engines = []
+
+        def fresh():
+            engines.append(make_engine(tmp, count)[0])
+
+        results[f"first_tick/{count}"] = measure(
+            lambda: engines[-1].tick(), repeat, fresh
+        )
+
+        engine, sampler, clock = make_engine(tmp, count)
+        engine.tick()
+
+        def step():
+            sampler.churn(CHURN)
+            clock.now += 60
+
+        results[f"tick/{count}"] = measure(engine.tick, repeat, step)
+
+    engine, sampler, clock = make_engine(tmp, 1000, limit_minutes=0)
+
+    def over_limit():
+        engine.alert_shown = False
+        clock.now += 60
+
+    results["limit_tick"] = measure(engine.tick, repeat, over_limit)
+    return results
+
+
+def bench_persistence(tmp: Path, repeat: int) -> dict:
+    game_times = {f"Game{i:04}.exe": i / 7 for i in range(1000)}
+    store = JsonLogStore(tmp / "Bench.json")
+    results = {
+        "log/save": measure(lambda: store.save("2025-06-18", game_times), repeat),
+        "log/load": measure(lambda: store.load("2025-06-18"), repeat),
+    }
+    journal = UsageJournal(tmp / "BenchJournal.json")
+    journal.load("2025-06-18")
+    deltas = {game: 60.0 for game in GAMES}
+    results["journal/record"] = measure(
+        lambda: journal.record("2025-06-18", deltas, game_times), repeat
+    )
+    journal.close()
+    return results
+
+
+def bench_apps_list(tmp: Path, repeat: int) -> dict:
+    apps_list = tmp / "apps_list.txt"
+    lines = [f"Game{i:04}.exe" for i in range(4000)]
+    lines += [f"Studio{i:03}*.exe" for i in range(500)]
+    lines += [f"re:^Launcher{i:03}" for i in range(250)]
+    lines += [f"path:D:/Library{i:03}/**" for i in range(250)]
+    apps_list.write_text("\n".join(lines))
+
+    results = {
+        "apps_list/load": measure(
+            lambda: GameMatcher(load_tracked_games(apps_list)), repeat
+        )
+    }
+    table = [
+        (f"proc{i}.exe", f"C:/Program Files/App{i}/proc{i}.exe") for i in range(10000)
+    ]
+
+    def match_all():
+        matcher = GameMatcher(lines)
+        for name, exe in table:
+            matcher.matches(name, exe)
+
+    results["apps_list/match"] = measure(match_all, repeat)
+    return results
+
+
+def bench_discovery(tmp: Path, repeat: int) -> dict:
+    library = make_library(tmp / "common", 2000)
+    return {"discovery": measure(lambda: find_game_executables(library), repeat)}
+
+
+def bench_simulation(repeat: int) -> dict:
+    trace = generate(30, seed=1)
+    return {"simulation/30_days": measure(lambda: simulate(trace, GAMES), repeat)}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def compare(old: dict, new: dict, threshold: float) -> list[str]:
+    """Return a line for every case whose median is `threshold` times slower."""
+    regressions = []
+    for case, result in new["results"].items():
+        before = old.get("results", {}).get(case)
+        if before and result["median_ms"] > before["median_ms"] * threshold:
+            ratio = result["median_ms"] / before["median_ms"]
+            regressions.append(
+                f"{case}: {before['median_ms']:.2f} -> "
+                f"{result['median_ms']:.2f} ms ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None)
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        results = bench_ticks(tmp_path, args.sizes, args.repeat)
+        results.update(bench_persistence(tmp_path, args.repeat))
+        results.update(bench_apps_list(tmp_path, max(args.repeat // 4, 1)))
+        results.update(bench_discovery(tmp_path, max(args.repeat // 4, 1)))
+        results.update(bench_simulation(max(args.repeat // 10, 1)))
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output is not None:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.compare is not None:
+        regressions = compare(
+            json.loads(args.compare.read_text()), report, args.threshold
+        )
+        for line in regressions:
+            print(f"[REGRESSION] {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
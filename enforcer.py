@@ -0,0 +1,83 @@
+"""
+enforcer.py
+
+Stop tracked games once the time limit is reached.
+
+Every target gets its terminate signal at once, then all of them are waited
+for together with a bounded timeout, and whatever is still alive is killed.
+Stopping ten processes therefore takes about as long as stopping one, and a
+game that ignores the polite request cannot hang the tracker. Targets come
+from the tracker's process index, so enforcing never rescans the process table.
+"""
+
+from typing import NamedTuple, Protocol
+
+# psutil and the samplers may derive start times from different clocks and
+# round them differently; a reused PID starts well outside this margin.
+CREATE_TIME_TOLERANCE = 1.0
+
+
+class EnforcementResult(NamedTuple):
+    terminated: list[int]  # Exited after the terminate signal
+    killed: list[int]  # Had to be killed
+    survivors: list[int]  # Still running, usually for lack of permission
+
+
+class SupportsEnforce(Protocol):
+    """Anything the engine can hand its targets to, e.g. a replay's fake."""
+
+    def enforce(self, targets: dict[int, float]) -> EnforcementResult:
+        """Stop the target processes, given as {pid: create time}."""
+
+
+class Enforcer:
+    def __init__(self, timeout: float = 3.0, kill_timeout: float = 1.0) -> None:
+        """
+        Parameters:
+        timeout (float): Seconds to wait for the targets to exit after being
+                        asked to terminate, before they are killed.
+        kill_timeout (float): Seconds to wait for killed targets to disappear.
+        """
+        self.timeout = timeout
+        self.kill_timeout = kill_timeout
+
+    def enforce(self, targets: dict[int, float]) -> EnforcementResult:
+        """
+        Terminate the target processes, escalating to kill.
+
+        Parameters:
+        targets (dict[int, float]): PID -> create time recorded when the PID
+                        was sampled. PIDs that are gone or were reused by
+                        another process are skipped.
+        """
+        import psutil
+
+        procs = []
+        for pid, create_time in targets.items():
+            try:
+                proc = psutil.Process(pid)
+                if abs(proc.create_time() - create_time) <= CREATE_TIME_TOLERANCE:
+                    procs.append(proc)
+            except psutil.Error:
+                pass
+
+        self._signal(procs, "terminate")
+        gone, alive = psutil.wait_procs(procs, timeout=self.timeout)
+        terminated = sorted(proc.pid for proc in gone)
+
+        self._signal(alive, "kill")
+        gone, alive = psutil.wait_procs(alive, timeout=self.kill_timeout)
+        killed = sorted(proc.pid for proc in gone)
+
+        return EnforcementResult(terminated, killed, sorted(p.pid for p in alive))
+
+    @staticmethod
+    def _signal(procs: list, method: str) -> None:
+        """Call `method` ("terminate" or "kill") on every process."""
+        import psutil
+
+        for proc in procs:
+            try:
+                getattr(proc, method)()
+            except psutil.Error:
+                pass  # Gone already, or not ours to stop
@@ -0,0 +1,88 @@
+"""
+events.py
+
+Typed events published by the tracking engine, and the bus that delivers them.
+
+On every tick the engine compares the new sample with the previous one and
+publishes what changed as a single batch:
+
+    GameStarted        a tracked game started running
+    GameStopped        it is no longer running
+    MinuteCredited     playtime was credited to a running game
+    WarningThreshold   the 5-minute warning fired
+    LimitReached       the daily limit was reached
+
+With per-user budgets, playtime is credited and the warning and the limit fire
+per account: those events then carry the `user` they concern, which is empty
+otherwise.
+
+A tick on which nothing changed publishes nothing, so consumers such as
+persistence or the window only do work when there is something to do. New
+consumers subscribe to the bus without touching the tick itself.
+"""
+
+from typing import Callable, NamedTuple, Union
+
+
+class GameStarted(NamedTuple):
+    game: str
+    pids: frozenset[int]
+
+
+class GameStopped(NamedTuple):
+    game: str
+
+
+class MinuteCredited(NamedTuple):
+    date: str
+    game: str
+    seconds: float  # Credited on this tick
+    minutes: float  # Played today, this tick included, by `user` if set
+    user: str = ""
+
+
+class WarningThreshold(NamedTuple):
+    used_minutes: float
+    limit_minutes: int
+    user: str = ""
+
+
+class LimitReached(NamedTuple):
+    used_minutes: float
+    limit_minutes: int
+    user: str = ""
+
+
+Event = Union[GameStarted, GameStopped, MinuteCredited, WarningThreshold, LimitReached]
+Alert = Union[WarningThreshold, LimitReached]
+Consumer = Callable[[list[Event]], None]
+
+
+class EventBus:
+    """Deliver each batch of events to the consumers interested in it."""
+
+    def __init__(self) -> None:
+        self._consumers: list[tuple[Consumer, tuple[type, ...]]] = []
+
+    def subscribe(self, consumer: Consumer, *types: type) -> None:
+        """
+        Call `consumer` with the events of `types` in each batch, or with every
+        event if no type is given. Batches with none of them are not delivered.
+        Consumers are called in the order they subscribed.
+        """
+        self._consumers.append((consumer, types))
+
+    def unsubscribe(self, consumer: Consumer) -> None:
+        self._consumers = [
+            (subscribed, types)
+            for subscribed, types in self._consumers
+            if subscribed != consumer
+        ]
+
+    def publish(self, batch: list[Event]) -> None:
+        if not batch:
+            return
+        for consumer, types in list(self._consumers):
+            events = [e for e in batch if isinstance(e, types)] if types else batch
+            if events:
+                consumer(events)
@@ -1,5 +1,13 @@
+import argparse
+import json
+import os
+import re
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable
 
 # Detect if running as an EXE
 if getattr(sys, "frozen", False):
@@ -9,13 +17,166 @@
 
 # Define tracked games file path
 FILE = BASE_DIR / Path("found_games.txt")
+INDEX_FILE = BASE_DIR / Path("found_games_index.json")
 IGNORED_EXES = [
     "uninst.exe",
     "launcher.exe",
 ]
+STEAM_ROOT = Path("C:/Program Files (x86)/Steam")
+EPIC_MANIFESTS = Path("C:/ProgramData/Epic/EpicGamesLauncher/Data/Manifests")
+VDF_TOKEN = re.compile(r'"((?:[^"\\]|\\.)*)"|([{}])')
 
 
-def find_game_executables(platform_dir: Path) -> set[str]:
+def scan_dir(path: str) -> tuple[set[str], list[os.DirEntry]]:
+    """
+    List a directory once.
+
+    Returns the names of the executables directly inside it and the entries of
+    its subdirectories. The type information cached on each DirEntry is used,
+    so no entry is stat'ed again. Unreadable directories are treated as empty.
+    """
+    executables = set()
+    subdirs = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    subdirs.append(entry)
+                elif entry.name.lower().endswith(".exe"):
+                    if entry.name not in IGNORED_EXES:
+                        executables.add(entry.name)
+    except OSError:
+        pass
+    return executables, subdirs
+
+
+def dir_mtime(path: str) -> int:
+    """Return the modification time of a directory in ns, or -1 if it is gone."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
+
+
+def scan_game_folder(
+    game_folder: os.DirEntry | Path, mtimes: dict[str, int] | None = None
+) -> set[str]:
+    """
+    Find the executables of one game folder.
+
+    Scans the .exe files directly inside `game_folder`, then goes one level
+    deeper only for subdirectories whose names start with the folder's name.
+    If `mtimes` is given, the modification time of every directory listed is
+    recorded in it, taken before the listing so no change can slip through.
+    """
+    path = os.fspath(game_folder)
+    if mtimes is not None:
+        mtimes[path] = dir_mtime(path)
+    game_executables, subdirs = scan_dir(path)
+    prefix = game_folder.name.replace("Launcher", "")
+    for sub_folder in subdirs:
+        if sub_folder.name.startswith(prefix):
+            if mtimes is not None:
+                mtimes[sub_folder.path] = dir_mtime(sub_folder.path)
+            game_executables |= scan_dir(sub_folder.path)[0]
+    return game_executables
+
+
+class DiscoveryIndex:
+    """
+    On-disk index of scanned game folders.
+
+    For every game folder it remembers the modification times of the
+    directories that were listed and the executables found in them. A folder
+    is only listed again when one of those times changed, which is the case
+    whenever a file is added, removed or renamed directly inside it. Folders
+    that were not seen since the index was loaded are dropped when it is saved.
+
+    `scan` runs on the scanning thread pool; the bookkeeping it shares between
+    folders is updated under a lock.
+    """
+
+    def __init__(self, path: Path = INDEX_FILE) -> None:
+        self.path = path
+        self.folders: dict[str, dict] = {}
+        self.found: dict[str, list[str]] = {}
+        self._seen: set[str] = set()
+        self._lock = threading.Lock()
+        self.rescanned = 0
+        try:
+            with path.open("r") as file:
+                data = json.load(file)
+            self.folders = data.get("folders", {})
+            self.found = data.get("found", {})
+        except (OSError, ValueError):
+            pass
+
+    def scan(self, game_folder: os.DirEntry | Path) -> set[str]:
+        """Return the executables of a game folder, listing it only if it changed."""
+        path = os.fspath(game_folder)
+        with self._lock:
+            self._seen.add(path)
+        cached = self.folders.get(path)
+        if cached is not None and all(
+            dir_mtime(listed) == mtime for listed, mtime in cached["mtimes"].items()
+        ):
+            return set(cached["exes"])
+
+        mtimes: dict[str, int] = {}
+        executables = scan_game_folder(game_folder, mtimes)
+        with self._lock:
+            self.folders[path] = {"mtimes": mtimes, "exes": sorted(executables)}
+            self.rescanned += 1
+        return executables
+
+    def save(self, found: dict[str, set[str]]) -> None:
+        """Write the index with `found` as the latest result, minus stale folders."""
+        self.folders = {path: self.folders[path] for path in self._seen}
+        self.found = {platform: sorted(games) for platform, games in found.items()}
+        self._seen = set()
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open("w") as file:
+            json.dump({"folders": self.folders, "found": self.found}, file)
+        os.replace(tmp_path, self.path)
+
+
+def scan_libraries(
+    platform_dirs: dict[str, Path],
+    max_workers: int | None = None,
+    index: DiscoveryIndex | None = None,
+) -> dict[str, set[str]]:
+    """
+    Find the game executables of several platform directories at once.
+
+    The platform directories are listed concurrently, then every game folder
+    of every platform is scanned on a shared thread pool, which keeps several
+    disk requests in flight on slow drives.
+
+    Parameters:
+    platform_dirs (dict[str, Path]): Platform names mapped to their directories.
+    max_workers (int): Size of the thread pool; defaults to ThreadPoolExecutor's.
+    index (DiscoveryIndex): Skip game folders that did not change since the
+                        index last saw them.
+
+    Returns:
+    dict[str, set[str]]: The executable names found for each platform.
+    """
+    scan = index.scan if index is not None else scan_game_folder
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        listings = pool.map(lambda path: scan_dir(str(path))[1], platform_dirs.values())
+        futures = {
+            platform: [pool.submit(scan, folder) for folder in folders]
+            for platform, folders in zip(platform_dirs, listings)
+        }
+        return {
+            platform: set().union(*(future.result() for future in pending))
+            for platform, pending in futures.items()
+        }
+
+
+def find_game_executables(
+    platform_dir: Path, max_workers: int | None = None
+) -> set[str]:
     """
     Find all game executables in a given platform directory.
     Goes one level deeper only for subdirectories whose names
@@ -23,28 +184,129 @@ def find_game_executables(platform_dir: Path) -> set[str]:
 
     Parameters:
     platform_dir (Path): The directory to search for games.
+    max_workers (int): Size of the thread pool scanning the game folders.
 
     Returns:
     set[str]: A set of executable names found in the directory.
     """
-    game_executables = set()
-
-    for game_folder in platform_dir.iterdir():
-        if game_folder.is_dir():
-            # First level: scan for .exe files directly inside game_folder
-            for file in game_folder.glob("*.exe"):
-                if file.name not in IGNORED_EXES:
-                    game_executables.add(file.name)
-            # Second level: only scan subdirectories whose names start with
-            # game_folder's name
-            for sub_folder in game_folder.iterdir():
-                if sub_folder.is_dir() and sub_folder.name.startswith(
-                    game_folder.name.replace("Launcher", "")
-                ):
-                    for file in sub_folder.glob("*.exe"):
-                        if file.name not in IGNORED_EXES:
-                            game_executables.add(file.name)
-    return game_executables
+    return scan_libraries({"": platform_dir}, max_workers)[""]
+
+
+def _unescape(string: str) -> str:
+    return string.replace("\\\\", "\\").replace('\\"', '"')
+
+
+def parse_vdf(text: str) -> dict:
+    """
+    Parse Valve's text KeyValues format (.vdf and .acf files) into dicts.
+
+    Keys and values are quoted strings and nested sections are in braces.
+    Duplicate keys keep the last value.
+    """
+    root: dict = {}
+    stack = [root]
+    key = None
+    for match in VDF_TOKEN.finditer(text):
+        string, brace = match.groups()
+        if brace == "{":
+            section: dict = {}
+            stack[-1][key] = section
+            stack.append(section)
+            key = None
+        elif brace == "}":
+            if len(stack) > 1:
+                stack.pop()
+        elif key is None:
+            key = _unescape(string)
+        else:
+            stack[-1][key] = _unescape(string)
+            key = None
+    return root
+
+
+def read_vdf(path: Path) -> dict:
+    """Parse a .vdf or .acf file, or return an empty dict if it is unreadable."""
+    try:
+        return parse_vdf(path.read_text(encoding="utf-8", errors="replace"))
+    except OSError:
+        return {}
+
+
+def steam_libraries(steam_root: Path) -> list[Path]:
+    """
+    List every Steam library folder, on any drive.
+
+    Reads steamapps/libraryfolders.vdf under the Steam installation; the
+    installation itself is always a library.
+    """
+    libraries = [steam_root]
+    vdf = read_vdf(steam_root / "steamapps" / "libraryfolders.vdf")
+    folders = vdf.get("libraryfolders", vdf.get("LibraryFolders", {}))
+    for key, value in folders.items():
+        # Libraries are numbered; older files also hold stats such as
+        # "ContentStatsID" and store the path directly instead of in a section
+        if not key.isdigit():
+            continue
+        path = value.get("path") if isinstance(value, dict) else value
+        if path and Path(path) not in libraries:
+            libraries.append(Path(path))
+    return libraries
+
+
+def steam_installs(steam_root: Path) -> dict[str, Path]:
+    """Map every installed Steam game's name to its install directory."""
+    installs = {}
+    for library in steam_libraries(steam_root):
+        steamapps = library / "steamapps"
+        for manifest in sorted(steamapps.glob("appmanifest_*.acf")):
+            state = read_vdf(manifest).get("AppState", {})
+            installdir = state.get("installdir")
+            if installdir:
+                name = state.get("name", installdir)
+                installs[name] = steamapps / "common" / installdir
+    return installs
+
+
+def epic_installs(manifests_dir: Path) -> dict[str, Path]:
+    """Map every installed Epic game's name to its launch executable."""
+    installs = {}
+    for manifest in sorted(manifests_dir.glob("*.item")):
+        try:
+            item = json.loads(manifest.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        location = item.get("InstallLocation")
+        executable = item.get("LaunchExecutable")
+        if location and executable:
+            name = item.get("DisplayName", manifest.stem)
+            installs[name] = Path(location) / executable
+    return installs
+
+
+def steam_manifest_games(
+    steam_root: Path = STEAM_ROOT,
+    max_workers: int | None = None,
+    index: DiscoveryIndex | None = None,
+) -> set[str]:
+    """
+    Find Steam game executables from the app manifests.
+
+    Only the install directory each manifest points to is scanned, with the
+    same rules as find_game_executables, instead of walking every library.
+    """
+    scan = index.scan if index is not None else scan_game_folder
+    install_dirs = list(steam_installs(steam_root).values())
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return set().union(*pool.map(scan, install_dirs))
+
+
+def epic_manifest_games(manifests_dir: Path = EPIC_MANIFESTS) -> set[str]:
+    """Find Epic game executables from the launch executables in the manifests."""
+    return {
+        executable.name
+        for executable in epic_installs(manifests_dir).values()
+        if executable.is_file() and executable.name not in IGNORED_EXES
+    }
 
 
 def show_games(platform: str, games: set[str]):
@@ -64,10 +326,43 @@ def show_games(platform: str, games: set[str]):
             file.write(game + "\n")
 
 
-def epic():
+def write_games(found: dict[str, set[str]]):
     """
-    Scans the default EpicGames installation directory for games and prints a
-    list of found executables.
+    Print the games found on every platform and save them as one snapshot.
+
+    Unlike show_games, the output file is rewritten, so running the script
+    again does not pile up duplicate sections.
+
+    Parameters:
+    found (dict[str, set[str]]): Platform names mapped to their executables.
+    """
+    lines = []
+    for platform, games in found.items():
+        lines.append(f"\n[{platform}]")
+        lines.extend(sorted(games))
+    text = "\n".join(lines) + "\n"
+    print(text, end="")
+    with FILE.open("w") as file:
+        file.write(text)
+
+
+def add_to_apps_list(apps_list: Path, games: set[str]) -> set[str]:
+    """Append the games missing from an apps_list file and return them."""
+    existing = set()
+    if apps_list.exists():
+        with apps_list.open("r") as file:
+            existing = {line.strip() for line in file}
+    missing = games - existing
+    if missing:
+        with apps_list.open("a") as file:
+            for game in sorted(missing):
+                file.write(game + "\n")
+    return missing
+
+
+def epic_dir() -> Path:
+    """
+    Return the EpicGames installation directory.
 
     Note: You can update the default installation directory by modifying the
     `epic_dir` variable.
@@ -75,16 +370,12 @@ def epic():
     epic_dir = Path("D:/Epic/Games")  # custom directory
     if not epic_dir.is_dir():
         epic_dir = Path("C:/Program Files (x86)/Epic Games/Launcher/Engine/Programs")
+    return epic_dir
 
-    epic_games = find_game_executables(epic_dir)
-    # Print detected games
-    show_games("EpicGames", epic_games)
 
-
-def steam():
+def steam_dir() -> Path:
     """
-    Scans the default Steam installation directory for games and prints a
-    list of found executables.
+    Return the Steam installation directory.
 
     Note: You can update the default installation directory by modifying the
     `steam_dir` variable.
@@ -92,21 +383,114 @@ def steam():
     steam_dir = Path("D:/SteamLibrary/steamapps/common")  # custom directory
     if not steam_dir.is_dir():
         steam_dir = Path("C:/Program Files (x86)/Steam/steamapps/common")
+    return steam_dir
+
+
+def epic():
+    """
+    Scans the default EpicGames installation directory for games and prints a
+    list of found executables.
+    """
+    epic_games = find_game_executables(epic_dir())
+    # Print detected games
+    show_games("EpicGames", epic_games)
 
-    steam_games = find_game_executables(steam_dir)
+
+def steam():
+    """
+    Scans the default Steam installation directory for games and prints a
+    list of found executables.
+    """
+    steam_games = find_game_executables(steam_dir())
     # Print detected games
     show_games("Steam", steam_games)
 
 
-def main():
+def discover(mode: str, index: DiscoveryIndex | None = None) -> dict[str, set[str]]:
+    """
+    Find the installed games in "manifests" or "walk" mode.
+
+    In "manifests" mode the games are listed from the Steam and Epic manifests.
+    In "walk" mode the Steam and EpicGames directories are scanned at the same
+    time. "auto" uses the manifests when there are any and falls back to
+    walking the directories otherwise.
+    """
+    if mode == "auto":
+        steam_vdf = STEAM_ROOT / "steamapps" / "libraryfolders.vdf"
+        has_manifests = steam_vdf.is_file() or EPIC_MANIFESTS.is_dir()
+        mode = "manifests" if has_manifests else "walk"
+
+    if mode == "manifests":
+        return {
+            "Steam": steam_manifest_games(index=index),
+            "EpicGames": epic_manifest_games(),
+        }
+    return scan_libraries({"Steam": steam_dir(), "EpicGames": epic_dir()}, index=index)
+
+
+def watch(
+    mode: str,
+    index: DiscoveryIndex,
+    interval: float,
+    apps_list: Path | None = None,
+    passes: int | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+):
+    """
+    Rescan every `interval` seconds and report newly installed games.
+
+    Thanks to the index only changed game folders are listed again, so a pass
+    over an unchanged library costs one stat per folder. New games are
+    printed, optionally appended to `apps_list`, and the snapshot file is
+    rewritten whenever the result changes.
+    """
+    count = 0
+    while passes is None or count < passes:
+        previous = {platform: set(games) for platform, games in index.found.items()}
+        found = discover(mode, index)
+        index.save(found)
+        for platform, games in found.items():
+            new_games = games - previous.get(platform, set())
+            for game in sorted(new_games):
+                print(f"[New] {platform}: {game}")
+            if apps_list is not None and new_games:
+                add_to_apps_list(apps_list, new_games)
+        if found != previous:
+            write_games(found)
+        count += 1
+        if passes is None or count < passes:
+            sleep(interval)
+
+
+def main(argv: list[str] | None = None):
     """
     Main entry point of the script.
 
-    Calls both the `steam` and `epic` functions to scan their respective
-    directories for games and print a list of found executables.
+    Finds the installed games, see `discover` for the modes, and saves them to
+    the output file. Game folders are remembered in an index so that later
+    runs only look into the folders that changed; `--watch` keeps running and
+    reports newly installed games.
     """
-    steam()
-    epic()
+    parser = argparse.ArgumentParser(description="Find installed game executables.")
+    parser.add_argument("--mode", choices=["auto", "manifests", "walk"], default="auto")
+    parser.add_argument("--index", type=Path, default=INDEX_FILE)
+    parser.add_argument("--no-index", action="store_true")
+    parser.add_argument("--watch", action="store_true")
+    parser.add_argument("--interval", type=float, default=300.0)
+    parser.add_argument("--add-to", type=Path, default=None, metavar="APPS_LIST")
+    args = parser.parse_args(argv)
+
+    if args.watch:
+        watch(args.mode, DiscoveryIndex(args.index), args.interval, args.add_to)
+        return
+
+    index = None if args.no_index else DiscoveryIndex(args.index)
+    found = discover(args.mode, index)
+    if index is not None:
+        index.save(found)
+    write_games(found)
+    if args.add_to is not None:
+        add_to_apps_list(args.add_to, set().union(*found.values()))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,128 @@
+"""
+game_matcher.py
+
+Match processes against the entries of apps_list.txt.
+
+Each entry is one of:
+
+    javaw.exe                   an exact executable name
+    Minecraft*.exe              a glob on the executable name
+    re:^Roblox.*                a regular expression searched in the name
+    path:D:/SteamLibrary/**     a glob on the full executable path
+
+Exact names are matched as listed; name globs and path patterns ignore case,
+as Windows does. Exact names go into a set. The name globs and regexes are
+compiled into one combined regex and the path patterns into another, so
+classifying a process is one set lookup plus at most two regex searches no
+matter how many entries there are. Regexes that cannot share an alternation,
+because they set global flags such as (?i) or capture groups that their
+backreferences count on, are searched on their own. Results are memoized per
+(name, exe path).
+"""
+
+import fnmatch
+import re
+from typing import Iterable
+
+REGEX_PREFIX = "re:"
+PATH_PREFIX = "path:"
+GLOB_CHARS = "*?["
+
+
+def normalize_path(path: str) -> str:
+    """Make Windows paths comparable: forward slashes, case folded."""
+    return path.replace("\\", "/").casefold()
+
+
+def _combine(patterns: list[str]) -> list[re.Pattern]:
+    """
+    Compile `patterns` into as few regexes as possible: one alternation of
+    those without global flags or capturing groups, and each of the others.
+    """
+    compiled = [re.compile(pattern) for pattern in patterns]
+    simple = [
+        regex.pattern
+        for regex in compiled
+        if not regex.groups and not regex.flags & ~re.UNICODE
+    ]
+    if len(simple) < 2:
+        return compiled
+    try:
+        combined = re.compile("|".join(f"(?:{pattern})" for pattern in simple))
+    except re.error:  # pragma: no cover
+        return compiled
+    return [combined] + [regex for regex in compiled if regex.pattern not in simple]
+
+
+class GameMatcher:
+    def __init__(self, entries: Iterable[str], cache_size: int = 4096) -> None:
+        """
+        Compile the apps_list entries.
+
+        Parameters:
+        entries (Iterable[str]): Lines of apps_list.txt, comments already removed.
+        cache_size (int): How many (name, exe) results to memoize.
+        """
+        self.entries = set(entries)
+        self.names: set[str] = set()
+        self.cache_size = cache_size
+        self._cache: dict[tuple[str, str], bool] = {}
+
+        name_patterns: list[str] = []
+        path_patterns: list[str] = []
+        for entry in sorted(self.entries):
+            if entry.startswith(PATH_PREFIX):
+                path = normalize_path(entry.removeprefix(PATH_PREFIX).strip())
+                pattern = f"^{fnmatch.translate(path)}"
+                self._add(path_patterns, pattern, entry)
+            elif entry.startswith(REGEX_PREFIX):
+                self._add(
+                    name_patterns, entry.removeprefix(REGEX_PREFIX).strip(), entry
+                )
+            elif any(char in entry for char in GLOB_CHARS):
+                self._add(name_patterns, f"^(?i:{fnmatch.translate(entry)})", entry)
+            else:
+                self.names.add(entry)
+
+        self._name_regexes = _combine(name_patterns)
+        self._path_regexes = _combine(path_patterns)
+
+    @staticmethod
+    def _add(patterns: list[str], pattern: str, entry: str) -> None:
+        """Add `pattern` unless it does not compile on its own."""
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            print(f"[ERROR] Ignoring invalid apps_list entry {entry!r}: {e}")
+            return
+        patterns.append(pattern)
+
+    def __contains__(self, name: str) -> bool:
+        return self.matches(name)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def matches(self, name: str, exe: str = "") -> bool:
+        """Return True if a process with this name and exe path is a game."""
+        if name in self.names:
+            return True
+        key = (name, exe)
+        result = self._cache.get(key)
+        if result is None:
+            result = self._match(name, exe)
+            if len(self._cache) >= self.cache_size:
+                self._cache.clear()
+            self._cache[key] = result
+        return result
+
+    def _match(self, name: str, exe: str) -> bool:
+        if name and any(regex.search(name) for regex in self._name_regexes):
+            return True
+        if exe and self._path_regexes:
+            path = normalize_path(exe)
+            return any(regex.search(path) for regex in self._path_regexes)
+        return False
@@ -0,0 +1,190 @@
+"""
+metrics.py
+
+Per-tick instrumentation for the tracking engine.
+
+The engine times each phase of a tick (sampling, accounting, enforcement and
+persistence), and the window how long it takes to redraw, into fixed-bucket
+latency histograms and keeps a few counters and gauges. Every `export_interval`
+seconds, and on close, they are written to a file so a windowless EXE can
+still be diagnosed:
+
+    jsonl        one JSON object per export appended to the file, rotated to
+                 <file>.1 once it grows past `max_bytes`
+    prometheus   the text exposition format, rewritten atomically, for the
+                 node_exporter textfile collector
+
+With `profile=True` every tick also runs under cProfile and the stats are
+dumped next to the metrics file as <file>.prof on every export.
+"""
+
+import bisect
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+PREFIX = "game_time_limiter"
+BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class Histogram:
+    """Cumulative latency histogram over fixed bucket bounds, in seconds."""
+
+    def __init__(self, buckets: tuple[float, ...] = BUCKETS) -> None:
+        self.bounds = buckets
+        self.counts = [0] * (len(buckets) + 1)  # The last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """Return (upper bound, observations at or below it) pairs."""
+        pairs = []
+        total = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            pairs.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return pairs
+
+
+class Metrics:
+    def __init__(
+        self,
+        path: Path | None = None,
+        format: str = "jsonl",
+        export_interval: float = 60.0,
+        max_bytes: int = 1024 * 1024,
+        profile: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Parameters:
+        path (Path): File the metrics are exported to; kept in memory if None.
+        format (str): "jsonl" or "prometheus".
+        export_interval (float): Minimum seconds between two exports.
+        max_bytes (int): Rotate a JSON-lines file once it grows past this size.
+        profile (bool): Run every tick under cProfile.
+        clock (Callable): Monotonic clock used to time phases and exports.
+        """
+        if format not in ("jsonl", "prometheus"):
+            raise ValueError(f"Unknown metrics format: {format!r}")
+        self.path = path
+        self.format = format
+        self.export_interval = export_interval
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.histograms: dict[str, Histogram] = {}
+        self.counters: dict[str, float] = {}
+        self.gauges: dict[str, float] = {}
+        self.profiler = None
+        if profile:
+            import cProfile
+
+            self.profiler = cProfile.Profile()
+        self._last_export = clock()
+
+    @contextmanager
+    def time(self, phase: str) -> Iterator[None]:
+        """Observe how long the body takes in the histogram of `phase`."""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            histogram = self.histograms.get(phase)
+            if histogram is None:
+                histogram = self.histograms[phase] = Histogram()
+            histogram.observe(self.clock() - start)
+
+    @contextmanager
+    def profiling(self) -> Iterator[None]:
+        """Run the body under cProfile if profiling is enabled."""
+        if self.profiler is None:
+            yield
+            return
+        self.profiler.enable()
+        try:
+            yield
+        finally:
+            self.profiler.disable()
+
+    def count(self, name: str, value: float = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name: str, value: float) -> None:
+        self.gauges[name] = value
+
+    def maybe_export(self) -> None:
+        """Export if `export_interval` seconds have passed since the last one."""
+        if self.clock() - self._last_export >= self.export_interval:
+            self.export()
+
+    def export(self) -> None:
+        """Write the metrics, and the profile if enabled, to `path`."""
+        self._last_export = self.clock()
+        path = self.path
+        if path is None:
+            return
+        try:
+            if self.format == "prometheus":
+                self._write_prometheus(path)
+            else:
+                self._append_jsonl(path)
+            if self.profiler is not None:
+                self.profiler.dump_stats(path.with_name(path.name + ".prof"))
+        except OSError as e:
+            print(f"[ERROR] Failed to export metrics: {e}")
+
+    def snapshot(self) -> dict:
+        """Return the current metrics as a JSON-serializable dictionary."""
+        return {
+            "time": time.time(),
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+            "histograms": {
+                phase: {
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                    "buckets": dict(histogram.cumulative()),
+                }
+                for phase, histogram in list(self.histograms.items())
+            },
+        }
+
+    def prometheus(self) -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+        name = f"{PREFIX}_phase_seconds"
+        lines = [f"# TYPE {name} histogram"]
+        for phase, histogram in sorted(self.histograms.items()):
+            for bound, total in histogram.cumulative():
+                lines.append(f'{name}_bucket{{phase="{phase}",le="{bound}"}} {total}')
+            lines.append(f'{name}_sum{{phase="{phase}"}} {histogram.sum!r}')
+            lines.append(f'{name}_count{{phase="{phase}"}} {histogram.count}')
+        for counter, value in sorted(self.counters.items()):
+            lines.append(f"# TYPE {PREFIX}_{counter}_total counter")
+            lines.append(f"{PREFIX}_{counter}_total {value!r}")
+        for gauge, value in sorted(self.gauges.items()):
+            lines.append(f"# TYPE {PREFIX}_{gauge} gauge")
+            lines.append(f"{PREFIX}_{gauge} {value!r}")
+        return "\n".join(lines) + "\n"
+
+    def _write_prometheus(self, path: Path) -> None:
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(self.prometheus())
+        os.replace(tmp_path, path)
+
+    def _append_jsonl(self, path: Path) -> None:
+        line = json.dumps(self.snapshot()) + "\n"
+        try:
+            if path.stat().st_size + len(line) > self.max_bytes:
+                os.replace(path, path.with_name(path.name + ".1"))
+        except FileNotFoundError:
+            pass
+        with path.open("a") as file:
+            file.write(line)
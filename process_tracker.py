@@ -0,0 +1,236 @@
+"""
+process_tracker.py
+
+Incremental process-table tracking for game_time_limiter.
+"""
+
+from typing import Iterable
+
+from game_matcher import GameMatcher
+from samplers import ProcessEntry, Sampler, pick_sampler
+
+__all__ = ["ProcessEntry", "ProcessTracker"]
+
+
+class ProcessTracker:
+    """
+    Keep a PID -> (name, create_time) index of the process table between ticks.
+
+    Only PIDs that appeared or exited since the previous update are looked up,
+    so the per-tick work is proportional to the churn of the process table and
+    not to its size. Listing the PIDs and diffing them against the previous
+    tick is done with set operations.
+
+    PID reuse is handled by re-checking the creation time of every PID that
+    belongs to a tracked game on each update, plus a small rotating slice of
+    the remaining index, so a recycled PID is picked up within a bounded
+    number of ticks even if it was reused between two samples.
+
+    Processes are attributed to games by ancestry: a process started by a
+    tracked game, directly or through helpers, belongs to the outermost
+    tracked game of its tree and keeps belonging to it after the launcher
+    exits. Listing a launcher is therefore enough to count the game it starts,
+    and a game with many processes is still one running game. Attribution
+    happens once per new PID, through the PPID -> children index, so it stays
+    linear in the number of processes.
+
+    The account running a PID is looked up the first time it is asked for and
+    cached until the PID exits or is reused, so it costs one lookup per game
+    process however many ticks it runs for.
+    """
+
+    def __init__(
+        self,
+        tracked_games: Iterable[str] | GameMatcher,
+        sampler: Sampler | None = None,
+        revalidate: int = 32,
+    ) -> None:
+        """
+        Parameters:
+        tracked_games (Iterable[str] | GameMatcher): apps_list entries of the
+                        tracked games, or a matcher already compiled from them.
+        sampler (Sampler): Backend used to list and describe processes. The
+                        cheapest available backend is picked when omitted.
+        revalidate (int): How many untracked PIDs to re-check per update.
+        """
+        if isinstance(tracked_games, GameMatcher):
+            self.matcher = tracked_games
+        else:
+            self.matcher = GameMatcher(tracked_games)
+        self.sampler = sampler if sampler is not None else pick_sampler()
+        self._revalidate = revalidate
+        self._index: dict[int, ProcessEntry] = {}
+        self._games: dict[str, set[int]] = {}
+        self._owners: dict[int, str] = {}
+        self._children: dict[int, set[int]] = {}
+        self._users: dict[int, str] = {}
+        self._rotation: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def update(self) -> tuple[set[int], set[int]]:
+        """
+        Bring the index up to date with the process table.
+
+        Returns:
+            tuple[set[int], set[int]]: The PIDs that started and exited since
+            the previous update. A reused PID shows up in both sets.
+        """
+        current = set(self.sampler.pids())
+        known = self._index.keys()
+        exited = known - current
+        started = current - known
+
+        for pid in exited:
+            self._forget(pid)
+
+        fresh = self._stale_pids()
+        for pid in fresh:
+            exited.add(pid)
+            started.add(pid)
+            self._forget(pid)
+
+        entries = self.sampler.describe_many(started - fresh.keys())
+        entries.update(
+            (pid, entry) for pid, entry in fresh.items() if entry is not None
+        )
+        for pid, entry in entries.items():
+            self._remember(pid, entry)
+        self._attribute(set(entries))
+
+        started &= self._index.keys()
+        return started, exited
+
+    def running_games(self) -> dict[str, set[int]]:
+        """Return the tracked games that are running, with all their PIDs."""
+        return {game: set(pids) for game, pids in self._games.items()}
+
+    def game_pids(self) -> set[int]:
+        """Return the PIDs of every running tracked game."""
+        return {pid for pids in self._games.values() for pid in pids}
+
+    def entry(self, pid: int) -> ProcessEntry | None:
+        """Return the indexed entry for a PID, if any."""
+        return self._index.get(pid)
+
+    def descendants(self, pids: Iterable[int]) -> set[int]:
+        """
+        Return every indexed descendant of the given PIDs.
+
+        The PPID -> children index is kept up to date with the PID index, so
+        this walks only the process trees involved. A child that is older than
+        its recorded parent was orphaned and the parent PID was reused, so it
+        is not followed.
+        """
+        found: set[int] = set()
+        stack = list(pids)
+        while stack:
+            parent = stack.pop()
+            parent_entry = self._index.get(parent)
+            for child in self._children.get(parent, ()):
+                if child in found:
+                    continue
+                entry = self._index[child]
+                if parent_entry and entry.create_time < parent_entry.create_time:
+                    continue
+                found.add(child)
+                stack.append(child)
+        return found
+
+    def set_matcher(self, matcher: GameMatcher) -> None:
+        """Switch to a new apps_list and attribute every indexed PID again."""
+        self.matcher = matcher
+        self._owners.clear()
+        self._games.clear()
+        self._attribute(set(self._index))
+
+    def owner(self, pid: int) -> str | None:
+        """Return the game a PID is attributed to, if any."""
+        return self._owners.get(pid)
+
+    def user(self, pid: int) -> str:
+        """Return the account running a PID, "" if it cannot be told."""
+        user = self._users.get(pid)
+        if user is None:
+            user = self._users[pid] = self.sampler.username(pid)
+        return user
+
+    def _remember(self, pid: int, entry: ProcessEntry) -> None:
+        self._index[pid] = entry
+        self._children.setdefault(entry.ppid, set()).add(pid)
+
+    def _attribute(self, pending: set[int]) -> None:
+        """
+        Attribute the newly indexed PIDs to games.
+
+        A new process may be listed before its new parent, so the chain of
+        pending ancestors is walked first and resolved from the top down.
+        Every PID is visited once.
+        """
+        while pending:
+            chain = [pending.pop()]
+            while self._index[chain[-1]].ppid in pending:
+                ppid = self._index[chain[-1]].ppid
+                pending.discard(ppid)
+                chain.append(ppid)
+            for pid in reversed(chain):
+                game = self._inherited_owner(pid)
+                entry = self._index[pid]
+                if game is None and self.matcher.matches(entry.name, entry.exe):
+                    game = entry.name
+                if game is not None:
+                    self._owners[pid] = game
+                    self._games.setdefault(game, set()).add(pid)
+
+    def _inherited_owner(self, pid: int) -> str | None:
+        """Return the game of the parent, unless the parent PID was reused."""
+        entry = self._index[pid]
+        parent = self._index.get(entry.ppid)
+        if entry.ppid == pid or parent is None:
+            return None
+        if parent.create_time > entry.create_time:
+            return None
+        return self._owners.get(entry.ppid)
+
+    def _forget(self, pid: int) -> None:
+        entry = self._index.pop(pid, None)
+        if entry is None:
+            return
+        self._users.pop(pid, None)
+        siblings = self._children.get(entry.ppid)
+        if siblings is not None:
+            siblings.discard(pid)
+            if not siblings:
+                del self._children[entry.ppid]
+        game = self._owners.pop(pid, None)
+        if game is not None:
+            pids = self._games[game]
+            pids.discard(pid)
+            if not pids:
+                del self._games[game]
+
+    def _stale_pids(self) -> dict[int, ProcessEntry | None]:
+        """
+        Return indexed PIDs whose creation time no longer matches.
+
+        The returned dictionary maps each stale PID to its fresh entry, or None
+        if the process has gone away in the meantime.
+        """
+        candidates = self.game_pids()
+        if self._revalidate:
+            if not self._rotation:
+                self._rotation = list(self._index)
+            cut = max(len(self._rotation) - self._revalidate, 0)
+            candidates.update(self._rotation[cut:])
+            del self._rotation[cut:]
+
+        stale = {}
+        for pid in candidates:
+            entry = self._index.get(pid)
+            if entry is None:
+                continue
+            fresh = self.sampler.describe(pid)
+            if fresh is None or fresh.create_time != entry.create_time:
+                stale[pid] = fresh
+        return stale
@@ -0,0 +1,232 @@
+"""
+samplers.py
+
+Process-table sampler backends for game_time_limiter.
+
+A sampler answers two questions: which PIDs are running right now, and what
+is the name, executable path, creation time and parent of a given PID. It can
+also tell which account runs a PID, which is only asked for game processes.
+The psutil backend works everywhere; the procfs backend reads /proc directly
+on Linux and skips the per-process object creation that psutil does.
+"""
+
+import os
+import sys
+import time
+from typing import Iterable, NamedTuple
+
+
+class ProcessEntry(NamedTuple):
+    """What we remember about a PID between ticks."""
+
+    name: str
+    create_time: float
+    exe: str = ""
+    ppid: int = 0
+
+
+class Sampler:
+    """Base class for process-table samplers."""
+
+    name = "base"
+
+    def pids(self) -> list[int]:
+        """Return the PIDs currently in the process table."""
+        raise NotImplementedError
+
+    def describe(self, pid: int) -> ProcessEntry | None:
+        """
+        Look up a single process.
+
+        Returns None if the process is already gone. Processes we are not
+        allowed to inspect are returned with an empty name so that callers
+        do not look them up again on every tick.
+        """
+        raise NotImplementedError
+
+    def describe_many(self, pids: Iterable[int]) -> dict[int, ProcessEntry]:
+        """Look up several processes in one pass, skipping those that are gone."""
+        entries = {}
+        for pid in pids:
+            entry = self.describe(pid)
+            if entry is not None:
+                entries[pid] = entry
+        return entries
+
+    def snapshot(self) -> dict[int, ProcessEntry]:
+        """Describe every process in the table."""
+        return self.describe_many(self.pids())
+
+    def username(self, pid: int) -> str:
+        """
+        Return the name of the account running a process, without its Windows
+        domain, or "" if it is gone or cannot be inspected.
+        """
+        return ""
+
+
+class PsutilSampler(Sampler):
+    """Sampler backed by psutil, available on every platform."""
+
+    name = "psutil"
+
+    def __init__(self) -> None:
+        import psutil
+
+        self._psutil = psutil
+
+    def pids(self) -> list[int]:
+        return self._psutil.pids()
+
+    def describe(self, pid: int) -> ProcessEntry | None:
+        psutil = self._psutil
+        try:
+            proc = psutil.Process(pid)
+            with proc.oneshot():
+                name = proc.name()
+                create_time = proc.create_time()
+                ppid = proc.ppid()
+                try:
+                    exe = proc.exe()
+                except (psutil.AccessDenied, psutil.ZombieProcess):
+                    exe = ""
+            return ProcessEntry(name, create_time, exe, ppid)
+        except psutil.NoSuchProcess:
+            return None
+        except psutil.AccessDenied:
+            return ProcessEntry("", 0.0)
+
+    def username(self, pid: int) -> str:
+        try:
+            username = self._psutil.Process(pid).username()
+        except self._psutil.Error:
+            return ""
+        return username.rsplit("\\", 1)[-1]
+
+    def snapshot(self) -> dict[int, ProcessEntry]:
+        entries = {}
+        attrs = ["name", "create_time", "exe", "ppid"]
+        for proc in self._psutil.process_iter(attrs, ad_value=None):
+            info = proc.info
+            entries[proc.pid] = ProcessEntry(
+                info["name"] or "",
+                info["create_time"] or 0.0,
+                info["exe"] or "",
+                info["ppid"] or 0,
+            )
+        return entries
+
+
+class ProcSampler(Sampler):
+    """
+    Sampler that reads /proc/<pid>/comm, exe and stat directly (Linux only).
+
+    PIDs are listed with a single os.scandir pass over the procfs root.
+    """
+
+    name = "procfs"
+
+    def __init__(self, root: str = "/proc") -> None:
+        self.root = root
+        self._clock_ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self._boot_time = self._read_boot_time()
+        self._usernames: dict[int, str] = {}  # By UID
+
+    def _read_boot_time(self) -> float:
+        try:
+            with open(f"{self.root}/stat", "rb") as file:
+                for line in file:
+                    if line.startswith(b"btime"):
+                        return float(line.split()[1])
+        except OSError:
+            pass
+        return 0.0
+
+    def pids(self) -> list[int]:
+        with os.scandir(self.root) as entries:
+            return [int(entry.name) for entry in entries if entry.name.isdigit()]
+
+    def _read(self, path: str) -> bytes:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            return os.read(fd, 4096)
+        finally:
+            os.close(fd)
+
+    def username(self, pid: int) -> str:
+        try:
+            uid = os.stat(f"{self.root}/{pid}").st_uid
+        except OSError:
+            return ""
+        if uid not in self._usernames:
+            import pwd
+
+            try:
+                self._usernames[uid] = pwd.getpwuid(uid).pw_name
+            except KeyError:
+                self._usernames[uid] = str(uid)
+        return self._usernames[uid]
+
+    def describe(self, pid: int) -> ProcessEntry | None:
+        base = f"{self.root}/{pid}"
+        try:
+            stat = self._read(f"{base}/stat")
+            name = self._read(f"{base}/comm").rstrip(b"\n").decode(errors="replace")
+        except FileNotFoundError:
+            return None
+        except OSError:
+            return ProcessEntry("", 0.0)
+
+        try:
+            exe = os.readlink(f"{base}/exe")
+        except OSError:
+            exe = ""
+
+        # comm is truncated to 15 characters; prefer the executable's name then
+        if len(name) >= 15 and exe:
+            exe_name = os.path.basename(exe)
+            if exe_name.startswith(name):
+                name = exe_name
+
+        # Fields after the parenthesised comm: state, ppid, ... starttime is 20th
+        fields = stat.rsplit(b")", 1)[-1].split()
+        try:
+            ppid = int(fields[1])
+            create_time = self._boot_time + int(fields[19]) / self._clock_ticks
+        except (IndexError, ValueError):
+            ppid, create_time = 0, 0.0
+        return ProcessEntry(name, create_time, exe, ppid)
+
+
+def available_samplers() -> list[Sampler]:
+    """Return an instance of every sampler backend usable on this machine."""
+    samplers: list[Sampler] = []
+    if sys.platform.startswith("linux") and os.path.isdir("/proc/self"):
+        samplers.append(ProcSampler())
+    try:
+        samplers.append(PsutilSampler())
+    except ImportError:  # pragma: no cover
+        pass
+    return samplers
+
+
+def pick_sampler(candidates: list[Sampler] | None = None) -> Sampler:
+    """
+    Pick the cheapest sampler backend.
+
+    Each candidate takes one full snapshot of the process table and the
+    fastest one wins. With a single candidate no timing is done.
+    """
+    if candidates is None:
+        candidates = available_samplers()
+    if not candidates:
+        raise RuntimeError("No process sampler is available on this platform")
+    if len(candidates) == 1:
+        return candidates[0]
+
+    timings = []
+    for sampler in candidates:
+        start = time.perf_counter()
+        sampler.snapshot()
+        timings.append((time.perf_counter() - start, sampler))
+    return min(timings, key=lambda timing: timing[0])[1]
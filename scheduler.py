@@ -0,0 +1,64 @@
+"""
+scheduler.py
+
+Adaptive polling intervals for the tracking engine.
+"""
+
+
+class AdaptiveScheduler:
+    """
+    Decide how long to wait before the next tick.
+
+    While no tracked game is running the tracker backs off to a long idle
+    interval. While games are running it ticks at the active interval, and
+    shortens the wait so the next tick lands right on the warning or the limit
+    when one of them is closer than that. Once the limit is reached it keeps a
+    short enforcement interval so relaunched games are caught quickly.
+    """
+
+    def __init__(
+        self,
+        idle_interval: float = 180.0,
+        active_interval: float = 60.0,
+        enforce_interval: float = 15.0,
+        min_interval: float = 1.0,
+    ) -> None:
+        """
+        Parameters:
+        idle_interval (float): Seconds between ticks when nothing is running.
+        active_interval (float): Seconds between ticks while games are running.
+        enforce_interval (float): Seconds between ticks once the limit is hit.
+        min_interval (float): Lower bound for any interval.
+        """
+        self.idle_interval = idle_interval
+        self.active_interval = active_interval
+        self.enforce_interval = enforce_interval
+        self.min_interval = min_interval
+
+    @property
+    def max_interval(self) -> float:
+        return max(self.idle_interval, self.active_interval, self.enforce_interval)
+
+    def next_interval(
+        self, running: int, remaining: float, warning_remaining: float = 0.0
+    ) -> float:
+        """
+        Return the number of seconds until the next tick.
+
+        Parameters:
+        running (int): How many tracked games are running. Each of them burns
+                       budget at the same rate, so the budget runs out faster
+                       when several are open at once.
+        remaining (float): Seconds of budget left before the limit.
+        warning_remaining (float): Seconds of budget left before the warning.
+        """
+        if remaining <= 0:
+            return max(self.min_interval, self.enforce_interval)
+        if not running:
+            return max(self.min_interval, self.idle_interval)
+
+        interval = self.active_interval
+        for budget in (warning_remaining, remaining):
+            if budget > 0:
+                interval = min(interval, budget / running)
+        return max(self.min_interval, interval)
@@ -0,0 +1,133 @@
+"""
+settings.py
+
+Typed settings for game_time_limiter, parsed once from config.json.
+
+Nothing is read at import time: `load_settings` reads the file when it is
+called, and the result is passed to whatever needs it, so the tracker, the
+headless tools and the tests can each run with their own settings.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+
+def get_base() -> Path:
+    """Determine the correct base directory, whether running as a script or an EXE."""
+    if getattr(sys, "frozen", False):
+        return Path(sys.executable).parent  # pragma: no cover
+    else:
+        return Path(__file__).parent  # Script location
+
+
+DEFAULT_LOG_PATH = Path.home() / "AppData" / "Roaming" / "GameTimeLog.json"
+
+
+class Settings(NamedTuple):
+    """Everything config.json can set, with its default."""
+
+    limit_minutes: int = 120
+    log_path: Path = DEFAULT_LOG_PATH
+    apps_list: Path = Path("apps_list.txt")
+    password: str = "mysecurepassword"
+    persistence: str = "json"  # "json" or "journal"
+    history_path: Path = DEFAULT_LOG_PATH.with_name("GameTimeHistory.db")
+    metrics_path: Path = DEFAULT_LOG_PATH.with_name("GameTimeMetrics.jsonl")
+    metrics_format: str = "jsonl"  # "jsonl" or "prometheus"
+    profile: bool = False
+    sync_url: str | None = None
+    machine_id: str | None = None
+    sync_token: str | None = None  # Shared secret of the sync server
+    status_port: int = 8766  # Local port of the service mode's status socket
+    per_user: bool = False  # Give every account its own limit
+    user_limits: dict[str, int] = {}  # Limits of accounts, by username
+
+    @classmethod
+    def from_config(cls, config: dict, base_dir: Path | None = None) -> "Settings":
+        """
+        Build the settings from the parsed contents of config.json.
+
+        Paths that are not set default to files next to the log, and the apps
+        list to apps_list.txt in `base_dir`.
+        """
+        base_dir = base_dir if base_dir is not None else get_base()
+        log_path = Path(config.get("log_path", DEFAULT_LOG_PATH))
+        return cls(
+            limit_minutes=config.get("limit_minutes", 120),
+            log_path=log_path,
+            apps_list=Path(config.get("apps_list", base_dir / "apps_list.txt")),
+            password=config.get("password", "mysecurepassword"),
+            persistence=config.get("persistence", "json"),
+            history_path=Path(
+                config.get("history_path", log_path.with_name("GameTimeHistory.db"))
+            ),
+            metrics_path=Path(
+                config.get("metrics_path", log_path.with_name("GameTimeMetrics.jsonl"))
+            ),
+            metrics_format=config.get("metrics_format", "jsonl"),
+            profile=config.get("profile", False),
+            sync_url=config.get("sync_url"),
+            machine_id=config.get("machine_id"),
+            sync_token=config.get("sync_token"),
+            status_port=config.get("status_port", 8766),
+            per_user=config.get("per_user", False),
+            user_limits=config.get("user_limits", {}),
+        )
+
+    @property
+    def sync_cache_path(self) -> Path:
+        return self.log_path.with_name("GameTimeSync.json")
+
+    @property
+    def user_log_path(self) -> Path:
+        return self.log_path.with_name("GameTimeUsers.json")
+
+
+class FileWatcher:
+    """
+    Tell whether a file changed since the last poll, by its mtime and size.
+
+    Polling costs one stat call, so it can run on every tick.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._state = self._stat()
+
+    def _stat(self) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def poll(self) -> bool:
+        """Return True if the file was changed, created or removed."""
+        state = self._stat()
+        if state == self._state:
+            return False
+        self._state = state
+        return True
+
+    def forget(self) -> None:
+        """Report the file as changed on the next poll, e.g. to retry a read."""
+        self._state = (-1, -1)
+
+
+def load_config(config_file: Path) -> dict:
+    """Read config.json, or return an empty dictionary if there is none."""
+    if config_file.exists():
+        with config_file.open("r") as file:
+            return json.load(file)
+    return {}
+
+
+def load_settings(config_file: Path | None = None) -> Settings:
+    """Parse `config_file`, config.json in the base directory by default."""
+    base_dir = get_base()
+    if config_file is None:
+        config_file = base_dir / "config.json"
+    return Settings.from_config(load_config(config_file), base_dir)
@@ -0,0 +1,393 @@
+"""
+simulate.py
+
+Replay a trace of process snapshots through the tracking engine on a virtual
+clock.
+
+Usage:
+    python simulate.py generate trace.jsonl [--days 30] [--seed 1]
+    python simulate.py record trace.jsonl [--interval 15] [--duration 3600]
+    python simulate.py replay trace.jsonl [--limit 120] [--apps-list FILE]
+                       [--start 2025-06-16] [--output result.json]
+                       [--expect expected.json]
+
+A trace is a JSON-lines file with one snapshot of the process table per line,
+written whenever the table changed:
+
+    {"t": 3600.0, "procs": [[pid, name, create_time, ppid], ...]}
+
+`t` and the create times are in seconds from the start of the trace. Traces
+are generated from random play sessions, or recorded from the real process
+table.
+
+Replaying runs the real engine (matching, process tracking, accounting, the
+warning and limit state machine and the event consumers) at the intervals its
+scheduler asks for, but moves a virtual clock forward instead of sleeping, so
+a day of play replays in tens of milliseconds and a month in about a second.
+Games stopped by the engine disappear from the replayed table; a relaunch in
+the trace is a new process and is stopped again.
+
+The result has the minutes credited per day and game, when the warning and
+the limit fired, and what each tick cost. With --expect, the replay is
+compared with a previous result and the exit status is 1 if the minutes, the
+warnings or the limits differ, so a trace can serve as a regression oracle.
+"""
+
+import argparse
+import bisect
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+from enforcer import EnforcementResult
+from events import Event, LimitReached, WarningThreshold
+from samplers import ProcessEntry, Sampler, pick_sampler
+from scheduler import AdaptiveScheduler
+from tracker_engine import TrackerEngine, load_tracked_games
+
+GAMES = ["javaw.exe", "RobloxPlayerBeta.exe", "InfinityNikki.exe"]
+BACKGROUND = ["explorer.exe", "svchost.exe", "Discord.exe", "chrome.exe"]
+DAY = 24 * 60 * 60
+
+
+class Snapshot(NamedTuple):
+    t: float  # Seconds from the start of the trace
+    procs: dict[int, ProcessEntry]
+
+
+def save_trace(path: Path, snapshots: Iterable[Snapshot]) -> None:
+    with path.open("w") as file:
+        for snapshot in snapshots:
+            file.write(dump_snapshot(snapshot) + "\n")
+
+
+def dump_snapshot(snapshot: Snapshot) -> str:
+    procs = [
+        [pid, entry.name, round(entry.create_time, 3), entry.ppid]
+        for pid, entry in snapshot.procs.items()
+    ]
+    return json.dumps({"t": snapshot.t, "procs": procs})
+
+
+def load_trace(path: Path) -> list[Snapshot]:
+    snapshots = []
+    with path.open("r") as file:
+        for line in file:
+            if line.strip():
+                data = json.loads(line)
+                procs = {
+                    pid: ProcessEntry(name, create_time, ppid=ppid)
+                    for pid, name, create_time, ppid in data["procs"]
+                }
+                snapshots.append(Snapshot(data["t"], procs))
+    return snapshots
+
+
+def generate(
+    days: int, seed: int = 1, games: list[str] = GAMES, sessions: int = 3
+) -> list[Snapshot]:
+    """
+    Generate `days` days of play: up to `sessions` sessions a day, in the
+    afternoon or evening, of 10 minutes to 2.5 hours each, in whole seconds.
+    Half of the games start a helper child process. The same seed gives the
+    same trace.
+    """
+    rng = random.Random(seed)
+    background = {
+        pid: ProcessEntry(name, -DAY, ppid=1)
+        for pid, name in enumerate(BACKGROUND, start=100)
+    }
+    changes: list[tuple[float, int, dict[int, ProcessEntry]]] = []
+    pid = 1000
+    for day in range(days):
+        for _ in range(rng.randint(0, sessions)):
+            begin = day * DAY + round(rng.uniform(15, 21) * 3600)
+            procs = {pid: ProcessEntry(rng.choice(games), begin, ppid=1)}
+            if rng.random() < 0.5:
+                procs[pid + 1] = ProcessEntry("helper.exe", begin + 1, ppid=pid)
+            pid += 2
+            changes.append((begin, 1, procs))
+            changes.append((begin + round(rng.uniform(10, 150) * 60), 0, procs))
+    changes.sort(key=lambda change: (change[0], change[1]))
+
+    snapshots = [Snapshot(0.0, dict(background))]
+    table = dict(background)
+    for i, (t, started, procs) in enumerate(changes):
+        if started:
+            table.update(procs)
+        else:
+            for gone in procs:
+                del table[gone]
+        if i + 1 == len(changes) or changes[i + 1][0] != t:
+            snapshots.append(Snapshot(t, dict(table)))
+    snapshots.append(Snapshot(float(days * DAY), dict(background)))
+    return snapshots
+
+
+def record(
+    path: Path, interval: float, duration: float, sampler: Sampler | None = None
+) -> None:  # pragma: no cover
+    """Write a snapshot of the real process table whenever it changes."""
+    sampler = sampler if sampler is not None else pick_sampler()
+    start = time.time()
+    previous = None
+    with path.open("w") as file:
+        while time.time() - start < duration:
+            table = sampler.snapshot()
+            if table != previous:
+                procs = {
+                    pid: entry._replace(create_time=entry.create_time - start, exe="")
+                    for pid, entry in table.items()
+                }
+                file.write(dump_snapshot(Snapshot(time.time() - start, procs)) + "\n")
+                file.flush()
+                previous = table
+            time.sleep(interval)
+
+
+class VirtualClock:
+    """Serves as both the monotonic and the wall clock of a replay."""
+
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class TraceSampler(Sampler):
+    """The snapshot of the trace in effect at the time of the virtual clock."""
+
+    name = "trace"
+
+    def __init__(
+        self, snapshots: list[Snapshot], clock: VirtualClock, start: float
+    ) -> None:
+        self.clock = clock
+        self.start = start
+        self.times = [snapshot.t for snapshot in snapshots]
+        self.tables = [
+            {
+                pid: entry._replace(create_time=start + entry.create_time)
+                for pid, entry in snapshot.procs.items()
+            }
+            for snapshot in snapshots
+        ]
+        self.killed: set[tuple[int, float]] = set()
+
+    def table(self) -> dict[int, ProcessEntry]:
+        i = bisect.bisect_right(self.times, self.clock() - self.start) - 1
+        return self.tables[i] if i >= 0 else {}
+
+    def pids(self) -> list[int]:
+        return [
+            pid
+            for pid, entry in self.table().items()
+            if (pid, entry.create_time) not in self.killed
+        ]
+
+    def describe(self, pid: int) -> ProcessEntry | None:
+        entry = self.table().get(pid)
+        if entry is None or (pid, entry.create_time) in self.killed:
+            return None
+        return entry
+
+
+class TraceEnforcer:
+    """Remove the stopped processes from the replayed table."""
+
+    def __init__(self, sampler: TraceSampler) -> None:
+        self.sampler = sampler
+
+    def enforce(self, targets: dict[int, float]) -> EnforcementResult:
+        self.sampler.killed.update(targets.items())
+        return EnforcementResult(sorted(targets), [], [])
+
+
+class MemoryStore:
+    """Keep the playtime per day in memory, so replays never touch the disk."""
+
+    log_path = Path(os.devnull)  # Never written
+
+    def __init__(self) -> None:
+        self.days: dict[str, dict[str, float]] = {}
+
+    def load(self, today: str) -> dict:
+        return dict(self.days.get(today, {}))
+
+    def read(self, today: str) -> dict:
+        return self.load(today)
+
+    def record(self, date: str, deltas: dict[str, float], game_times: dict) -> bool:
+        return self.save(date, game_times)
+
+    def save(self, date: str, game_times: dict) -> bool:
+        self.days[date] = dict(game_times)
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+class SimulationResult(NamedTuple):
+    days: dict[str, dict[str, float]]  # Minutes credited per day and game
+    warnings: list[str]  # Local times the 5-minute warning fired
+    limits: list[str]  # Local times the limit was reached
+    enforcements: int
+    tick_seconds: list[float]  # What each tick cost, in real seconds
+
+    def outcome(self) -> dict:
+        """The part of the result that only depends on the trace."""
+        return {
+            "days": {
+                date: {game: round(minutes, 2) for game, minutes in games.items()}
+                for date, games in self.days.items()
+            },
+            "warnings": self.warnings,
+            "limits": self.limits,
+            "enforcements": self.enforcements,
+        }
+
+    def cost(self) -> dict:
+        ticks = self.tick_seconds
+        total = sum(ticks)
+        return {
+            "ticks": len(ticks),
+            "total_ms": total * 1000,
+            "mean_us": statistics.fmean(ticks) * 1e6 if ticks else 0.0,
+            "max_us": max(ticks, default=0.0) * 1e6,
+            "ticks_per_second": len(ticks) / total if total else 0.0,
+        }
+
+
+def local_time(seconds: float) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(seconds))
+
+
+def simulate(
+    snapshots: list[Snapshot],
+    tracked_games: Iterable[str],
+    limit_minutes: int = 120,
+    start: float | None = None,
+    scheduler: AdaptiveScheduler | None = None,
+) -> SimulationResult:
+    """
+    Replay `snapshots` from `start`, local midnight of 2025-06-16 by default,
+    until the last snapshot.
+    """
+    if start is None:
+        start = time.mktime(time.strptime("2025-06-16", "%Y-%m-%d"))
+    clock = VirtualClock(start)
+    sampler = TraceSampler(snapshots, clock, start)
+    store = MemoryStore()
+    engine = TrackerEngine(
+        tracked_games,
+        limit_minutes,
+        sampler=sampler,
+        scheduler=scheduler,
+        store=store,
+        enforcer=TraceEnforcer(sampler),
+        clock=clock,
+        wall_clock=clock,
+    )
+    warnings: list[str] = []
+    limits: list[str] = []
+
+    def on_alert(events: list[Event]) -> None:
+        for event in events:
+            alerts = warnings if isinstance(event, WarningThreshold) else limits
+            alerts.append(local_time(clock()))
+
+    engine.events.subscribe(on_alert, WarningThreshold, LimitReached)
+
+    end = start + (snapshots[-1].t if snapshots else 0.0)
+    tick_seconds = []
+    while clock() <= end:
+        begin = time.perf_counter()
+        report = engine.tick()
+        tick_seconds.append(time.perf_counter() - begin)
+        clock.advance(report.next_interval)
+    engine.close()
+
+    return SimulationResult(
+        store.days,
+        warnings,
+        limits,
+        int(engine.metrics.counters.get("enforcements", 0)),
+        tick_seconds,
+    )
+
+
+def differences(expected: dict, outcome: dict) -> list[str]:
+    """Return a line for every part of `outcome` that differs from `expected`."""
+    lines = []
+    for key in ("warnings", "limits", "enforcements"):
+        if expected.get(key) != outcome[key]:
+            lines.append(f"{key}: expected {expected.get(key)}, got {outcome[key]}")
+    expected_days = expected.get("days", {})
+    for date in sorted(expected_days.keys() | outcome["days"].keys()):
+        if expected_days.get(date) != outcome["days"].get(date):
+            lines.append(
+                f"{date}: expected {expected_days.get(date)},"
+                f" got {outcome['days'].get(date)}"
+            )
+    return lines
+
+
+def main(argv: list[str] | None = None) -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+    generating = commands.add_parser("generate")
+    generating.add_argument("trace", type=Path)
+    generating.add_argument("--days", type=int, default=30)
+    generating.add_argument("--seed", type=int, default=1)
+    recording = commands.add_parser("record")
+    recording.add_argument("trace", type=Path)
+    recording.add_argument("--interval", type=float, default=15.0)
+    recording.add_argument("--duration", type=float, default=3600.0)
+    replaying = commands.add_parser("replay")
+    replaying.add_argument("trace", type=Path)
+    replaying.add_argument("--limit", type=int, default=120)
+    replaying.add_argument("--apps-list", type=Path, default=Path("apps_list.txt"))
+    replaying.add_argument("--start", default="2025-06-16")
+    replaying.add_argument("--output", type=Path, default=None)
+    replaying.add_argument("--expect", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        save_trace(args.trace, generate(args.days, args.seed))
+        return
+    if args.command == "record":
+        record(args.trace, args.interval, args.duration)
+        return
+
+    result = simulate(
+        load_trace(args.trace),
+        load_tracked_games(args.apps_list),
+        args.limit,
+        time.mktime(time.strptime(args.start, "%Y-%m-%d")),
+    )
+    text = json.dumps({**result.outcome(), "cost": result.cost()}, indent=2)
+    if args.output is not None:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.expect is not None:
+        lines = differences(json.loads(args.expect.read_text()), result.outcome())
+        for line in lines:
+            print(f"[REGRESSION] {line}", file=sys.stderr)
+        if lines:
+            sys.exit(1)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,28 @@
+"""
+status_client.py
+
+Client side of the status socket served by tracker_service.
+
+`--status` only needs to send one line and read one line of JSON back, so it
+asks the service through this module and does not import socketserver or the
+engine.
+"""
+
+import json
+import socket
+
+HOST = "127.0.0.1"
+
+
+def query_status(port: int, timeout: float = 1.0) -> dict:
+    """Ask the service for its status. Raises OSError if it is not running."""
+    with socket.create_connection((HOST, port), timeout=timeout) as connection:
+        connection.sendall(b"status\n")
+        with connection.makefile("rb") as reply:
+            line = reply.readline()
+    if not line:
+        raise ConnectionError("the service closed the connection")
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        raise ConnectionError(f"malformed reply: {e}") from e
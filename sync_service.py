@@ -0,0 +1,384 @@
+"""
+sync_service.py
+
+Share one playtime budget between the computers of a household.
+
+One computer runs the sync server; the tracker on every computer runs a
+SyncClient. Clients push the seconds they credited and get back the minutes
+every computer has played today, so the limit applies to the household and
+not to each machine.
+
+The tick never waits for the network. SyncClient.record only adds the deltas
+to an in-memory batch; a background thread sends it every `interval` seconds.
+Each batch carries a sequence number and is resent unchanged until the
+server acknowledges it, and the server applies a sequence number only once,
+so a lost reply never counts a batch twice. Deltas credited while a batch is
+in flight, or while the server is unreachable, are coalesced into the next
+one. Unsent batches and the last known totals are cached on disk.
+
+    POST /usage  {"client": "den-pc", "seq": 7, "date": "2025-06-18",
+                  "days": {"2025-06-18": {"javaw.exe": 60.0}}}
+    ->           {"date": "2025-06-18", "seq": 7, "minutes": {"den-pc": 31.0, ...}}
+
+A client whose cache was lost starts counting from 1 again; the server
+replies with the last sequence number it applied, and the client continues
+from there.
+
+A batch is checked as a whole before anything is applied: the sequence number
+must be an integer and every delta a finite, non-negative number of seconds,
+so no computer can take minutes away. When "sync_token" is set in config.json,
+clients send it as a bearer token and the server refuses requests without it.
+"""
+
+import argparse
+import hmac
+import json
+import math
+import socket
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from usage_journal import atomic_write_json
+
+DEFAULT_PORT = 8765
+KEEP_DAYS = 31
+
+
+def check_days(days: object) -> dict[str, dict[str, float]]:
+    """
+    Return the {date: {game: seconds}} of a batch, or raise ValueError unless
+    every delta is a finite number of seconds that is not negative.
+    """
+    if not isinstance(days, dict):
+        raise ValueError("days must be an object")
+    for date, deltas in days.items():
+        if not isinstance(deltas, dict):
+            raise ValueError(f"deltas of {date} must be an object")
+        for game, seconds in deltas.items():
+            if isinstance(seconds, bool) or not isinstance(seconds, (int, float)):
+                raise ValueError(f"seconds of {game} must be a number")
+            if not math.isfinite(seconds) or seconds < 0:
+                raise ValueError(f"seconds of {game} must be finite and >= 0")
+    return days
+
+
+def check_batch(batch: object) -> tuple[str, int, str, dict[str, dict[str, float]]]:
+    """Return the client, seq, date and days of a batch, or raise ValueError."""
+    if not isinstance(batch, dict):
+        raise ValueError("batch must be an object")
+    client, seq, date = batch.get("client"), batch.get("seq"), batch.get("date")
+    if not isinstance(client, str) or not isinstance(date, str):
+        raise ValueError("client and date must be strings")
+    if isinstance(seq, bool) or not isinstance(seq, int) or seq < 0:
+        raise ValueError("seq must be a non-negative integer")
+    return client, seq, date, check_days(batch.get("days"))
+
+
+class SyncState:
+    """Minutes played per day, client and game, as kept by the server."""
+
+    def __init__(self, path: Path | None = None) -> None:
+        """
+        Parameters:
+        path (Path): JSON file the state is kept in; in memory only if None.
+        """
+        self.path = path
+        self.days: dict[str, dict[str, dict[str, float]]] = {}
+        self.seqs: dict[str, int] = {}
+        self._lock = threading.Lock()
+        if path is not None and path.exists():
+            try:
+                with path.open("r") as file:
+                    data = json.load(file)
+                self.days = data.get("days", {})
+                self.seqs = data.get("seqs", {})
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"[ERROR] Failed to load sync state: {e}")
+
+    def apply(self, client: str, seq: int, days: dict) -> bool:
+        """
+        Add a client's batch of seconds per game and day.
+
+        Returns False, and changes nothing, if the batch was applied before.
+        Raises ValueError, and changes nothing, if a delta is not valid.
+        """
+        check_days(days)
+        with self._lock:
+            if seq <= self.seqs.get(client, 0):
+                return False
+            self.seqs[client] = seq
+            for date, deltas in days.items():
+                games = self.days.setdefault(date, {}).setdefault(client, {})
+                for game, seconds in deltas.items():
+                    games[game] = games.get(game, 0) + seconds / 60
+            for date in sorted(self.days)[:-KEEP_DAYS]:
+                del self.days[date]
+            self._save()
+            return True
+
+    def last_seq(self, client: str) -> int:
+        with self._lock:
+            return self.seqs.get(client, 0)
+
+    def minutes(self, date: str) -> dict[str, float]:
+        """Return the minutes played on `date` per client."""
+        with self._lock:
+            clients = self.days.get(date, {})
+            return {client: sum(games.values()) for client, games in clients.items()}
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        try:
+            atomic_write_json(self.path, {"days": self.days, "seqs": self.seqs})
+        except OSError as e:
+            print(f"[ERROR] Failed to save sync state: {e}")
+
+
+class SyncHandler(BaseHTTPRequestHandler):
+    server: "SyncServer"
+
+    def do_POST(self) -> None:
+        if self.path != "/usage":
+            self.send_error(404)
+            return
+        if not self._authorized():
+            self.send_error(401)
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            client, seq, date, days = check_batch(json.loads(self.rfile.read(length)))
+        except ValueError:
+            self.send_error(400)
+            return
+        self.server.state.apply(client, seq, days)
+        state = self.server.state
+        body = json.dumps(
+            {
+                "date": date,
+                "seq": state.last_seq(client),
+                "minutes": state.minutes(date),
+            }
+        )
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def _authorized(self) -> bool:
+        token = self.server.token
+        if not token:
+            return True
+        sent = self.headers.get("Authorization", "")
+        return hmac.compare_digest(sent.encode(), f"Bearer {token}".encode())
+
+    def log_message(self, format, *args) -> None:
+        pass  # One line per tick and computer is just noise
+
+
+class SyncServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self, address: tuple[str, int], state: SyncState, token: str | None = None
+    ) -> None:
+        """
+        Parameters:
+        address (tuple[str, int]): Host and port to listen on.
+        state (SyncState): The minutes of every client.
+        token (str): Shared secret clients must send; anyone may sync if None.
+        """
+        super().__init__(address, SyncHandler)
+        self.state = state
+        self.token = token
+
+
+class SyncClient:
+    def __init__(
+        self,
+        url: str,
+        client_id: str | None = None,
+        cache_path: Path | None = None,
+        interval: float = 30.0,
+        timeout: float = 5.0,
+        token: str | None = None,
+    ) -> None:
+        """
+        Parameters:
+        url (str): Base URL of the sync server, e.g. "http://192.168.1.10:8765".
+        client_id (str): Name of this computer; the host name by default.
+        cache_path (Path): JSON file for unsent batches and the last totals.
+        interval (float): Seconds between two exchanges with the server.
+        timeout (float): Seconds to wait for the server before giving up.
+        token (str): Shared secret the server expects, if it has one.
+        """
+        self.url = url.rstrip("/")
+        self.client_id = client_id or socket.gethostname()
+        self.cache_path = cache_path
+        self.interval = interval
+        self.timeout = timeout
+        self.token = token
+
+        self.date = ""
+        self.seq = 0  # Last sequence number handed out
+        self.connected: bool | None = None
+        self._pending: dict[str, dict[str, float]] = {}
+        self._inflight: dict | None = None
+        self._totals: dict[str, dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._load_cache()
+
+    def record(self, date: str, deltas: dict[str, float]) -> None:
+        """Queue the seconds credited on this tick. Never blocks on the network."""
+        with self._lock:
+            self.date = date
+            day = self._pending.setdefault(date, {})
+            for game, seconds in deltas.items():
+                if seconds > 0:
+                    day[game] = day.get(game, 0) + seconds
+
+    def remote_minutes(self, date: str) -> float:
+        """Minutes the other computers played on `date`, as last reported."""
+        with self._lock:
+            minutes = self._totals.get(date, {})
+            return sum(m for client, m in minutes.items() if client != self.client_id)
+
+    def sync(self) -> bool:
+        """
+        Send the pending batch, or poll, and store the totals.
+
+        Returns False if the server could not be reached; the batch is then
+        kept and sent again by the next call.
+        """
+        with self._lock:
+            if self._inflight is None and any(self._pending.values()):
+                self.seq += 1
+                self._inflight = {"seq": self.seq, "days": self._pending}
+                self._pending = {}
+            batch = self._inflight or {"seq": self.seq, "days": {}}
+            date = self.date or time.strftime("%Y-%m-%d")
+            payload = {"client": self.client_id, "date": date, **batch}
+
+        try:
+            reply = self._post(payload)
+        except (OSError, ValueError) as e:
+            if self.connected is not False:
+                print(f"[ERROR] Failed to reach the sync server: {e}")
+            self.connected = False
+            self._save_cache()
+            return False
+
+        self.connected = True
+        self._acknowledge(batch, reply)
+        self._save_cache()
+        return True
+
+    def _acknowledge(self, batch: dict, reply: dict) -> None:
+        with self._lock:
+            self._totals = {reply["date"]: reply["minutes"]}
+            server_seq = reply.get("seq", 0)
+            if server_seq > self.seq:
+                # Our cache was lost: resend the batch numbered after the server's
+                self.seq = server_seq
+                if self._inflight is batch:
+                    self.seq += 1
+                    self._inflight = {**batch, "seq": self.seq}
+            elif self._inflight is batch:
+                self._inflight = None
+
+    def start(self) -> None:
+        """Sync in a background thread every `interval` seconds."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop the background thread and try one last time to send."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.sync()
+
+    def _run(self) -> None:
+        while True:
+            self.sync()
+            if self._stop.wait(self.interval):
+                return
+
+    def _post(self, payload: dict) -> dict:
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        request = urllib.request.Request(
+            f"{self.url}/usage", data=json.dumps(payload).encode(), headers=headers
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            reply = json.load(response)
+        if not isinstance(reply.get("minutes"), dict):
+            raise ValueError("malformed reply")
+        return reply
+
+    def _load_cache(self) -> None:
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        try:
+            with self.cache_path.open("r") as file:
+                data = json.load(file)
+        except (json.JSONDecodeError, OSError):
+            return
+        if data.get("client") != self.client_id:
+            return
+        self.seq = data.get("seq", 0)
+        self._pending = data.get("pending", {})
+        self._inflight = data.get("inflight")
+        self._totals = data.get("totals", {})
+
+    def _save_cache(self) -> None:
+        if self.cache_path is None:
+            return
+        with self._lock:
+            data = {
+                "client": self.client_id,
+                "seq": self.seq,
+                "pending": {date: dict(day) for date, day in self._pending.items()},
+                "inflight": self._inflight,
+                "totals": self._totals,
+            }
+        try:
+            atomic_write_json(self.cache_path, data)
+        except OSError as e:
+            print(f"[ERROR] Failed to save sync cache: {e}")
+
+
+def main(argv: list[str] | None = None) -> None:  # pragma: no cover
+    from settings import load_settings
+
+    parser = argparse.ArgumentParser(description="Run the playtime sync server.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--state", type=Path, default=Path("GameTimeSync.json"))
+    parser.add_argument("--config", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    token = load_settings(args.config).sync_token
+    if not token:
+        print("[WARNING] No sync_token in config.json: any computer can sync")
+    server = SyncServer((args.host, args.port), SyncState(args.state), token)
+    print(f"Serving playtime sync on {args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,87 @@
+"""
+test_active_processes.py
+
+Tests for active_processes.
+"""
+
+import os
+
+import pytest
+
+from active_processes import LiveMonitor, Sample, sample_processes, suggest
+
+# 🔧 Fixtures
+
+
+@pytest.fixture
+def monitor():
+    return LiveMonitor(exe=lambda pid: f"C:/Games/{pid}.exe")
+
+
+BASE = {(4, 1.0): Sample("System", 0.0), (10, 2.0): Sample("explorer.exe", 5.0)}
+
+
+# Live mode
+
+
+def test_first_sample_is_the_baseline(monitor):
+    assert monitor.update(dict(BASE), 0.0, 100.0) == []
+
+
+def test_starts_and_exits_are_streamed(monitor):
+    monitor.update(dict(BASE), 0.0, 100.0)
+    events = monitor.update({**BASE, (20, 3.0): Sample("javaw.exe", 0.0)}, 5.0, 105.0)
+    assert events == [
+        {
+            "time": 105.0,
+            "event": "started",
+            "pid": 20,
+            "name": "javaw.exe",
+            "exe": "C:/Games/20.exe",
+        }
+    ]
+    events = monitor.update(dict(BASE), 5.0, 110.0)
+    assert [(event["event"], event["pid"]) for event in events] == [("exited", 20)]
+    assert monitor.update(dict(BASE), 5.0, 115.0) == []
+
+
+def test_reused_pid_is_a_new_process(monitor):
+    monitor.update({(20, 3.0): Sample("a.exe", 0.0)}, 0.0, 100.0)
+    events = monitor.update({(20, 9.0): Sample("b.exe", 0.0)}, 5.0, 105.0)
+    assert sorted(event["event"] for event in events) == ["exited", "started"]
+
+
+def test_ranking_by_sustained_cpu(monitor):
+    game, browser = (20, 3.0), (30, 3.0)
+    start = {**BASE, game: Sample("javaw.exe", 0.0), browser: Sample("chrome.exe", 0.0)}
+    monitor.update(start, 0.0, 0.0)
+    for second in range(1, 5):
+        table = {
+            **BASE,
+            game: Sample("javaw.exe", second * 4.0),  # 80% of a core
+            browser: Sample("chrome.exe", 6.0),  # One burst
+            (4, 1.0): Sample("System", second * 100.0),  # Never ranked
+        }
+        monitor.update(table, 5.0, second * 5.0)
+
+    ranking = monitor.ranking()
+    assert [usage.name for usage in ranking] == ["javaw.exe", "chrome.exe"]
+    assert ranking[0].busy_seconds == 20.0
+    assert ranking[0].cpu_seconds == 16.0
+    assert ranking[0].exe == "C:/Games/20.exe"
+
+
+def test_suggestions_skip_tracked_games(monitor, tmp_path):
+    apps_list = tmp_path / "apps_list.txt"
+    apps_list.write_text("javaw.exe\n")
+    monitor.update({(20, 3.0): Sample("javaw.exe", 0.0)}, 0.0, 0.0)
+    monitor.update({(20, 3.0): Sample("javaw.exe", 1.0)}, 5.0, 5.0)
+    assert [usage["tracked"] for usage in suggest(monitor.ranking(), apps_list)] == [
+        True
+    ]
+
+
+def test_sample_processes_sees_this_process():
+    pytest.importorskip("psutil")
+    table = sample_processes()
+    assert os.getpid() in {pid for pid, _ in table}
@@ -0,0 +1,75 @@
+"""
+test_enforcer.py
+
+Tests for enforcer.
+"""
+
+import subprocess
+import sys
+
+import psutil
+import pytest
+
+from enforcer import Enforcer
+
+posix_only = pytest.mark.skipif(
+    sys.platform == "win32", reason="relies on POSIX signal handling"
+)
+
+# 🔧 Fixtures
+
+SLEEPER = "import time; time.sleep(60)"
+STUBBORN = (
+    "import signal, sys, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); "
+    "print('ready', flush=True); time.sleep(60)"
+)
+
+
+@pytest.fixture
+def spawn():
+    procs = []
+
+    def spawn(code):
+        proc = subprocess.Popen(
+            [sys.executable, "-c", code], stdout=subprocess.PIPE, text=True
+        )
+        procs.append(proc)
+        return proc
+
+    yield spawn
+    for proc in procs:
+        proc.kill()
+        proc.wait()
+
+
+def target(proc):
+    return {proc.pid: psutil.Process(proc.pid).create_time()}
+
+
+# Enforcement
+
+
+def test_terminates_all_targets_together(spawn):
+    first, second = spawn(SLEEPER), spawn(SLEEPER)
+    result = Enforcer(timeout=5).enforce(target(first) | target(second))
+    assert result.terminated == sorted([first.pid, second.pid])
+    assert result.killed == result.survivors == []
+    assert first.wait(5) is not None and second.wait(5) is not None
+
+
+@posix_only
+def test_escalates_to_kill(spawn):
+    stubborn = spawn(STUBBORN)
+    stubborn.stdout.readline()  # SIGTERM is ignored from here on
+    result = Enforcer(timeout=0.2).enforce(target(stubborn))
+    assert result.terminated == []
+    assert result.killed == [stubborn.pid]
+    assert stubborn.wait(5) is not None
+
+
+def test_skips_reused_and_missing_pids(spawn):
+    proc = spawn(SLEEPER)
+    created = psutil.Process(proc.pid).create_time()
+    result = Enforcer(timeout=0.2).enforce({proc.pid: created - 3600, 2**22 + 1: 0.0})
+    assert result == ([], [], [])
+    assert proc.poll() is None
@@ -0,0 +1,60 @@
+"""
+test_events.py
+
+Tests for events.
+"""
+
+import pytest
+
+from events import EventBus, GameStarted, GameStopped, LimitReached, MinuteCredited
+
+# 🔧 Fixtures
+
+
+@pytest.fixture
+def bus():
+    return EventBus()
+
+
+# Delivery
+
+
+def test_consumers_receive_whole_batches(bus):
+    batches = []
+    bus.subscribe(batches.append)
+    batch = [GameStarted("a.exe", frozenset({1})), GameStopped("b.exe")]
+    bus.publish(batch)
+    assert batches == [batch]
+
+
+def test_consumers_only_receive_their_types(bus):
+    credits, limits = [], []
+    bus.subscribe(credits.append, MinuteCredited)
+    bus.subscribe(limits.append, LimitReached)
+    credit = MinuteCredited("2025-06-18", "a.exe", 60.0, 1.0)
+    bus.publish([GameStarted("a.exe", frozenset({1})), credit])
+    assert credits == [[credit]]
+    assert limits == []  # Batches without their types are not delivered
+
+
+def test_empty_batch_is_not_delivered(bus):
+    batches = []
+    bus.subscribe(batches.append)
+    bus.publish([])
+    assert batches == []
+
+
+def test_consumers_run_in_subscription_order(bus):
+    calls = []
+    bus.subscribe(lambda events: calls.append("first"))
+    bus.subscribe(lambda events: calls.append("second"))
+    bus.publish([GameStopped("a.exe")])
+    assert calls == ["first", "second"]
+
+
+def test_unsubscribe(bus):
+    batches = []
+    bus.subscribe(batches.append)
+    bus.unsubscribe(batches.append)
+    bus.publish([GameStopped("a.exe")])
+    assert batches == []
@@ -0,0 +1,256 @@
+"""
+test_find_games.py
+
+Tests for find_games.
+"""
+
+import json
+
+import pytest
+
+import find_games as fg
+
+# 🔧 Fixtures
+
+
+def touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+
+
+@pytest.fixture
+def library(tmp_path):
+    root = tmp_path / "common"
+    touch(root / "Myst" / "Myst.exe")
+    touch(root / "Myst" / "uninst.exe")
+    touch(root / "Myst" / "readme.txt")
+    touch(root / "Myst" / "Myst_Data" / "CrashHandler.exe")
+    touch(root / "Myst" / "redist" / "vcredist.exe")
+    touch(root / "RivenLauncher" / "Riven" / "Riven.exe")
+    touch(root / "RivenLauncher" / "launcher.exe")
+    touch(root / "loose.exe")
+    return root
+
+
+@pytest.fixture
+def steam_root(tmp_path):
+    """A Steam install with a second library on another "drive"."""
+    root = tmp_path / "Steam"
+    other = tmp_path / "D" / "SteamLibrary"
+    vdf = (
+        '"libraryfolders"\n{\n'
+        '\t"0"\n\t{\n\t\t"path"\t\t"%s"\n'
+        '\t\t"apps"\n\t\t{\n\t\t\t"1"\t\t"100"\n\t\t}\n\t}\n'
+        '\t"1"\n\t{\n\t\t"path"\t\t"%s"\n\t}\n}\n'
+    ) % (str(root).replace("\\", "\\\\"), str(other).replace("\\", "\\\\"))
+    touch(root / "steamapps" / "libraryfolders.vdf")
+    (root / "steamapps" / "libraryfolders.vdf").write_text(vdf)
+
+    def install(library, appid, name, installdir, exes):
+        manifest = library / "steamapps" / f"appmanifest_{appid}.acf"
+        touch(manifest)
+        manifest.write_text(
+            f'"AppState"\n{{\n\t"appid"\t\t"{appid}"\n\t"name"\t\t"{name}"\n'
+            f'\t"installdir"\t\t"{installdir}"\n}}\n'
+        )
+        for exe in exes:
+            touch(library / "steamapps" / "common" / installdir / exe)
+
+    install(root, 1, "Myst", "Myst", ["Myst.exe", "uninst.exe"])
+    install(other, 2, "Riven", "Riven", ["Riven.exe", "Riven_Data/Crash.exe"])
+    install(other, 3, "Removed", "Removed", [])
+    # A folder without a manifest is not a Steam install and is skipped
+    touch(other / "steamapps" / "common" / "Leftover" / "Leftover.exe")
+    return root
+
+
+@pytest.fixture
+def epic_manifests(tmp_path):
+    manifests = tmp_path / "Manifests"
+    manifests.mkdir()
+    nikki = tmp_path / "Epic" / "InfinityNikki"
+    touch(nikki / "X6Game" / "Binaries" / "Win64" / "InfinityNikki.exe")
+    items = {
+        "A.item": {
+            "DisplayName": "Infinity Nikki",
+            "InstallLocation": str(nikki),
+            "LaunchExecutable": "X6Game/Binaries/Win64/InfinityNikki.exe",
+        },
+        "B.item": {
+            "DisplayName": "Uninstalled",
+            "InstallLocation": str(tmp_path / "Epic" / "Gone"),
+            "LaunchExecutable": "Gone.exe",
+        },
+    }
+    for name, item in items.items():
+        (manifests / name).write_text(json.dumps(item))
+    (manifests / "broken.item").write_text("{not json")
+    return manifests
+
+
+# Discovery
+
+
+def test_find_game_executables(library):
+    assert fg.find_game_executables(library) == {
+        "Myst.exe",
+        "CrashHandler.exe",
+        "Riven.exe",
+    }
+
+
+def test_single_worker_gives_same_result(library):
+    assert fg.find_game_executables(library, max_workers=1) == (
+        fg.find_game_executables(library)
+    )
+
+
+def test_scan_libraries(library, tmp_path):
+    touch(tmp_path / "epic" / "InfinityNikki" / "InfinityNikki.exe")
+    found = fg.scan_libraries(
+        {
+            "Steam": library,
+            "EpicGames": tmp_path / "epic",
+            "Missing": tmp_path / "nowhere",
+        }
+    )
+    assert found["EpicGames"] == {"InfinityNikki.exe"}
+    assert "Riven.exe" in found["Steam"]
+    assert found["Missing"] == set()
+
+
+# Manifests
+
+
+def test_parse_vdf():
+    text = '"a"\n{\n\t"b"\t"C:\\\\Games"\n\t"c"\n\t{\n\t\t"d"\t"say \\"hi\\""\n\t}\n}'
+    assert fg.parse_vdf(text) == {"a": {"b": "C:\\Games", "c": {"d": 'say "hi"'}}}
+
+
+def test_steam_libraries(steam_root, tmp_path):
+    assert fg.steam_libraries(steam_root) == [
+        steam_root,
+        tmp_path / "D" / "SteamLibrary",
+    ]
+
+
+def test_legacy_steam_libraries(tmp_path):
+    root = tmp_path / "Steam"
+    other = str(tmp_path / "D" / "SteamLibrary").replace("\\", "\\\\")
+    touch(root / "steamapps" / "libraryfolders.vdf")
+    (root / "steamapps" / "libraryfolders.vdf").write_text(
+        '"LibraryFolders"\n{\n'
+        '\t"TimeNextStatsReport"\t\t"1606785484"\n'
+        '\t"ContentStatsID"\t\t"-4714524398766128544"\n'
+        f'\t"1"\t\t"{other}"\n}}\n'
+    )
+    assert fg.steam_libraries(root) == [root, tmp_path / "D" / "SteamLibrary"]
+
+
+def test_steam_installs(steam_root, tmp_path):
+    installs = fg.steam_installs(steam_root)
+    assert installs["Riven"] == (
+        tmp_path / "D" / "SteamLibrary" / "steamapps" / "common" / "Riven"
+    )
+    assert set(installs) == {"Myst", "Riven", "Removed"}
+
+
+def test_steam_manifest_games(steam_root):
+    assert fg.steam_manifest_games(steam_root) == {"Myst.exe", "Riven.exe", "Crash.exe"}
+
+
+def test_epic_manifest_games(epic_manifests):
+    assert fg.epic_manifest_games(epic_manifests) == {"InfinityNikki.exe"}
+
+
+def test_missing_manifests(tmp_path):
+    assert fg.steam_manifest_games(tmp_path / "NoSteam") == set()
+    assert fg.epic_manifest_games(tmp_path / "NoEpic") == set()
+
+
+# Incremental index
+
+
+def test_index_skips_unchanged_folders(library, tmp_path):
+    index = fg.DiscoveryIndex(tmp_path / "index.json")
+    first = fg.scan_libraries({"Steam": library}, index=index)
+    assert index.rescanned == 2
+    index.save(first)
+
+    index = fg.DiscoveryIndex(tmp_path / "index.json")
+    assert fg.scan_libraries({"Steam": library}, index=index) == first
+    assert index.rescanned == 0
+
+
+def test_index_rescans_changed_folders(library, tmp_path):
+    index = fg.DiscoveryIndex(tmp_path / "index.json")
+    index.save(fg.scan_libraries({"Steam": library}, index=index))
+
+    index.rescanned = 0
+    touch(library / "Myst" / "Myst_Data" / "Editor.exe")
+    touch(library / "Obduction" / "Obduction.exe")
+    found = fg.scan_libraries({"Steam": library}, index=index)
+    assert {"Editor.exe", "Obduction.exe"} <= found["Steam"]
+    assert index.rescanned == 2
+
+
+def test_index_counts_concurrent_rescans(tmp_path):
+    root = tmp_path / "common"
+    for i in range(200):
+        touch(root / f"Game{i}" / f"Game{i}.exe")
+    index = fg.DiscoveryIndex(tmp_path / "index.json")
+    found = fg.scan_libraries({"Steam": root}, max_workers=16, index=index)
+    assert len(found["Steam"]) == 200
+    assert index.rescanned == 200
+
+
+def test_index_drops_removed_folders(library, tmp_path):
+    index = fg.DiscoveryIndex(tmp_path / "index.json")
+    index.save(fg.scan_libraries({"Steam": library}, index=index))
+    for path in sorted((library / "RivenLauncher").rglob("*"), reverse=True):
+        path.unlink() if path.is_file() else path.rmdir()
+    (library / "RivenLauncher").rmdir()
+
+    found = fg.scan_libraries({"Steam": library}, index=index)
+    index.save(found)
+    assert "Riven.exe" not in found["Steam"]
+    assert list(index.folders) == [str(library / "Myst")]
+
+
+def test_write_games_rewrites_snapshot(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(fg, "FILE", tmp_path / "found_games.txt")
+    for _ in range(2):
+        fg.write_games({"Steam": {"Riven.exe", "Myst.exe"}, "EpicGames": set()})
+    assert (tmp_path / "found_games.txt").read_text() == (
+        "\n[Steam]\nMyst.exe\nRiven.exe\n\n[EpicGames]\n"
+    )
+
+
+def test_watch_reports_new_games(library, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(fg, "FILE", tmp_path / "found_games.txt")
+    monkeypatch.setattr(fg, "steam_dir", lambda: library)
+    monkeypatch.setattr(fg, "epic_dir", lambda: tmp_path / "NoEpic")
+    apps_list = tmp_path / "apps_list.txt"
+    apps_list.write_text("Myst.exe\n")
+    index = fg.DiscoveryIndex(tmp_path / "index.json")
+
+    def install(seconds):
+        touch(library / "Obduction" / "Obduction.exe")
+
+    fg.watch("walk", index, 60, apps_list, passes=2, sleep=install)
+    out = capsys.readouterr().out
+    assert "[New] Steam: Riven.exe" in out
+    assert "[New] Steam: Obduction.exe" in out
+    assert apps_list.read_text().splitlines() == [
+        "Myst.exe",
+        "CrashHandler.exe",
+        "Riven.exe",
+        "Obduction.exe",
+    ]
+
+
+def test_show_games(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(fg, "FILE", tmp_path / "found_games.txt")
+    fg.show_games("Steam", {"Myst.exe"})
+    assert "[Steam]" in capsys.readouterr().out
+    assert (tmp_path / "found_games.txt").read_text() == "\n[Steam]\nMyst.exe\n"
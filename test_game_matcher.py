@@ -0,0 +1,95 @@
+"""
+test_game_matcher.py
+
+Tests for game_matcher.
+"""
+
+import pytest
+
+from game_matcher import GameMatcher
+
+# 🔧 Fixtures
+
+
+@pytest.fixture
+def matcher():
+    return GameMatcher(
+        {
+            "javaw.exe",
+            "Minecraft*.exe",
+            "re:^Roblox.*",
+            "path:D:/SteamLibrary/**",
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "name, exe, expected",
+    [
+        ("javaw.exe", "", True),
+        ("Minecraft.Windows.exe", "", True),
+        ("MinecraftDungeons.exe", "C:/XboxGames/MinecraftDungeons.exe", True),
+        ("minecraft.exe", "", True),  # Globs ignore case, like Windows
+        ("Javaw.exe", "", False),
+        ("RobloxPlayerBeta.exe", "", True),
+        ("NotRoblox.exe", "", False),
+        ("Myst.exe", "D:\\SteamLibrary\\steamapps\\common\\Myst\\Myst.exe", True),
+        ("Myst.exe", "d:/steamlibrary/steamapps/common/Myst/Myst.exe", True),
+        ("Myst.exe", "E:/SteamLibrary/Myst.exe", False),
+        ("explorer.exe", "C:/Windows/explorer.exe", False),
+        ("", "", False),
+    ],
+)
+def test_matches(matcher, name, exe, expected):
+    assert matcher.matches(name, exe) is expected
+
+
+def test_exact_names_are_kept_apart(matcher):
+    assert matcher.names == {"javaw.exe"}
+    assert len(matcher) == 4
+    assert "Minecraft.Windows.exe" in matcher
+
+
+def test_patterns_compile_to_two_regexes(matcher):
+    assert len(matcher._name_regexes) == 1
+    assert len(matcher._path_regexes) == 1
+
+
+def test_global_flags_are_searched_on_their_own():
+    matcher = GameMatcher({"Minecraft*.exe", "re:(?i)^roblox", "re:^Myst"})
+    assert len(matcher._name_regexes) == 2
+    assert matcher.matches("RobloxPlayerBeta.exe")
+    assert matcher.matches("minecraft.exe")
+    assert matcher.matches("Myst.exe")
+    assert not matcher.matches("myst.exe")
+
+
+def test_backreferences_keep_their_groups():
+    matcher = GameMatcher({"re:(b)\\1", "re:^a", "Minecraft*.exe"})
+    assert matcher.matches("bb.exe")
+    assert not matcher.matches("ba.exe")
+
+
+def test_results_are_memoized(matcher, monkeypatch):
+    calls = []
+    original = matcher._match
+    monkeypatch.setattr(
+        matcher, "_match", lambda *args: calls.append(args) or original(*args)
+    )
+    for _ in range(3):
+        matcher.matches("RobloxPlayerBeta.exe", "C:/Roblox/RobloxPlayerBeta.exe")
+    assert len(calls) == 1
+
+
+def test_cache_is_bounded():
+    matcher = GameMatcher({"re:^game"}, cache_size=10)
+    for i in range(25):
+        matcher.matches(f"proc{i}.exe")
+    assert len(matcher._cache) <= 10
+
+
+def test_invalid_regex_is_skipped(capsys):
+    matcher = GameMatcher({"re:([", "javaw.exe"})
+    assert "Ignoring invalid apps_list entry" in capsys.readouterr().out
+    assert matcher.matches("javaw.exe")
+    assert not matcher.matches("([")
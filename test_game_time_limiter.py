@@ -4,6 +4,9 @@
 Tests for game_time_limiter.
 """
 
+import subprocess
+import sys
+import threading
 from contextlib import contextmanager
 from pathlib import Path
 from unittest.mock import MagicMock, mock_open, patch
@@ -12,14 +15,40 @@
 import wx
 
 import game_time_limiter as gtl
+from settings import Settings
 
 # 🔧 Fixtures
 
 
 @pytest.fixture
-def tracker():
+def settings(tmp_path):
+    return Settings(
+        log_path=tmp_path / "GameTimeLog.json",
+        apps_list=Path(__file__).parent / "apps_list.txt",
+        history_path=tmp_path / "GameTimeHistory.db",
+        metrics_path=tmp_path / "GameTimeMetrics.jsonl",
+    )
+
+
+@pytest.fixture
+def make_tracker():
+    """Build windows whose worker threads are stopped after the test."""
+    trackers = []
+
+    def _make(*args):
+        trackers.append(gtl.GameTimeTracker(*args))
+        return trackers[-1]
+
+    yield _make
+    for tracker in trackers:
+        if tracker.worker._thread is not None:
+            tracker.worker.close()
+
+
+@pytest.fixture
+def tracker(settings, make_tracker):
     _ = wx.App(False)
-    return gtl.GameTimeTracker()
+    return make_tracker(settings)
 
 
 @pytest.fixture
@@ -53,9 +82,8 @@ def test_base_dir(tracker):
     assert "game_time_limiter" in str(tracker.get_base())
 
 
-def test_log_path(tracker):
-    expected = Path.home() / "AppData" / "Roaming" / "GameTimeLog.json"
-    assert tracker.log_path == expected
+def test_log_path(tracker, settings):
+    assert tracker.log_path == settings.log_path
 
 
 def test_game_times(tracker):
@@ -157,16 +185,44 @@ def test_log_file_loading(patch_path, log_content, expected):
         assert result == expected
 
 
+# Game list model
+
+
+def test_game_list_model_sorts_by_minutes():
+    model = gtl.GameListModel()
+    assert model.update({"a.exe": 5.5, "b.exe": 30, "c.exe": 5}) is None
+    assert model.rows == [("b.exe", 30), ("a.exe", 5), ("c.exe", 5)]
+    assert model.text(0, 0) == "b"
+    assert model.text(0, 1) == "30 min"
+
+
+def test_game_list_model_diffs_rows():
+    model = gtl.GameListModel(sort_by="name")
+    model.update({"a.exe": 1, "b.exe": 2, "c.exe": 3})
+    assert model.update({"a.exe": 1.4, "b.exe": 2.9, "c.exe": 3}) == []
+    assert model.update({"a.exe": 1, "b.exe": 4, "c.exe": 3}) == [1]
+    assert model.update({"a.exe": 1, "c.exe": 3}) is None
+
+
+def test_hidden_list_is_not_refreshed(tracker):
+    tracker.game_list.Hide()
+    with patch.object(tracker.game_list, "refresh") as mock_refresh:
+        tracker.on_tick(tracker.worker.tick())
+        mock_refresh.assert_not_called()
+        tracker.toggle_list(None)
+        mock_refresh.assert_called_once_with(tracker.report_times)
+
+
 # WX logic testing
 
 
-def test_ask_password_valid(monkeypatch):
+def test_ask_password_valid(monkeypatch, settings, make_tracker):
     _ = wx.App(False)
-    tracker = gtl.GameTimeTracker()
+    tracker = make_tracker(settings)
 
     mock_dialog = MagicMock()
     mock_dialog.ShowModal.return_value = wx.ID_OK
-    mock_dialog.GetValue.return_value = gtl.DEFAULT_PASSWORD
+    mock_dialog.GetValue.return_value = settings.password
 
     with patch("wx.TextEntryDialog", return_value=mock_dialog), patch.object(
         tracker, "Destroy"
@@ -175,8 +231,23 @@ def test_ask_password_valid(monkeypatch):
         mock_destroy.assert_called_once()
 
 
-def test_ask_password_invalid(monkeypatch, wx_app):
-    tracker = gtl.GameTimeTracker()
+def test_reports_queued_before_closing_are_dropped(wx_app, settings, make_tracker):
+    tracker = make_tracker(settings._replace(limit_minutes=1))
+    tracker.post_tick(limit_report(tracker))  # Queued for the GUI thread
+
+    mock_dialog = MagicMock()
+    mock_dialog.ShowModal.return_value = wx.ID_OK
+    mock_dialog.GetValue.return_value = settings.password
+    with patch("wx.TextEntryDialog", return_value=mock_dialog):
+        tracker.ask_password()
+    assert tracker.post_tick not in tracker.engine._subscribers
+
+    wx.Yield()
+    assert tracker.notification is None
+
+
+def test_ask_password_invalid(monkeypatch, wx_app, settings, make_tracker):
+    tracker = make_tracker(settings)
 
     mock_dialog = MagicMock()
     mock_dialog.ShowModal.return_value = wx.ID_OK
@@ -192,8 +263,8 @@ def test_ask_password_invalid(monkeypatch, wx_app):
         mock_destroy.assert_not_called()
 
 
-def test_ask_password_cancel(monkeypatch, wx_app):
-    tracker = gtl.GameTimeTracker()
+def test_ask_password_cancel(monkeypatch, wx_app, settings, make_tracker):
+    tracker = make_tracker(settings)
 
     mock_dialog = MagicMock()
     mock_dialog.ShowModal.return_value = wx.ID_CANCEL
@@ -208,8 +279,8 @@ def test_ask_password_cancel(monkeypatch, wx_app):
 # Saving log file testing
 
 
-def test_save_game_times(wx_app, tmp_path, capsys):
-    tracker = gtl.GameTimeTracker()
+def test_save_game_times(wx_app, tmp_path, capsys, settings, make_tracker):
+    tracker = make_tracker(settings)
     tracker.log_path = tmp_path / "bad_log.json"
     tracker.game_times = {"javaw.exe": 45}
 
@@ -217,3 +288,111 @@ def test_save_game_times(wx_app, tmp_path, capsys):
         tracker.save_game_times()
         out, err = capsys.readouterr()
         assert "Failed to save game times" in out
+
+
+# Settings and status
+
+
+def test_settings_from_config(tmp_path):
+    settings = Settings.from_config(
+        {"limit_minutes": 90, "log_path": "D:/logs/GameTimeLog.json"}, tmp_path
+    )
+    assert settings.limit_minutes == 90
+    assert settings.apps_list == tmp_path / "apps_list.txt"
+    assert settings.history_path == Path("D:/logs/GameTimeHistory.db")
+    assert settings.password == "mysecurepassword"
+
+
+def test_tracker_uses_settings(tmp_path, wx_app, settings, make_tracker):
+    apps_list = tmp_path / "apps_list.txt"
+    apps_list.write_text("game1.exe\n")
+    tracker = make_tracker(settings._replace(limit_minutes=45, apps_list=apps_list))
+    assert tracker.engine.limit_minutes == 45
+    assert tracker.tracked_games == {"game1.exe"}
+
+
+def test_status(settings):
+    settings.log_path.write_text(
+        '{"date": "2025-06-18", "game_times": {"javaw.exe": 45.2, "b.exe": 0.1}}'
+    )
+    assert gtl.status(settings, "2025-06-18") == (
+        "2025-06-18: 45/120 min used, 75 left\n  javaw: 45 min"
+    )
+    assert gtl.status(settings, "2025-06-19").startswith("2025-06-19: 0/120")
+
+
+def test_status_does_not_load_wx_or_the_engine(tmp_path):
+    heavy = ["wx", "psutil", "tracker_engine", "socketserver"]
+    code = (
+        "import sys, game_time_limiter as gtl, settings;"
+        f"gtl.status(settings.Settings(log_path=settings.Path({str(tmp_path)!r})));"
+        f"assert not sys.modules.keys() & {heavy!r}, sys.modules.keys() & {heavy!r}"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).parent)
+
+
+def test_limit_change_resizes_the_gauge(tmp_path, wx_app, settings, make_tracker):
+    config_file = tmp_path / "config.json"
+    config_file.write_text("{}")
+    tracker = make_tracker(settings, config_file)
+    config_file.write_text('{"limit_minutes": 45}')
+    tracker.on_tick(tracker.worker.tick())
+    assert tracker.engine.limit_minutes == 45
+    assert tracker.limit_minutes == 45  # The gauge follows
+
+
+# Worker thread
+
+
+def test_ticks_run_on_the_worker_thread(wx_app, settings, make_tracker):
+    posted = threading.Event()
+    threads = []
+
+    def call_after(func, report):
+        threads.append(threading.current_thread().name)
+        posted.set()
+
+    with patch("wx.CallAfter", side_effect=call_after):
+        tracker = make_tracker(settings)
+        assert posted.wait(5)  # The first tick runs at once
+    assert threads[0] == "TrackerEngine"
+    tracker.worker.close()
+    assert tracker.worker._thread is None
+
+
+def limit_report(tracker):
+    """Tick with the limit used up, so the warning and the limit fire."""
+    with tracker.worker.lock:  # So the worker thread cannot tick in between
+        tracker.engine.game_times["javaw.exe"] = 1
+        tracker.engine.alert_shown = tracker.engine.warning_shown = False
+        return tracker.engine.tick()
+
+
+def test_limit_notification_does_not_block(wx_app, settings, make_tracker):
+    tracker = make_tracker(settings._replace(limit_minutes=1))
+    with patch(
+        "wx.adv.NotificationMessage", wraps=wx.adv.NotificationMessage
+    ) as notification, patch("wx.MessageBox") as message_box:
+        tracker.on_tick(limit_report(tracker))
+    message_box.assert_not_called()
+    assert [call.args[:2] for call in notification.call_args_list] == [
+        ("Time Running Out", "Warning: You have 5 minutes left!"),
+        ("Limit Reached", "Your game time is up for today!"),
+    ]
+    # NotificationMessage only accepts a single icon as its flags
+    flags = [call.args[3] for call in notification.call_args_list]
+    assert flags == [wx.ICON_WARNING, wx.ICON_ERROR]
+
+
+def test_limit_notification_is_shown(wx_app, settings, make_tracker):
+    tracker = make_tracker(settings._replace(limit_minutes=1))
+    report = limit_report(tracker)
+    assert report.warning and report.limit_reached
+    tracker.on_tick(report)
+    assert tracker.notification is not None
+
+
+def test_redraw_is_timed(wx_app, settings, make_tracker):
+    tracker = make_tracker(settings._replace(limit_minutes=1))
+    tracker.on_tick(limit_report(tracker))
+    assert tracker.engine.metrics.histograms["gui"].count == 1
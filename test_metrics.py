@@ -0,0 +1,96 @@
+"""
+test_metrics.py
+
+Tests for metrics.
+"""
+
+import json
+
+import pytest
+
+from metrics import Histogram, Metrics
+
+# 🔧 Fixtures
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+# Recording
+
+
+def test_histogram_buckets():
+    histogram = Histogram((0.001, 0.01))
+    for seconds in (0.0005, 0.001, 0.002, 3.0):
+        histogram.observe(seconds)
+    assert histogram.cumulative() == [("0.001", 2), ("0.01", 3), ("+Inf", 4)]
+    assert histogram.sum == pytest.approx(3.0035)
+
+
+def test_phases_counters_and_gauges(clock):
+    metrics = Metrics(clock=clock)
+    with metrics.time("sample"):
+        clock.now += 0.02
+    metrics.count("ticks")
+    metrics.count("ticks")
+    metrics.set("processes", 312)
+    snapshot = metrics.snapshot()
+    assert snapshot["histograms"]["sample"]["count"] == 1
+    assert snapshot["histograms"]["sample"]["buckets"]["0.05"] == 1
+    assert snapshot["counters"] == {"ticks": 2}
+    assert snapshot["gauges"] == {"processes": 312}
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        Metrics(format="xml")
+
+
+# Export
+
+
+def test_jsonl_export_rotates(tmp_path, clock):
+    path = tmp_path / "metrics.jsonl"
+    metrics = Metrics(path, export_interval=60, max_bytes=300, clock=clock)
+    metrics.count("ticks")
+    metrics.maybe_export()
+    assert not path.exists()
+    for _ in range(4):
+        clock.now += 60
+        metrics.maybe_export()
+    lines = path.read_text().splitlines()
+    assert json.loads(lines[-1])["counters"] == {"ticks": 1}
+    assert (tmp_path / "metrics.jsonl.1").exists()
+    assert path.stat().st_size <= 300
+
+
+def test_prometheus_export(tmp_path, clock):
+    path = tmp_path / "metrics.prom"
+    metrics = Metrics(path, "prometheus", clock=clock)
+    with metrics.time("persist"):
+        clock.now += 0.2
+    metrics.count("save_failures")
+    metrics.export()
+    text = path.read_text()
+    assert 'game_time_limiter_phase_seconds_bucket{phase="persist",le="0.1"} 0' in text
+    assert 'game_time_limiter_phase_seconds_count{phase="persist"} 1' in text
+    assert "game_time_limiter_save_failures_total 1" in text
+
+
+def test_profile_is_dumped(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    metrics = Metrics(path, profile=True)
+    with metrics.profiling():
+        sum(range(1000))
+    metrics.export()
+    assert (tmp_path / "metrics.jsonl.prof").stat().st_size > 0
@@ -0,0 +1,223 @@
+"""
+test_process_tracker.py
+
+Tests for process_tracker.
+"""
+
+import pytest
+
+from game_matcher import GameMatcher
+from process_tracker import ProcessEntry, ProcessTracker
+from samplers import Sampler
+
+# 🔧 Fixtures
+
+
+class FakeTable(Sampler):
+    """A fake process table that counts how often each PID is looked up."""
+
+    def __init__(self, procs: dict[int, ProcessEntry]):
+        self.procs = dict(procs)
+        self.lookups: list[int] = []
+
+    def pids(self):
+        return list(self.procs)
+
+    def describe(self, pid):
+        self.lookups.append(pid)
+        return self.procs.get(pid)
+
+    def username(self, pid):
+        self.lookups.append(-pid)
+        return f"user{pid}"
+
+
+@pytest.fixture
+def table():
+    return FakeTable(
+        {
+            1: ProcessEntry("init", 1.0),
+            2: ProcessEntry("explorer.exe", 2.0),
+            3: ProcessEntry("javaw.exe", 3.0),
+        }
+    )
+
+
+@pytest.fixture
+def tracker(table):
+    return ProcessTracker(
+        {"javaw.exe", "RobloxPlayerBeta.exe"},
+        sampler=table,
+        revalidate=0,
+    )
+
+
+# Index maintenance
+
+
+def test_first_update_indexes_everything(tracker):
+    started, exited = tracker.update()
+    assert started == {1, 2, 3}
+    assert exited == set()
+    assert len(tracker) == 3
+    assert tracker.running_games() == {"javaw.exe": {3}}
+
+
+def test_only_churn_is_looked_up(table, tracker):
+    tracker.update()
+    table.lookups.clear()
+
+    table.procs[4] = ProcessEntry("RobloxPlayerBeta.exe", 4.0)
+    del table.procs[2]
+    started, exited = tracker.update()
+
+    assert started == {4}
+    assert exited == {2}
+    # The tracked javaw.exe PID is re-checked for reuse, PID 1 is not touched.
+    assert sorted(table.lookups) == [3, 4]
+    assert tracker.running_games() == {
+        "javaw.exe": {3},
+        "RobloxPlayerBeta.exe": {4},
+    }
+
+
+def test_exited_game_is_dropped(table, tracker):
+    tracker.update()
+    del table.procs[3]
+    tracker.update()
+    assert tracker.running_games() == {}
+    assert tracker.game_pids() == set()
+
+
+def test_pid_reuse_of_tracked_game(table, tracker):
+    tracker.update()
+    table.procs[3] = ProcessEntry("notepad.exe", 9.0)
+    started, exited = tracker.update()
+    assert 3 in started and 3 in exited
+    assert tracker.running_games() == {}
+    assert tracker.entry(3) == ProcessEntry("notepad.exe", 9.0)
+
+
+def test_pid_reuse_of_untracked_pid(table):
+    tracker = ProcessTracker({"javaw.exe"}, sampler=table, revalidate=8)
+    tracker.update()
+    table.procs[2] = ProcessEntry("javaw.exe", 20.0)
+    tracker.update()
+    assert tracker.running_games() == {"javaw.exe": {2, 3}}
+
+
+def test_patterns_and_exe_paths(table):
+    table.procs[6] = ProcessEntry("Myst.exe", 6.0, "D:/SteamLibrary/Myst/Myst.exe")
+    table.procs[7] = ProcessEntry("RobloxPlayerBeta.exe", 7.0)
+    tracker = ProcessTracker(
+        {"re:^Roblox", "path:D:/SteamLibrary/**"}, sampler=table, revalidate=0
+    )
+    tracker.update()
+    assert tracker.running_games() == {
+        "Myst.exe": {6},
+        "RobloxPlayerBeta.exe": {7},
+    }
+
+
+def test_descendants_follow_the_process_tree(table, tracker):
+    table.procs[4] = ProcessEntry("launcher.exe", 4.0, ppid=3)
+    table.procs[5] = ProcessEntry("crashpad.exe", 5.0, ppid=4)
+    table.procs[6] = ProcessEntry("notepad.exe", 6.0, ppid=2)
+    tracker.update()
+    assert tracker.descendants({3}) == {4, 5}
+    del table.procs[4]
+    tracker.update()
+    assert tracker.descendants({3}) == set()
+
+
+def test_descendants_skip_orphans_of_reused_parent(table, tracker):
+    # 5 was started before 4, so its parent was an earlier process with PID 4
+    table.procs[4] = ProcessEntry("launcher.exe", 4.0, ppid=3)
+    table.procs[5] = ProcessEntry("orphan.exe", 3.5, ppid=4)
+    tracker.update()
+    assert tracker.descendants({3}) == {4}
+
+
+# Attribution
+
+
+def test_children_count_against_the_launcher(table):
+    tracker = ProcessTracker({"MinecraftLauncher.exe"}, sampler=table, revalidate=0)
+    table.procs[4] = ProcessEntry("MinecraftLauncher.exe", 4.0, ppid=2)
+    table.procs[5] = ProcessEntry("javaw.exe", 5.0, ppid=4)
+    table.procs[6] = ProcessEntry("conhost.exe", 6.0, ppid=5)
+    tracker.update()
+    # javaw.exe 3 was not started by the launcher
+    assert tracker.running_games() == {"MinecraftLauncher.exe": {4, 5, 6}}
+    assert tracker.owner(6) == "MinecraftLauncher.exe"
+
+    # The game keeps running after the launcher exits
+    del table.procs[4]
+    tracker.update()
+    assert tracker.running_games() == {"MinecraftLauncher.exe": {5, 6}}
+
+
+def test_outermost_tracked_game_owns_the_tree(table):
+    tracker = ProcessTracker(
+        {"MinecraftLauncher.exe", "javaw.exe"}, sampler=table, revalidate=0
+    )
+    tracker.update()
+    table.procs[4] = ProcessEntry("MinecraftLauncher.exe", 4.0, ppid=2)
+    table.procs[5] = ProcessEntry("javaw.exe", 5.0, ppid=4)
+    tracker.update()
+    assert tracker.running_games() == {
+        "javaw.exe": {3},
+        "MinecraftLauncher.exe": {4, 5},
+    }
+
+
+def test_children_with_lower_pids_than_their_parent(table):
+    # PIDs wrap around, so a child is often seen before its parent
+    table.procs[6] = ProcessEntry("helper.exe", 8.0, ppid=7)
+    table.procs[7] = ProcessEntry("launcher.exe", 7.0, ppid=8)
+    table.procs[8] = ProcessEntry("Game.exe", 6.0, ppid=2)
+    tracker = ProcessTracker({"Game.exe"}, sampler=table, revalidate=0)
+    tracker.update()
+    assert tracker.running_games() == {"Game.exe": {6, 7, 8}}
+
+
+def test_reused_parent_pid_is_not_inherited(table):
+    tracker = ProcessTracker({"Game.exe"}, sampler=table, revalidate=0)
+    table.procs[4] = ProcessEntry("Game.exe", 4.0, ppid=2)
+    table.procs[5] = ProcessEntry("notepad.exe", 3.5, ppid=4)
+    table.procs[0] = ProcessEntry("System Idle Process", 0.0, ppid=0)
+    tracker.update()
+    assert tracker.running_games() == {"Game.exe": {4}}
+    assert tracker.owner(5) is None and tracker.owner(0) is None
+
+
+def test_new_matcher_reattributes_the_index(table, tracker):
+    table.procs[4] = ProcessEntry("launcher.exe", 4.0, ppid=2)
+    table.procs[5] = ProcessEntry("Game.exe", 5.0, ppid=4)
+    tracker.update()
+    tracker.set_matcher(GameMatcher({"launcher.exe"}))
+    assert tracker.running_games() == {"launcher.exe": {4, 5}}
+    assert tracker.owner(3) is None
+
+
+def test_usernames_are_cached_per_pid(table, tracker):
+    tracker.update()
+    assert tracker.user(3) == tracker.user(3) == "user3"
+    assert table.lookups.count(-3) == 1
+
+    # The cache goes with the PID
+    del table.procs[3]
+    tracker.update()
+    table.procs[3] = ProcessEntry("javaw.exe", 9.0)
+    tracker.update()
+    assert tracker.user(3) == "user3"
+    assert table.lookups.count(-3) == 2
+
+
+def test_vanished_before_lookup(table, tracker):
+    tracker.update()
+    table.procs[5] = ProcessEntry("javaw.exe", 5.0)
+    table.describe = lambda pid: None if pid == 5 else table.procs.get(pid)
+    started, _ = tracker.update()
+    assert 5 not in started
+    assert tracker.entry(5) is None
@@ -0,0 +1,127 @@
+"""
+test_samplers.py
+
+Tests for samplers.
+"""
+
+import os
+import sys
+
+import pytest
+
+from samplers import ProcessEntry, ProcSampler, PsutilSampler, Sampler, pick_sampler
+
+linux_only = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="procfs layout is Linux specific"
+)
+
+# 🔧 Fixtures
+
+
+def write_proc(root, pid, comm, exe=None, start=500):
+    proc_dir = root / str(pid)
+    proc_dir.mkdir()
+    (proc_dir / "comm").write_text(comm + "\n")
+    (proc_dir / "stat").write_text(
+        f"{pid} ({comm}) S 1 {pid} {pid} 0 -1 0 0 0 0 0 0 0 0 0 20 0 1 0 {start} "
+        "0 0\n"
+    )
+    if exe:
+        os.symlink(exe, proc_dir / "exe")
+
+
+@pytest.fixture
+def procfs(tmp_path):
+    root = tmp_path / "proc"
+    root.mkdir()
+    (root / "stat").write_text("cpu  1 2 3\nbtime 1000\n")
+    (root / "self").mkdir()
+    write_proc(root, 10, "javaw.exe", "/usr/bin/javaw.exe", start=200)
+    write_proc(root, 11, "RobloxPlayerBet", "/games/RobloxPlayerBeta.exe")
+    write_proc(root, 12, "kworker")
+    return root
+
+
+class FakeSampler(Sampler):
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+
+    def pids(self):
+        return list(range(self.size))
+
+    def describe(self, pid):
+        sum(range(1000))
+        return ProcessEntry("x", 0.0)
+
+
+# Procfs backend
+
+
+@linux_only
+def test_proc_pids(procfs):
+    assert sorted(ProcSampler(str(procfs)).pids()) == [10, 11, 12]
+
+
+@linux_only
+def test_proc_describe(procfs):
+    sampler = ProcSampler(str(procfs))
+    ticks = os.sysconf("SC_CLK_TCK")
+    entry = sampler.describe(10)
+    assert entry == ProcessEntry(
+        "javaw.exe", 1000 + 200 / ticks, "/usr/bin/javaw.exe", ppid=1
+    )
+
+
+@linux_only
+def test_proc_truncated_comm_uses_exe_name(procfs):
+    entry = ProcSampler(str(procfs)).describe(11)
+    assert entry.name == "RobloxPlayerBeta.exe"
+
+
+@linux_only
+def test_proc_missing_exe_and_gone_pid(procfs):
+    sampler = ProcSampler(str(procfs))
+    assert sampler.describe(12).exe == ""
+    assert sampler.describe(99) is None
+    assert set(sampler.snapshot()) == {10, 11, 12}
+
+
+@linux_only
+def test_proc_username(procfs):
+    import pwd
+
+    sampler = ProcSampler(str(procfs))
+    assert sampler.username(10) == pwd.getpwuid(os.getuid()).pw_name
+    assert sampler.username(99) == ""
+
+
+# Psutil backend and selection
+
+
+def test_psutil_sees_current_process():
+    sampler = PsutilSampler()
+    assert os.getpid() in sampler.pids()
+    assert sampler.describe(os.getpid()).create_time > 0
+    assert sampler.describe(os.getpid()).ppid == os.getppid()
+    assert sampler.snapshot()[os.getpid()].ppid == os.getppid()
+    assert os.getpid() in sampler.snapshot()
+
+
+def test_psutil_username():
+    import getpass
+
+    assert PsutilSampler().username(os.getpid()) == getpass.getuser()
+
+
+def test_pick_sampler_prefers_cheapest():
+    slow = FakeSampler("slow", 500)
+    fast = FakeSampler("fast", 5)
+    assert pick_sampler([slow, fast]) is fast
+
+
+def test_pick_sampler_single_and_empty():
+    only = FakeSampler("only", 1)
+    assert pick_sampler([only]) is only
+    with pytest.raises(RuntimeError):
+        pick_sampler([])
@@ -0,0 +1,38 @@
+"""
+test_scheduler.py
+
+Tests for scheduler.
+"""
+
+import pytest
+
+from scheduler import AdaptiveScheduler
+
+
+@pytest.fixture
+def scheduler():
+    return AdaptiveScheduler(
+        idle_interval=180, active_interval=60, enforce_interval=15, min_interval=1
+    )
+
+
+@pytest.mark.parametrize(
+    "running, remaining, warning_remaining, expected",
+    [
+        (0, 3600, 3300, 180),  # Nothing running: back off
+        (1, 3600, 3300, 60),  # Playing, far from any threshold
+        (1, 330, 30, 30),  # Land on the 5-minute warning
+        (1, 45, -255, 45),  # Land on the limit
+        (2, 90, -210, 45),  # Two games burn the budget twice as fast
+        (1, 0.2, -299.8, 1),  # Never below the minimum
+        (0, 0, -300, 15),  # Limit reached: keep enforcing
+        (3, -60, -360, 15),
+    ],
+)
+def test_next_interval(scheduler, running, remaining, warning_remaining, expected):
+    interval = scheduler.next_interval(running, remaining, warning_remaining)
+    assert interval == pytest.approx(expected)
+
+
+def test_max_interval(scheduler):
+    assert scheduler.max_interval == 180
@@ -0,0 +1,53 @@
+"""
+test_settings.py
+
+Tests for settings.
+"""
+
+import os
+
+from settings import FileWatcher, Settings, load_settings
+
+# File watching
+
+
+def test_file_watcher(tmp_path):
+    path = tmp_path / "config.json"
+    watcher = FileWatcher(path)
+    assert not watcher.poll()
+
+    path.write_text("{}")
+    assert watcher.poll()
+    assert not watcher.poll()
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert watcher.poll()
+
+    watcher.forget()
+    assert watcher.poll()
+
+    path.unlink()
+    assert watcher.poll()
+
+
+# Loading
+
+
+def test_load_settings(tmp_path):
+    config_file = tmp_path / "config.json"
+    assert load_settings(config_file) == Settings.from_config({})
+    config_file.write_text('{"limit_minutes": 60, "persistence": "journal"}')
+    settings = load_settings(config_file)
+    assert settings.limit_minutes == 60
+    assert settings.persistence == "journal"
+
+
+def test_per_user_settings(tmp_path):
+    settings = Settings.from_config(
+        {"log_path": str(tmp_path / "GameTimeLog.json"), "per_user": True}
+    )
+    assert settings.per_user
+    assert settings.user_limits == {}
+    assert settings.user_log_path == tmp_path / "GameTimeUsers.json"
+    assert Settings.from_config({"user_limits": {"bob": 60}}).user_limits == {"bob": 60}
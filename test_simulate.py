@@ -0,0 +1,98 @@
+"""
+test_simulate.py
+
+Tests for simulate.
+"""
+
+import pytest
+
+from samplers import ProcessEntry
+from simulate import (
+    DAY,
+    Snapshot,
+    differences,
+    generate,
+    load_trace,
+    save_trace,
+    simulate,
+)
+
+HOUR = 60 * 60
+
+# 🔧 Fixtures
+
+
+@pytest.fixture
+def trace():
+    """An afternoon of Minecraft, relaunched after the limit."""
+    background = {100: ProcessEntry("explorer.exe", -DAY, ppid=1)}
+    game = {
+        1000: ProcessEntry("javaw.exe", 16 * HOUR, ppid=1),
+        1001: ProcessEntry("helper.exe", 16 * HOUR + 1, ppid=1000),
+    }
+    relaunch = {1002: ProcessEntry("javaw.exe", 18.5 * HOUR, ppid=1)}
+    return [
+        Snapshot(0.0, dict(background)),
+        Snapshot(16 * HOUR, {**background, **game}),
+        Snapshot(18.5 * HOUR, {**background, **game, **relaunch}),
+        Snapshot(19 * HOUR, dict(background)),
+        Snapshot(DAY - 1, dict(background)),
+    ]
+
+
+# Replay
+
+
+def test_replay_oracle(trace):
+    result = simulate(trace, ["javaw.exe"], limit_minutes=120)
+    assert result.outcome() == {
+        "days": {"2025-06-16": {"javaw.exe": 120.0}},
+        "warnings": ["2025-06-16 17:55:00"],
+        "limits": ["2025-06-16 18:00:00"],
+        "enforcements": 2,  # At the limit, then the relaunch
+    }
+
+
+def test_replay_reports_tick_cost(trace):
+    cost = simulate(trace, ["javaw.exe"]).cost()
+    assert cost["ticks"] > 100
+    assert cost["total_ms"] > 0
+    assert cost["ticks_per_second"] > 0
+
+
+def test_untracked_games_are_not_credited(trace):
+    result = simulate(trace, ["RobloxPlayerBeta.exe"])
+    assert result.outcome()["days"]["2025-06-16"] == {"RobloxPlayerBeta.exe": 0}
+    assert result.warnings == result.limits == []
+
+
+def test_differences(trace):
+    outcome = simulate(trace, ["javaw.exe"]).outcome()
+    assert differences(outcome, outcome) == []
+    expected = {**outcome, "limits": [], "days": {"2025-06-16": {"javaw.exe": 90}}}
+    assert differences(expected, outcome) == [
+        "limits: expected [], got ['2025-06-16 18:00:00']",
+        "2025-06-16: expected {'javaw.exe': 90}, got {'javaw.exe': 120.0}",
+    ]
+
+
+# Traces
+
+
+def test_generated_traces_are_reproducible():
+    assert generate(7, seed=3) == generate(7, seed=3)
+    assert generate(7, seed=3) != generate(7, seed=4)
+
+
+def test_week_of_generated_play(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    save_trace(path, generate(7, seed=1))
+    snapshots = load_trace(path)
+    assert snapshots == generate(7, seed=1)
+    result = simulate(snapshots, ["javaw.exe", "RobloxPlayerBeta.exe"])
+    assert min(result.days) == "2025-06-16" and max(result.days) >= "2025-06-22"
+    for minutes in result.days.values():
+        assert sum(minutes.values()) <= 120 + 0.5  # One enforcement interval
+    assert simulate(snapshots, ["javaw.exe", "RobloxPlayerBeta.exe"]).outcome() == (
+        result.outcome()
+    )
@@ -0,0 +1,184 @@
+"""
+test_sync_service.py
+
+Tests for sync_service.
+"""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from sync_service import SyncClient, SyncServer, SyncState
+
+# 🔧 Fixtures
+
+TODAY = "2025-06-18"
+
+
+def start(tmp_path, token=None):
+    server = SyncServer(("127.0.0.1", 0), SyncState(tmp_path / "state.json"), token)
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    return server
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = start(tmp_path)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def locked_server(tmp_path):
+    server = start(tmp_path, token="s3cret")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def url(server):
+    host, port = server.server_address
+    return f"http://{host}:{port}"
+
+
+def client(server, name, tmp_path, **kwargs):
+    return SyncClient(url(server), name, tmp_path / f"{name}.json", timeout=2, **kwargs)
+
+
+def post(server, body):
+    request = urllib.request.Request(
+        f"{url(server)}/usage", data=json.dumps(body).encode(), method="POST"
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=2) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+# Server state
+
+
+def test_batches_are_applied_once(tmp_path):
+    state = SyncState(tmp_path / "state.json")
+    assert state.apply("den", 1, {TODAY: {"javaw.exe": 120}})
+    assert not state.apply("den", 1, {TODAY: {"javaw.exe": 120}})
+    assert SyncState(tmp_path / "state.json").minutes(TODAY) == {"den": 2.0}
+
+
+@pytest.mark.parametrize("seconds", [-600, float("nan"), float("inf"), "60", True])
+def test_invalid_deltas_change_nothing(tmp_path, seconds):
+    state = SyncState(tmp_path / "state.json")
+    state.apply("den", 1, {TODAY: {"javaw.exe": 120}})
+    days = {TODAY: {"javaw.exe": 60, "steam.exe": seconds}}
+    with pytest.raises(ValueError):
+        state.apply("den", 2, days)
+    assert state.seqs == {"den": 1}
+    assert state.minutes(TODAY) == {"den": 2.0}
+
+
+# Server
+
+
+@pytest.mark.parametrize(
+    "batch",
+    [
+        {"seq": 1, "days": {TODAY: {"javaw.exe": -6000}}},
+        {"seq": 1, "days": {TODAY: {"javaw.exe": 60, "steam.exe": 1e400}}},
+        {"seq": "1", "days": {TODAY: {"javaw.exe": 60}}},
+        {"seq": 1.5, "days": {TODAY: {"javaw.exe": 60}}},
+        {"seq": 1, "days": [60]},
+    ],
+)
+def test_invalid_batches_are_rejected(server, batch):
+    assert post(server, {"client": "den", "date": TODAY, **batch}) == 400
+    assert server.state.seqs == {}
+    assert server.state.minutes(TODAY) == {}
+
+
+def test_token_is_required(locked_server, tmp_path):
+    batch = {"client": "den", "date": TODAY, "seq": 1, "days": {TODAY: {"a": 60}}}
+    assert post(locked_server, batch) == 401
+    intruder = client(locked_server, "attic", tmp_path, token="guess")
+    intruder.record(TODAY, {"javaw.exe": 600})
+    assert not intruder.sync()
+    den = client(locked_server, "den", tmp_path, token="s3cret")
+    den.record(TODAY, {"javaw.exe": 600})
+    assert den.sync()
+    assert locked_server.state.minutes(TODAY) == {"den": 10.0}
+
+
+# Client
+
+
+def test_clients_share_the_budget(server, tmp_path):
+    den, attic = client(server, "den", tmp_path), client(server, "attic", tmp_path)
+    den.record(TODAY, {"javaw.exe": 600})
+    attic.record(TODAY, {"RobloxPlayerBeta.exe": 300})
+    assert den.sync() and attic.sync() and den.sync()
+    assert den.remote_minutes(TODAY) == 5.0
+    assert attic.remote_minutes(TODAY) == 10.0
+
+
+def test_writes_are_coalesced(server, tmp_path):
+    den = client(server, "den", tmp_path)
+    for _ in range(5):
+        den.record(TODAY, {"javaw.exe": 60})
+    den.sync()
+    assert den.seq == 1
+    assert server.state.minutes(TODAY) == {"den": 5.0}
+
+
+def test_offline_client_reconciles(server, tmp_path, capsys):
+    den = client(server, "den", tmp_path)
+    den.url = "http://127.0.0.1:9"
+    den.record(TODAY, {"javaw.exe": 60})
+    assert not den.sync()
+    den.record(TODAY, {"javaw.exe": 60})
+    assert not den.sync()
+    assert capsys.readouterr().out.count("Failed to reach") == 1
+
+    # Restarted while offline: the batches come back from the cache
+    den = client(server, "den", tmp_path)
+    assert den.sync() and den.sync()
+    assert server.state.minutes(TODAY) == {"den": 2.0}
+
+
+def test_lost_reply_is_not_counted_twice(server, tmp_path):
+    den = client(server, "den", tmp_path)
+    den.record(TODAY, {"javaw.exe": 60})
+    post = den._post
+
+    def lose_reply(payload):
+        post(payload)
+        raise OSError("connection reset")
+
+    den._post = lose_reply
+    assert not den.sync()
+    den._post = post
+    assert den.sync()
+    assert server.state.minutes(TODAY) == {"den": 1.0}
+
+
+def test_lost_cache_continues_after_server_seq(server, tmp_path):
+    server.state.apply("den", 5, {TODAY: {"javaw.exe": 60}})
+    den = client(server, "den", tmp_path)
+    den.record(TODAY, {"javaw.exe": 60})
+    assert den.sync() and den.sync()
+    assert den.seq == 6
+    assert server.state.minutes(TODAY) == {"den": 2.0}
+
+
+def test_background_thread_syncs(server, tmp_path):
+    den = client(server, "den", tmp_path, interval=60)
+    den.record(TODAY, {"javaw.exe": 60})
+    den.start()
+    den.close()
+    assert server.state.minutes(TODAY) == {"den": 1.0}
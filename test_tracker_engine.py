@@ -0,0 +1,626 @@
+"""
+test_tracker_engine.py
+
+Tests for tracker_engine.
+"""
+
+import json
+import subprocess
+import sys
+import threading
+
+import pytest
+
+import tracker_engine as te
+from enforcer import EnforcementResult
+from events import GameStarted, GameStopped, LimitReached, MinuteCredited
+from samplers import ProcessEntry, Sampler
+from settings import Settings
+from usage_history import UsageHistory
+from usage_journal import load_game_times
+from user_budgets import UserBudgets
+
+# 🔧 Fixtures
+
+
+class FakeSampler(Sampler):
+    def __init__(self, procs=None):
+        self.procs = dict(procs or {})
+        self.users = {}
+        self.username_calls = 0
+
+    def pids(self):
+        return list(self.procs)
+
+    def describe(self, pid):
+        return self.procs.get(pid)
+
+    def username(self, pid):
+        self.username_calls += 1
+        return self.users.get(pid, "")
+
+
+class FakeClock:
+    """Serves as both the monotonic and the wall clock."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def sampler():
+    return FakeSampler({1: ProcessEntry("explorer.exe", 1.0)})
+
+
+class FakeEnforcer:
+    def __init__(self):
+        self.calls = []
+
+    def enforce(self, targets):
+        self.calls.append(dict(targets))
+        return EnforcementResult(sorted(targets), [], [])
+
+
+@pytest.fixture
+def enforcer():
+    return FakeEnforcer()
+
+
+@pytest.fixture
+def engine(sampler, clock, enforcer, tmp_path):
+    engine = te.TrackerEngine(
+        {"javaw.exe", "RobloxPlayerBeta.exe"},
+        limit_minutes=10,
+        log_path=tmp_path / "GameTimeLog.json",
+        sampler=sampler,
+        enforcer=enforcer,
+        clock=clock,
+        wall_clock=clock,
+    )
+    return engine
+
+
+# Accounting
+
+
+def test_tracked_games_start_at_zero(engine):
+    assert engine.game_times == {"javaw.exe": 0, "RobloxPlayerBeta.exe": 0}
+    assert engine.used_minutes == 0
+
+
+def test_first_tick_credits_nothing(engine, sampler):
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    report = engine.tick()
+    assert report.running == {"javaw.exe": {2}}
+    assert engine.used_minutes == 0
+
+
+def test_tick_credits_elapsed_time_once_per_game(engine, sampler, clock):
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    sampler.procs[3] = ProcessEntry("javaw.exe", 3.0)
+    engine.tick()
+    clock.advance(90)
+    report = engine.tick()
+    assert report.running == {"javaw.exe": {2, 3}}
+    assert engine.game_times["javaw.exe"] == pytest.approx(1.5)
+    assert engine.game_times["RobloxPlayerBeta.exe"] == 0
+
+
+def test_process_tree_is_credited_once(engine, sampler, clock):
+    sampler.procs[2] = ProcessEntry("RobloxPlayerBeta.exe", 2.0)
+    sampler.procs[3] = ProcessEntry("javaw.exe", 3.0, ppid=2)
+    sampler.procs[4] = ProcessEntry("crashpad.exe", 4.0, ppid=3)
+    engine.tick()
+    clock.advance(60)
+    report = engine.tick()
+    assert report.running == {"RobloxPlayerBeta.exe": {2, 3, 4}}
+    assert engine.used_minutes == pytest.approx(1.0)
+
+
+def test_game_started_between_ticks(engine, sampler, clock):
+    engine.tick()
+    clock.advance(60)
+    sampler.procs[4] = ProcessEntry("RobloxPlayerBeta.exe", clock.now)
+    clock.advance(120)
+    engine.tick()
+    assert engine.game_times["RobloxPlayerBeta.exe"] == pytest.approx(2.0)
+
+
+def test_long_gap_is_capped(engine, sampler, clock):
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    engine.tick()
+    clock.advance(8 * 3600)
+    engine.tick()
+    cap = 2 * engine.scheduler.max_interval
+    assert engine.game_times["javaw.exe"] == pytest.approx(cap / 60)
+
+
+def test_next_interval_follows_scheduler(engine, sampler, clock):
+    assert engine.tick().next_interval == engine.scheduler.idle_interval
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    assert engine.tick().next_interval == engine.scheduler.active_interval
+    engine.game_times["javaw.exe"] = 4.5
+    clock.advance(1)
+    assert engine.tick().next_interval == pytest.approx(29.0)
+
+
+def test_tick_saves_log(engine, sampler, clock):
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    engine.tick()
+    clock.advance(60)
+    engine.tick()
+    data = json.loads(engine.log_path.read_text())
+    assert data["game_times"]["javaw.exe"] == 1
+    assert load_game_times(engine.log_path)["javaw.exe"] == 1
+
+
+def test_journal_store(sampler, clock, tmp_path):
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    log_path = tmp_path / "GameTimeLog.json"
+    store = te.make_store("journal", log_path)
+    engine = te.TrackerEngine(
+        {"javaw.exe"}, 10, sampler=sampler, store=store, clock=clock
+    )
+    engine.tick()
+    clock.advance(60)
+    engine.tick()
+    assert engine.log_path == log_path
+    assert log_path.with_suffix(".journal").exists()
+
+    reopened = te.TrackerEngine(
+        {"javaw.exe"}, 10, sampler=sampler, store=te.make_store("journal", log_path)
+    )
+    assert reopened.game_times == {"javaw.exe": 1.0}
+
+
+def test_history_is_credited(engine, sampler, clock, tmp_path):
+    engine.history = UsageHistory(tmp_path / "history.db")
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    engine.tick()
+    clock.advance(120)
+    engine.tick()
+    engine.close()
+    assert engine.history.day(engine.date) == {"javaw.exe": 2.0}
+
+
+def test_history_is_flushed_on_idle_ticks(engine, sampler, clock, tmp_path):
+    engine.history = UsageHistory(tmp_path / "history.db", 300, clock)
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    for _ in range(5):
+        engine.tick()
+        clock.advance(60)
+    del sampler.procs[2]
+    for _ in range(3):
+        engine.tick()
+        clock.advance(180)
+    assert engine.history._pending == {}
+    assert engine.history.day(engine.date) == {"javaw.exe": 4.0}
+
+
+def test_rollover_flushes_history(engine, sampler, clock, tmp_path, monkeypatch):
+    engine.history = UsageHistory(tmp_path / "history.db", 3600, clock)
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    engine.tick()
+    clock.advance(60)
+    engine.tick()
+    today = engine.date
+    monkeypatch.setattr(engine, "today", lambda: "2999-01-01")
+    del sampler.procs[2]
+    clock.advance(60)
+    engine.tick()
+    assert engine.history._pending == {}
+    assert engine.history.day(today) == {"javaw.exe": 1.0}
+
+
+def test_json_log_from_another_day_is_not_loaded(sampler, tmp_path):
+    log_path = tmp_path / "GameTimeLog.json"
+    log_path.write_text('{"date": "2000-01-01", "game_times": {"javaw.exe": 99}}')
+    engine = te.TrackerEngine({"javaw.exe"}, 10, log_path, sampler=sampler)
+    assert engine.game_times == {"javaw.exe": 0}
+
+
+def test_unknown_store():
+    with pytest.raises(ValueError):
+        te.make_store("floppy", te.DEFAULT_LOG_PATH)
+
+
+def test_day_rollover_resets_budget(engine, sampler, clock, monkeypatch):
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    for _ in range(2):
+        engine.tick()
+        clock.advance(300)
+    engine.tick()
+    assert engine.alert_shown
+    monkeypatch.setattr(engine, "today", lambda: "2999-01-01")
+    clock.advance(60)
+    report = engine.tick()
+    assert engine.date == "2999-01-01"
+    assert engine.game_times["javaw.exe"] == 1.0
+    assert not engine.alert_shown and not report.limit_reached
+
+
+def test_save_failure_is_reported(engine, tmp_path, capsys):
+    engine.log_path = tmp_path / "missing" / "log.json"
+    engine.save()
+    assert "Failed to save game times" in capsys.readouterr().out
+
+
+# Warning and limit state machine
+
+
+def test_warning_and_limit_fire_once(engine, sampler, clock, enforcer):
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    reports = []
+    engine.subscribe(reports.append)
+    for _ in range(13):
+        engine.tick()
+        clock.advance(60)
+
+    warnings = [i for i, report in enumerate(reports) if report.warning]
+    limits = [i for i, report in enumerate(reports) if report.limit_reached]
+    assert warnings == [5]
+    assert limits == [10]
+    assert reports[-1].next_interval == engine.scheduler.enforce_interval
+    assert enforcer.calls[0] == {2: 2.0}
+
+
+def test_enforcement_covers_children_and_relaunches(engine, sampler, clock, enforcer):
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    sampler.procs[3] = ProcessEntry("jcef_helper.exe", 3.0, ppid=2)
+    for _ in range(11):
+        engine.tick()
+        clock.advance(60)
+    assert enforcer.calls == [{2: 2.0, 3: 3.0}]
+
+    # Nothing running: nothing to enforce
+    del sampler.procs[2], sampler.procs[3]
+    engine.tick()
+    assert len(enforcer.calls) == 1
+
+    # Relaunched after the limit: stopped again, without a second alert
+    sampler.procs[7] = ProcessEntry("javaw.exe", clock.now)
+    report = engine.tick()
+    assert enforcer.calls[-1] == {7: clock.now}
+    assert not report.limit_reached
+
+
+def test_survivors_are_reported(engine, sampler, enforcer, capsys):
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    engine.tick()
+    enforcer.enforce = lambda targets: EnforcementResult([], [], [2])
+    engine.enforce()
+    assert "Failed to stop processes: [2]" in capsys.readouterr().out
+
+
+def test_limit_counts_other_computers(sampler, clock, enforcer, tmp_path):
+    class FakeSync:
+        recorded = []
+
+        def record(self, date, deltas):
+            self.recorded.append(deltas)
+
+        def remote_minutes(self, date):
+            return 9.0
+
+    sync = FakeSync()
+    engine = te.TrackerEngine(
+        {"javaw.exe"},
+        limit_minutes=10,
+        log_path=tmp_path / "GameTimeLog.json",
+        sampler=sampler,
+        enforcer=enforcer,
+        sync=sync,
+        clock=clock,
+        wall_clock=clock,
+    )
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    engine.tick()
+    clock.advance(60)
+    report = engine.tick()
+    assert report.used_minutes == pytest.approx(10.0)
+    assert report.limit_reached
+    assert sync.recorded[-1] == {"javaw.exe": 60}
+
+
+def test_tick_phases_are_instrumented(engine, sampler, clock, tmp_path):
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    for _ in range(11):
+        engine.tick()
+        clock.advance(60)
+    engine.log_path = tmp_path / "missing" / "log.json"
+    engine.tick()
+    metrics = engine.metrics
+    assert set(metrics.histograms) == {
+        "tick",
+        "sample",
+        "account",
+        "enforce",
+        "persist",
+    }
+    assert metrics.histograms["tick"].count == 12
+    assert metrics.counters["ticks"] == 12
+    assert metrics.counters["enforcements"] == 2
+    assert metrics.counters["save_failures"] == 1
+    assert metrics.gauges["processes"] == 2
+    assert metrics.gauges["tick_lag_seconds"] == 60 - engine.scheduler.enforce_interval
+
+
+# Events
+
+
+def test_tick_publishes_what_changed(engine, sampler, clock):
+    batches = []
+    engine.events.subscribe(batches.append)
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    engine.tick()
+    assert batches == [[GameStarted("javaw.exe", frozenset({2}))]]
+
+    clock.advance(60)
+    engine.tick()
+    assert batches[-1] == [MinuteCredited(engine.date, "javaw.exe", 60, 1)]
+
+    del sampler.procs[2]
+    engine.tick()
+    assert batches[-1] == [GameStopped("javaw.exe")]
+    engine.tick()
+    assert len(batches) == 3  # Nothing changed, nothing published
+
+
+def test_idle_ticks_do_not_persist(engine, sampler, clock, monkeypatch):
+    records = []
+    monkeypatch.setattr(engine.store, "record", lambda *args: records.append(args))
+    for _ in range(3):
+        engine.tick()
+        clock.advance(60)
+    assert records == []
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    engine.tick()
+    assert records[0][1] == {"javaw.exe": 60}
+
+
+def test_events_are_counted(engine, sampler, clock):
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    for _ in range(11):
+        engine.tick()
+        clock.advance(60)
+    counters = engine.metrics.counters
+    assert counters["games_started"] == 1
+    assert counters["warnings"] == counters["limits_reached"] == 1
+
+
+# Reloading
+
+
+def test_raising_the_limit_rearms_the_alerts(engine, sampler, clock):
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    for _ in range(11):
+        engine.tick()
+        clock.advance(60)
+    assert engine.alert_shown and engine.warning_shown
+    engine.set_limit(13)
+    assert not engine.alert_shown and engine.warning_shown
+    engine.set_limit(30)
+    assert not engine.warning_shown
+
+
+def test_reloader_applies_config_and_apps_list(engine, sampler, clock, tmp_path):
+    apps_list = tmp_path / "apps_list.txt"
+    apps_list.write_text("javaw.exe\n")
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps({"apps_list": str(apps_list)}))
+    settings = Settings.from_config(json.loads(config_file.read_text()))
+    reloader = te.SettingsReloader(engine, settings, config_file)
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    engine.tick()
+    clock.advance(60)
+    engine.tick()
+    assert not reloader.poll()
+
+    config_file.write_text(
+        json.dumps({"apps_list": str(apps_list), "limit_minutes": 5})
+    )
+    assert reloader.poll()
+    assert engine.limit_minutes == 5
+
+    apps_list.write_text("javaw.exe\nGame.exe\n")
+    assert reloader.poll()
+    assert engine.game_times == {
+        "javaw.exe": 1.0,
+        "RobloxPlayerBeta.exe": 0,
+        "Game.exe": 0,
+    }
+
+    config_file.write_text("{")
+    assert not reloader.poll()
+    assert reloader.poll() is False  # Retried, and still broken
+
+
+# Per-account budgets
+
+
+@pytest.fixture
+def family(sampler, clock, enforcer, tmp_path):
+    return te.TrackerEngine(
+        {"javaw.exe", "RobloxPlayerBeta.exe"},
+        limit_minutes=10,
+        log_path=tmp_path / "GameTimeLog.json",
+        sampler=sampler,
+        enforcer=enforcer,
+        budgets=UserBudgets({"alice": 3}, 10, tmp_path / "GameTimeUsers.json"),
+        user="alice",
+        clock=clock,
+        wall_clock=clock,
+    )
+
+
+def test_accounts_are_credited_separately(family, sampler, clock):
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    sampler.procs[3] = ProcessEntry("javaw.exe", 3.0)
+    sampler.procs[4] = ProcessEntry("RobloxPlayerBeta.exe", 4.0)
+    sampler.users.update({2: "alice", 3: "bob", 4: "bob"})
+    family.tick()
+    clock.advance(60)
+    report = family.tick()
+
+    assert family.budgets.times == {
+        "alice": {"javaw.exe": 1.0},
+        "bob": {"javaw.exe": 1.0, "RobloxPlayerBeta.exe": 1.0},
+    }
+    assert family.game_times == {"javaw.exe": 2.0, "RobloxPlayerBeta.exe": 1.0}
+    assert report.used_minutes == 1.0  # alice's
+    assert report.game_times == {"javaw.exe": 1.0}
+    assert family.current_limit == 3
+    assert {(e.user, e.game) for e in report.events} == {
+        ("alice", "javaw.exe"),
+        ("bob", "javaw.exe"),
+        ("bob", "RobloxPlayerBeta.exe"),
+    }
+
+
+def test_usernames_are_looked_up_once_per_pid(family, sampler, clock):
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    sampler.users[2] = "bob"
+    for _ in range(5):
+        family.tick()
+        clock.advance(60)
+    assert sampler.username_calls == 1
+
+    # A new game process is looked up; explorer.exe never is
+    sampler.procs[3] = ProcessEntry("javaw.exe", clock.now)
+    family.tick()
+    assert sampler.username_calls == 2
+
+
+def test_each_account_has_its_own_limit(family, sampler, clock, enforcer):
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    sampler.procs[3] = ProcessEntry("javaw.exe", 3.0)
+    sampler.users.update({2: "alice", 3: "bob"})
+    reports = []
+    family.subscribe(reports.append)
+    for _ in range(5):
+        family.tick()
+        clock.advance(60)
+
+    limits = [e for report in reports for e in report.events if type(e) is LimitReached]
+    assert limits == [LimitReached(3.0, 3, "alice")]
+    assert reports[3].limit_reached and reports[0].warning
+    # Only alice's game is stopped, and bob keeps playing
+    assert enforcer.calls[0] == {2: 2.0}
+    assert all(call == {2: 2.0} for call in enforcer.calls)
+    assert family.budgets.used_minutes("bob") == 4.0
+
+
+def test_account_limits_are_reloaded(family, sampler, clock, tmp_path):
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps({"per_user": True}))
+    settings = Settings.from_config(json.loads(config_file.read_text()))
+    reloader = te.SettingsReloader(family, settings, config_file)
+    config_file.write_text(
+        json.dumps({"per_user": True, "limit_minutes": 30, "user_limits": {"bob": 5}})
+    )
+    assert reloader.poll()
+    assert family.budgets.limit("bob") == 5
+    assert family.budgets.limit("alice") == 30
+
+
+def test_account_times_survive_a_restart(family, sampler, clock, tmp_path):
+    sampler.procs[2] = ProcessEntry("javaw.exe", 2.0)
+    sampler.users[2] = "bob"
+    family.tick()
+    clock.advance(60)
+    family.tick()
+    family.close()
+
+    budgets = UserBudgets({}, 10, tmp_path / "GameTimeUsers.json")
+    te.TrackerEngine(
+        {"javaw.exe"},
+        log_path=tmp_path / "GameTimeLog.json",
+        sampler=sampler,
+        budgets=budgets,
+        clock=clock,
+        wall_clock=clock,
+    )
+    assert budgets.used_minutes("bob") == 1.0
+
+
+def test_unsubscribe(engine):
+    reports = []
+    engine.subscribe(reports.append)
+    engine.tick()
+    engine.unsubscribe(reports.append)
+    engine.tick()
+    assert len(reports) == 1
+
+
+def test_run_sleeps_for_requested_interval(engine, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(te.time, "sleep", sleeps.append)
+    te.run(engine, ticks=3)
+    assert sleeps == [engine.scheduler.idle_interval] * 2
+    te.run(engine, interval=5, ticks=2)
+    assert sleeps[-1] == 5
+
+
+# Worker thread
+
+
+def test_worker_ticks_in_the_background(engine, sampler, tmp_path):
+    ticked = threading.Event()
+    threads = []
+
+    def on_tick(report):
+        threads.append(threading.current_thread().name)
+        ticked.set()
+
+    engine.subscribe(on_tick)
+    worker = te.EngineWorker(engine)
+    worker.start()
+    assert ticked.wait(5)  # The first tick runs at once
+    ticked.clear()
+    sampler.procs[10] = ProcessEntry("javaw.exe", 990.0)
+    worker.wake()
+    assert ticked.wait(5)
+    worker.close()
+    assert threads == ["TrackerEngine", "TrackerEngine"]
+    saved = json.loads((tmp_path / "GameTimeLog.json").read_text())
+    assert "javaw.exe" in saved["game_times"]
+
+
+def test_worker_survives_a_failed_tick(engine, monkeypatch, capsys):
+    ticks = []
+
+    def tick():
+        ticks.append(1)
+        if len(ticks) == 1:
+            raise RuntimeError("boom")
+        worker._stop.set()
+        return te.TickReport({}, 0, False, False, 0, {})
+
+    worker = te.EngineWorker(engine)
+    monkeypatch.setattr(engine.scheduler, "active_interval", 0)
+    monkeypatch.setattr(engine, "tick", tick)
+    worker._run()
+    assert len(ticks) == 2
+    assert "Tick failed: boom" in capsys.readouterr().out
+
+
+# Headless import
+
+
+def test_engine_does_not_import_wx():
+    code = "import sys, tracker_engine; print('wx' in sys.modules)"
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == "False"
@@ -0,0 +1,108 @@
+"""
+test_tracker_service.py
+
+Tests for tracker_service.
+"""
+
+import socket
+import threading
+
+import pytest
+
+import game_time_limiter as gtl
+from settings import Settings
+from status_client import query_status
+from tracker_engine import TickReport
+from tracker_service import StatusBoard, StatusServer, serve
+
+# 🔧 Fixtures
+
+
+@pytest.fixture
+def server():
+    server = StatusServer(0, StatusBoard())
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def port(server):
+    return server.server_address[1]
+
+
+def report(used_minutes, running=None, game_times=None):
+    return TickReport(running or {}, used_minutes, False, False, 60.0, game_times or {})
+
+
+# Status
+
+
+def test_status_is_the_last_tick(server):
+    server.board.update(
+        report(31.0, {"javaw.exe": {2}}, {"javaw.exe": 31.0}), "2025-06-18", 120
+    )
+    status = query_status(port(server))
+    assert status["date"] == "2025-06-18"
+    assert status["used_minutes"] == 31.0
+    assert status["limit_minutes"] == 120
+    assert status["running"] == ["javaw.exe"]
+    assert status["game_times"] == {"javaw.exe": 31.0}
+
+
+def test_status_of_every_account(server, tmp_path):
+    users = {
+        "alice": {"used_minutes": 31.0, "limit_minutes": 30},
+        "bob": {"used_minutes": 12.4, "limit_minutes": 60},
+    }
+    server.board.update(report(31.0), "2025-06-18", 30, users)
+    assert query_status(port(server))["users"] == users
+    settings = Settings(
+        log_path=tmp_path / "GameTimeLog.json", status_port=port(server)
+    )
+    assert gtl.status(settings).splitlines()[-2:] == [
+        "User alice: 31/30 min used",
+        "User bob: 12/60 min used",
+    ]
+
+
+def test_unknown_command(server):
+    with socket.create_connection(("127.0.0.1", port(server)), timeout=2) as sock:
+        sock.sendall(b"stop\n")
+        assert b"unknown command: stop" in sock.makefile("rb").readline()
+
+
+def test_no_service_running():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        free_port = sock.getsockname()[1]
+    with pytest.raises(OSError):
+        query_status(free_port)
+
+
+def test_status_command_asks_the_service(server, tmp_path):
+    server.board.update(
+        report(45.0, {"javaw.exe": {2}}, {"javaw.exe": 30.0, "b.exe": 0.2}),
+        "2025-06-18",
+        60,
+    )
+    settings = Settings(
+        log_path=tmp_path / "GameTimeLog.json", status_port=port(server)
+    )
+    assert gtl.status(settings) == (
+        "2025-06-18: 45/60 min used, 15 left\n  javaw: 30 min\nRunning: javaw"
+    )
+    # Another day is read from the log
+    assert gtl.status(settings, "2025-06-17").startswith("2025-06-17: 0/120")
+
+
+def test_second_service_does_not_start(server, tmp_path, capsys):
+    settings = Settings(
+        log_path=tmp_path / "GameTimeLog.json", status_port=port(server)
+    )
+    serve(settings)
+    assert "Failed to open the status socket" in capsys.readouterr().out
+    assert not settings.log_path.exists()  # No engine was built
@@ -0,0 +1,104 @@
+"""
+test_usage_history.py
+
+Tests for usage_history.
+"""
+
+import time
+
+import pytest
+
+from usage_history import UsageHistory
+
+# 🔧 Fixtures
+
+
+@pytest.fixture
+def now():
+    return [0.0]
+
+
+@pytest.fixture
+def history(tmp_path, now):
+    history = UsageHistory(
+        tmp_path / "history.db", flush_interval=300, clock=lambda: now[0]
+    )
+    yield history
+    history.close()
+
+
+def row_count(history):
+    return history.connection.execute("SELECT COUNT(*) FROM usage").fetchone()[0]
+
+
+# Batched writes
+
+
+def test_writes_are_buffered(history, now):
+    history.record("2025-06-18", {"javaw.exe": 60.0, "idle.exe": 0.0})
+    now[0] = 60
+    history.record("2025-06-18", {"javaw.exe": 60.0})
+    assert history._connection is None  # Nothing written yet
+
+    now[0] = 300
+    history.record("2025-06-18", {"javaw.exe": 60.0})
+    assert row_count(history) == 1
+    assert history.day("2025-06-18") == {"javaw.exe": 3.0}
+
+
+def test_midnight_flushes_previous_day(history):
+    history.record("2025-06-18", {"javaw.exe": 120.0})
+    history.record("2025-06-19", {"javaw.exe": 60.0})
+    assert row_count(history) == 1
+    assert history.day("2025-06-19") == {"javaw.exe": 1.0}
+    assert history.day("2025-06-18") == {"javaw.exe": 2.0}
+
+
+def test_upsert_accumulates_across_sessions(tmp_path):
+    for _ in range(2):
+        history = UsageHistory(tmp_path / "history.db")
+        history.record("2025-06-18", {"javaw.exe": 60.0})
+        history.close()
+    assert UsageHistory(tmp_path / "history.db").day("2025-06-18") == {"javaw.exe": 2.0}
+
+
+def test_unwritable_database_is_reported(tmp_path, capsys):
+    history = UsageHistory(tmp_path / "missing" / "history.db")
+    history.record("2025-06-18", {"javaw.exe": 60.0})
+    history.close()
+    assert "Failed to save game history" in capsys.readouterr().out
+
+
+# Queries
+
+
+def test_last_days(history):
+    for day in range(1, 11):
+        history.record(f"2025-06-{day:02}", {"javaw.exe": 60.0 * day})
+    history.record("2025-06-10", {"Roblox.exe": 30.0})
+
+    week = history.last_days(7, "2025-06-10")
+    assert list(week["javaw.exe"]) == [f"2025-06-{day:02}" for day in range(4, 11)]
+    assert week["Roblox.exe"] == {"2025-06-10": 0.5}
+    assert history.game("javaw.exe", since="2025-06-09") == {
+        "2025-06-09": 9.0,
+        "2025-06-10": 10.0,
+    }
+
+
+def test_last_week_query_is_fast_over_a_year(history):
+    rows = [
+        (f"2024-{month:02}-{day:02}", f"game{game}.exe", 30.0)
+        for month in range(1, 13)
+        for day in range(1, 29)
+        for game in range(20)
+    ]
+    with history.connection:
+        history.connection.executemany(
+            "INSERT INTO usage (date, game, minutes) VALUES (?, ?, ?)", rows
+        )
+    start = time.perf_counter()
+    week = history.last_days(7, "2024-12-28")
+    assert time.perf_counter() - start < 0.05
+    assert len(week) == 20
+    assert all(len(dates) == 7 for dates in week.values())
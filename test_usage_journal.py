@@ -0,0 +1,134 @@
+"""
+test_usage_journal.py
+
+Tests for usage_journal.
+"""
+
+import json
+
+import pytest
+
+import usage_journal as uj
+
+# 🔧 Fixtures
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return tmp_path / "GameTimeLog.json"
+
+
+@pytest.fixture
+def journal(log_path):
+    journal = uj.UsageJournal(log_path)
+    journal.load("2025-06-18")
+    return journal
+
+
+def reopen(log_path, today="2025-06-18"):
+    journal = uj.UsageJournal(log_path)
+    return journal, journal.load(today)
+
+
+# Records and replay
+
+
+def test_record_appends_fixed_width_lines(journal):
+    journal.record("2025-06-18", {"javaw.exe": 60.0, "idle.exe": 0}, {})
+    journal.record("2025-06-18", {"javaw.exe": 30.5}, {})
+    lines = journal.journal_path.read_text().splitlines()
+    assert lines[1:] == [
+        "N 0000 javaw.exe",
+        "+ 0000 000060.000",
+        "+ 0000 000030.500",
+    ]
+    assert journal.game_times == {"javaw.exe": pytest.approx(1.5083, abs=1e-3)}
+
+
+def test_replay_after_crash(journal, log_path):
+    journal.record("2025-06-18", {"javaw.exe": 120.0}, {})
+    journal.record("2025-06-18", {"Roblox.exe": 60.0}, {})
+    # No close(): simulate the process dying
+    _, times = reopen(log_path)
+    assert times == {"javaw.exe": 2.0, "Roblox.exe": 1.0}
+
+
+def test_torn_record_is_ignored(journal, log_path):
+    journal.record("2025-06-18", {"javaw.exe": 60.0}, {})
+    journal.close()
+    with journal.journal_path.open("a") as file:
+        file.write("+ 0000 0000")
+    _, times = reopen(log_path)
+    assert times == {"javaw.exe": 1.0}
+
+
+def test_stale_journal_is_not_counted_twice(journal, log_path):
+    journal.record("2025-06-18", {"javaw.exe": 60.0}, {})
+    journal.close()
+    stale = journal.journal_path.read_text()
+    journal.save("2025-06-18", {"javaw.exe": 1.0})
+    journal.close()
+    # Crash after the snapshot was replaced but before the journal was reset
+    journal.journal_path.write_text(stale)
+    _, times = reopen(log_path)
+    assert times == {"javaw.exe": 1.0}
+
+
+def test_snapshot_is_readable_as_log(journal, log_path):
+    journal.save("2025-06-18", {"javaw.exe": 3.0})
+    data = json.loads(log_path.read_text())
+    assert data["date"] == "2025-06-18"
+    assert data["game_times"] == {"javaw.exe": 3.0}
+
+
+# Compaction
+
+
+def test_compacts_past_size_threshold(log_path):
+    journal = uj.UsageJournal(log_path, max_bytes=100)
+    journal.load("2025-06-18")
+    for _ in range(10):
+        journal.record("2025-06-18", {"javaw.exe": 60.0}, {})
+    assert journal.journal_path.stat().st_size <= 100
+    _, times = reopen(log_path)
+    assert times == {"javaw.exe": 10.0}
+
+
+def test_day_rollover(journal, log_path):
+    journal.record("2025-06-18", {"javaw.exe": 60.0}, {})
+    journal.record("2025-06-19", {"Roblox.exe": 60.0}, {})
+    _, times = reopen(log_path, "2025-06-19")
+    assert times == {"Roblox.exe": 1.0}
+
+
+def test_load_from_another_day_starts_empty(journal, log_path):
+    journal.record("2025-06-18", {"javaw.exe": 60.0}, {})
+    _, times = reopen(log_path, "2025-06-20")
+    assert times == {}
+
+
+# Syncing
+
+
+def test_fsyncs_are_batched(log_path, monkeypatch):
+    syncs = []
+    monkeypatch.setattr(uj.os, "fsync", syncs.append)
+    now = [0.0]
+    journal = uj.UsageJournal(log_path, sync_interval=30, clock=lambda: now[0])
+    journal.load("2025-06-18")
+    syncs.clear()
+    for _ in range(5):
+        now[0] += 10
+        journal.record("2025-06-18", {"javaw.exe": 10.0}, {})
+    assert len(syncs) == 1
+    journal.close()
+    assert len(syncs) == 2
+
+
+def test_write_failure_is_reported(journal, capsys, monkeypatch):
+    def fail(text):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(journal, "_append", fail)
+    journal.record("2025-06-18", {"javaw.exe": 60.0}, {})
+    assert "Failed to save game times" in capsys.readouterr().out
@@ -0,0 +1,120 @@
+"""
+test_usage_report.py
+
+Tests for usage_report.
+"""
+
+import csv
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from usage_history import UsageHistory  # noqa: E402
+from usage_report import UsageMatrix, summary  # noqa: E402
+
+# 🔧 Fixtures
+
+
+@pytest.fixture
+def matrix():
+    # Monday 2025-06-16 to Sunday 2025-06-29, nothing played on the 20th
+    days = [f"2025-06-{day}" for day in range(16, 30) if day != 20]
+    return UsageMatrix.from_rows(
+        days * 2,
+        ["a.exe"] * len(days) + ["b.exe"] * len(days),
+        [60.0] * len(days) + [float(i * 10) for i in range(len(days))],
+    )
+
+
+def make_history(path, rows):
+    history = UsageHistory(path)
+    history.connection  # Create the database even if there are no rows
+    for date, game, minutes in rows:
+        history.record(date, {game: minutes * 60})
+    history.close()
+    return path
+
+
+# Loading
+
+
+def test_days_without_play_are_zeros(matrix):
+    assert len(matrix) == 14
+    assert matrix.games == ["a.exe", "b.exe"]
+    assert matrix.labels()[4] == "2025-06-20"
+    assert matrix.minutes[4].tolist() == [0, 0]
+
+
+def test_histories_are_added_up(tmp_path):
+    desktop = make_history(
+        tmp_path / "desktop.db",
+        [("2025-06-18", "a.exe", 30), ("2025-06-19", "a.exe", 5)],
+    )
+    laptop = make_history(tmp_path / "laptop.db", [("2025-06-18", "a.exe", 15)])
+    matrix = UsageMatrix.load([desktop, laptop])
+    assert matrix.labels() == ["2025-06-18", "2025-06-19"]
+    assert matrix.minutes[:, 0] == pytest.approx([45, 5])
+    since = UsageMatrix.load([desktop, laptop], since="2025-06-19")
+    assert since.labels() == ["2025-06-19"]
+
+
+def test_empty_history(tmp_path):
+    history = make_history(tmp_path / "empty.db", [])
+    assert len(UsageMatrix.load([history])) == 0
+
+
+# Analytics
+
+
+def test_weekly_rollup(matrix):
+    rollup = matrix.rollup("week")
+    assert rollup.periods == ["2025-06-16", "2025-06-23"]
+    assert rollup.days.tolist() == [7, 7]
+    assert rollup.minutes[:, 0].tolist() == [360, 420]
+    assert rollup.per_day()[1, 0] == pytest.approx(60)
+
+
+def test_monthly_rollup(matrix):
+    rollup = matrix.rollup("month")
+    assert rollup.periods == ["2025-06-01"]
+    assert rollup.minutes.sum() == pytest.approx(matrix.minutes.sum())
+
+
+def test_unknown_period(matrix):
+    with pytest.raises(ValueError):
+        matrix.rollup("fortnight")
+
+
+def test_percentiles_and_trend(matrix):
+    assert matrix.percentiles([50])[0, 0] == 60
+    trend = matrix.trend()
+    assert trend[1] > 0  # b.exe is played more every day
+    assert abs(trend[0]) < 10
+
+
+def test_over_limit_streaks(matrix):
+    # Totals are 60 + 10 * i, except on the 20th
+    streaks = matrix.streaks(120)
+    assert [(s.start, s.end, s.days) for s in streaks] == [
+        ("2025-06-23", "2025-06-29", 7)
+    ]
+    assert matrix.streaks(90)[0] == ("2025-06-19", "2025-06-19", 1)
+    assert int(matrix.over_limit(120).sum()) == 7
+
+
+def test_csv_export(matrix, tmp_path):
+    path = tmp_path / "weekly.csv"
+    matrix.rollup("week").to_csv(path)
+    with path.open(newline="") as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == ["date", "a.exe", "b.exe", "total"]
+    assert rows[1][0] == "2025-06-16"
+    assert float(rows[1][3]) == pytest.approx(float(rows[1][1]) + float(rows[1][2]))
+
+
+def test_summary(matrix):
+    lines = summary(matrix, 120)
+    assert lines[0] == "2025-06-16 - 2025-06-29: 14 days, 2 games"
+    assert "Days at the 120 min limit: 7" in lines
+    assert [line.split()[0] for line in lines[-2:]] == ["a", "b"]
@@ -0,0 +1,96 @@
+"""
+test_user_budgets.py
+
+Tests for user_budgets.
+"""
+
+import pytest
+
+from events import LimitReached, WarningThreshold
+from user_budgets import UserBudgets, current_user
+
+# 🔧 Fixtures
+
+
+@pytest.fixture
+def budgets(tmp_path):
+    budgets = UserBudgets({"alice": 30}, 60, tmp_path / "GameTimeUsers.json")
+    budgets.load("2025-06-18")
+    return budgets
+
+
+# Accounting
+
+
+def test_limits_default_for_unlisted_accounts(budgets):
+    assert budgets.limit("alice") == 30
+    assert budgets.limit("bob") == 60
+
+
+def test_credit_per_account_and_game(budgets):
+    assert budgets.credit("alice", "javaw.exe", 60) == 1.0
+    assert budgets.credit("alice", "javaw.exe", 30) == 1.5
+    budgets.credit("alice", "steam.exe", 60)
+    budgets.credit("bob", "javaw.exe", 120)
+    assert budgets.used_minutes("alice") == 2.5
+    assert budgets.used_minutes("bob") == 2.0
+    assert budgets.used_minutes("carol") == 0
+    assert budgets.remaining_seconds("bob") == 58 * 60
+
+
+def test_alerts_fire_once_per_account(budgets):
+    budgets.credit("alice", "javaw.exe", 26 * 60)
+    budgets.credit("bob", "javaw.exe", 26 * 60)
+    assert budgets.check_limits() == [WarningThreshold(26.0, 30, "alice")]
+    assert budgets.check_limits() == []
+
+    budgets.credit("alice", "javaw.exe", 4 * 60)
+    assert budgets.check_limits() == [LimitReached(30.0, 30, "alice")]
+    assert budgets.over_limit({"alice", "bob"}) == {"alice"}
+
+
+def test_raising_a_limit_rearms_the_alerts(budgets):
+    budgets.credit("alice", "javaw.exe", 30 * 60)
+    budgets.check_limits()
+    budgets.set_limits({"alice": 32}, 60)
+    assert budgets.check_limits() == []  # Still within 5 minutes
+    budgets.set_limits({"alice": 45}, 60)
+    budgets.credit("alice", "javaw.exe", 10 * 60)
+    assert budgets.check_limits() == [WarningThreshold(40.0, 45, "alice")]
+
+
+# Persistence
+
+
+def test_saved_times_are_loaded_the_same_day(budgets, tmp_path):
+    budgets.credit("bob", "javaw.exe", 90)
+    assert budgets.save()
+
+    again = UserBudgets({}, 60, tmp_path / "GameTimeUsers.json")
+    again.load("2025-06-18")
+    assert again.times == {"bob": {"javaw.exe": 1.5}}
+    again.load("2025-06-19")
+    assert again.times == {}
+
+
+def test_rollover_starts_from_zero(budgets):
+    budgets.credit("alice", "javaw.exe", 30 * 60)
+    budgets.check_limits()
+    budgets.rollover("2025-06-19")
+    assert budgets.date == "2025-06-19"
+    assert budgets.status() == {}
+    budgets.credit("alice", "javaw.exe", 30 * 60)
+    assert len(budgets.check_limits()) == 2
+
+
+def test_broken_file_is_reported(tmp_path, capsys):
+    path = tmp_path / "GameTimeUsers.json"
+    path.write_text("{")
+    budgets = UserBudgets({}, 60, path)
+    budgets.load("2025-06-18")
+    assert budgets.times == {}
+    assert "Failed to load user times" in capsys.readouterr().out
+
+
+def test_current_user():
+    assert isinstance(current_user(), str)
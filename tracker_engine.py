@@ -0,0 +1,759 @@
+"""
+tracker_engine.py
+
+Headless tracking engine for game_time_limiter.
+
+The engine owns sampling, playtime accounting, the warning and limit state
+machine, enforcement and persistence. It does not import wx, so it can run in
+a background process, in tests, or under a profiler at any tick rate.
+
+Each tick samples the processes, credits playtime and publishes what changed
+as a batch of typed events on `engine.events`. Enforcement, persistence and
+metrics are consumers of that bus, and only run when an event concerns them.
+Views subscribe to the engine and receive a TickReport after every tick. An
+EngineWorker runs the ticks on a background thread, so the GUI never delays
+them.
+
+With per-account budgets the playtime is also credited per (account, game)
+and each account has its own limit, warning and enforcement; the reports then
+describe the account the engine runs as.
+
+The history database and the sync client are only imported when they are
+used, so importing the engine stays cheap for the headless entry points.
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, NamedTuple
+
+from enforcer import EnforcementResult, Enforcer, SupportsEnforce
+from events import (
+    Alert,
+    Event,
+    EventBus,
+    GameStarted,
+    GameStopped,
+    LimitReached,
+    MinuteCredited,
+    WarningThreshold,
+)
+from game_matcher import GameMatcher
+from metrics import Metrics
+from process_tracker import ProcessTracker
+from samplers import Sampler
+from scheduler import AdaptiveScheduler
+from settings import DEFAULT_LOG_PATH, FileWatcher, Settings, get_base, load_config
+from usage_journal import JsonLogStore, Store, make_store
+from user_budgets import WARNING_MINUTES, UserBudgets, current_user
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sync_service import SyncClient
+    from usage_history import UsageHistory
+
+# Counters incremented by the metrics consumer, per event type
+EVENT_COUNTERS = {
+    GameStarted: "games_started",
+    GameStopped: "games_stopped",
+    WarningThreshold: "warnings",
+    LimitReached: "limits_reached",
+}
+
+
+class TickReport(NamedTuple):
+    """The outcome of one engine tick, as seen by subscribers."""
+
+    running: dict[str, set[int]]
+    used_minutes: float
+    warning: bool  # The 5-minute warning fired on this tick
+    limit_reached: bool  # The limit was reached on this tick
+    next_interval: float  # Seconds until the engine wants to tick again
+    game_times: dict[str, float]  # A copy of today's playtime per game
+    events: tuple[Event, ...] = ()  # Published on this tick
+
+
+def load_tracked_games(apps_list_file: Path) -> set:
+    """
+    Load tracked games from file.
+
+    Reads the contents of the tracked games file into a set.
+    If the file is missing, an empty set is returned.
+    """
+    if apps_list_file.exists():
+        with apps_list_file.open("r") as file:
+            return {
+                line.strip()
+                for line in file
+                if line.strip() and not line.strip().startswith("#")
+            }
+
+    return set()
+
+
+class TrackerEngine:
+    def __init__(
+        self,
+        tracked_games: Iterable[str],
+        limit_minutes: int = 120,
+        log_path: Path = DEFAULT_LOG_PATH,
+        sampler: Sampler | None = None,
+        scheduler: AdaptiveScheduler | None = None,
+        store: Store | None = None,
+        history: "UsageHistory | None" = None,
+        enforcer: SupportsEnforce | None = None,
+        sync: "SyncClient | None" = None,
+        metrics: Metrics | None = None,
+        budgets: UserBudgets | None = None,
+        user: str | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the tracking engine.
+
+        Parameters:
+        tracked_games (Iterable[str]): apps_list entries of the tracked games:
+                        executable names, globs, "re:" or "path:" patterns.
+        limit_minutes (int): The maximum allowed game time in minutes.
+        log_path (Path): Where the playtime log is loaded from and saved to.
+                        Ignored when a `store` is given.
+        sampler (Sampler): Process sampler backend; picked automatically if None.
+        scheduler (AdaptiveScheduler): Decides the interval between ticks.
+        store (Store): Persists playtime, e.g. a UsageJournal. Defaults to a
+                        JsonLogStore at `log_path`.
+        history (UsageHistory): Optional multi-day history the playtime is
+                        also credited to.
+        enforcer (Enforcer): Stops the games once the limit is reached.
+        sync (SyncClient): Optional client of a sync server. Playtime is then
+                        pushed to it, and the limit applies to the minutes
+                        played on every synced computer.
+        metrics (Metrics): Records the latency of each phase of a tick and
+                        exports it. Kept in memory only by default.
+        budgets (UserBudgets): Per-account limits. When given, playtime is
+                        also credited per (account, game), and the warning,
+                        the limit and enforcement apply to each account
+                        instead of to the total. `limit_minutes` is then the
+                        limit of the accounts that have none of their own.
+        user (str): The account whose minutes and limit the reports describe
+                        when `budgets` is given. Defaults to the current one.
+        clock (Callable): Monotonic clock used to measure elapsed time.
+        wall_clock (Callable): Wall clock, compared with process start times.
+        """
+        self.tracked_games = set(tracked_games)
+        self.matcher = GameMatcher(self.tracked_games)
+        self.limit_minutes = limit_minutes
+        self.process_tracker = ProcessTracker(self.matcher, sampler)
+        self.scheduler = scheduler if scheduler is not None else AdaptiveScheduler()
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self.store = store if store is not None else JsonLogStore(log_path)
+        self.history = history
+        self.enforcer = enforcer if enforcer is not None else Enforcer()
+        self.sync = sync
+        self.metrics = metrics if metrics is not None else Metrics(clock=clock)
+        self.date = self.today()
+        self.game_times = self.store.load(self.date)
+        for game in self.matcher.names:
+            self.game_times.setdefault(game, 0)
+        self.budgets = budgets
+        self.user = user if user is not None else current_user()
+        if budgets is not None:
+            budgets.load(self.date)
+        self._last_tick: float | None = None
+        self._next_tick: float | None = None
+        self._last_running: set[str] = set()
+        self._user_running: dict[tuple[str, str], set[int]] = {}
+
+        self.warning_shown = False
+        self.alert_shown = False
+        self._subscribers: list[Callable[[TickReport], None]] = []
+
+        self.events = EventBus()
+        self.events.subscribe(
+            self._enforce_events, GameStarted, MinuteCredited, LimitReached
+        )
+        self.events.subscribe(self._persist_events, MinuteCredited)
+        self.events.subscribe(self._count_events, *EVENT_COUNTERS)
+
+    @classmethod
+    def from_settings(cls, settings: Settings, **kwargs) -> "TrackerEngine":
+        """
+        Build an engine with the store, history, sync client and metrics
+        described by `settings`. Keyword arguments are passed on unchanged.
+        """
+        from usage_history import UsageHistory
+
+        sync = None
+        if settings.sync_url:
+            from sync_service import SyncClient
+
+            sync = SyncClient(
+                settings.sync_url,
+                settings.machine_id,
+                settings.sync_cache_path,
+                token=settings.sync_token,
+            )
+            sync.start()
+        budgets = None
+        if settings.per_user:
+            budgets = UserBudgets(
+                settings.user_limits, settings.limit_minutes, settings.user_log_path
+            )
+        return cls(
+            load_tracked_games(settings.apps_list),
+            settings.limit_minutes,
+            store=make_store(settings.persistence, settings.log_path),
+            history=UsageHistory(settings.history_path),
+            sync=sync,
+            metrics=Metrics(
+                settings.metrics_path, settings.metrics_format, profile=settings.profile
+            ),
+            budgets=budgets,
+            **kwargs,
+        )
+
+    @property
+    def log_path(self) -> Path:
+        return self.store.log_path
+
+    @log_path.setter
+    def log_path(self, value: Path) -> None:
+        self.store.log_path = value
+
+    @property
+    def used_minutes(self) -> float:
+        """Minutes played today, or by `user` with per-account budgets."""
+        if self.budgets is not None:
+            return self.budgets.used_minutes(self.user)
+        used = sum(self.game_times.values())
+        if self.sync is not None:
+            used += self.sync.remote_minutes(self.date)
+        return used
+
+    @property
+    def current_limit(self) -> int:
+        """The limit `used_minutes` is measured against."""
+        if self.budgets is not None:
+            return self.budgets.limit(self.user)
+        return self.limit_minutes
+
+    @property
+    def remaining_seconds(self) -> float:
+        """
+        Seconds until the limit, or until the first account that is playing
+        reaches its own with per-account budgets.
+        """
+        if self.budgets is not None:
+            users = {user for user, _ in self._user_running} or {self.user}
+            return min(self.budgets.remaining_seconds(user) for user in users)
+        return (self.limit_minutes - self.used_minutes) * 60
+
+    def today(self) -> str:
+        """Return the current local date, as stored in the log."""
+        return time.strftime("%Y-%m-%d", time.localtime(self.wall_clock()))
+
+    def subscribe(self, callback: Callable[[TickReport], None]) -> None:
+        """Call `callback` with the TickReport after every tick."""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[TickReport], None]) -> None:
+        self._subscribers.remove(callback)
+
+    def tick(self) -> TickReport:
+        """
+        Run one tracking step.
+
+        This function performs several tasks:
+        - Identifies currently running games and credits each of them with the
+          monotonic time elapsed since the previous tick. A game that started
+          in between is only credited from its oldest process' start time.
+        - Fires the 5-minute warning once when the limit is near.
+        - Terminates tracked games, with their child processes, on every tick
+          while the limit is exhausted, so relaunched games are stopped too.
+        - Records the playtime in the store and notifies subscribers.
+
+        Everything but sampling and accounting is done by the consumers of the
+        events published on this tick.
+
+        Returns:
+            TickReport: What happened on this tick.
+        """
+        with self.metrics.profiling(), self.metrics.time("tick"):
+            report = self._tick()
+        self.metrics.maybe_export()
+        return report
+
+    def _tick(self) -> TickReport:
+        metrics = self.metrics
+        now = self.clock()
+        if self._next_tick is not None:
+            # How late the tick ran, e.g. after the machine slept
+            metrics.set("tick_lag_seconds", max(now - self._next_tick, 0.0))
+        elapsed = self._elapsed(now)
+        self._last_tick = now
+
+        today = self.today()
+        if today != self.date:
+            self.rollover(today)
+
+        with metrics.time("sample"):
+            started, exited = self.process_tracker.update()
+            running = self.process_tracker.running_games()
+        metrics.count("ticks")
+        metrics.count("processes_started", len(started))
+        metrics.count("processes_exited", len(exited))
+        metrics.set("processes", len(self.process_tracker))
+
+        with metrics.time("account"):
+            events = self._transitions(running)
+            if self.budgets is None:
+                events += self._credit(running, elapsed)
+            else:
+                events += self._credit_users(self.budgets, running, elapsed)
+            used_minutes = self.used_minutes
+            alerts, warning, limit_reached = self._limit_events(used_minutes)
+            events += alerts
+
+        self.events.publish(events)
+        if self.history is not None and not any(
+            isinstance(event, MinuteCredited) for event in events
+        ):
+            # Idle ticks still flush what play left buffered, on its interval
+            self.history.record(self.date, {})
+
+        next_interval = self.scheduler.next_interval(
+            len(running),
+            self.remaining_seconds,
+            self.remaining_seconds - WARNING_MINUTES * 60,
+        )
+        self._next_tick = now + next_interval
+        report = TickReport(
+            running,
+            used_minutes,
+            warning,
+            limit_reached,
+            next_interval,
+            dict(self._report_times()),
+            tuple(events),
+        )
+        for callback in list(self._subscribers):
+            callback(report)
+        return report
+
+    def _report_times(self) -> dict[str, float]:
+        if self.budgets is not None:
+            return self.budgets.times.get(self.user, {})
+        return self.game_times
+
+    def _limit_events(self, used_minutes: float) -> tuple[list[Alert], bool, bool]:
+        """
+        Return the warnings and limits that fire on this tick, and whether the
+        warning and the limit fired for the account the reports describe.
+        """
+        if self.budgets is not None:
+            alerts = self.budgets.check_limits()
+            fired = {type(alert) for alert in alerts if alert.user == self.user}
+            return alerts, WarningThreshold in fired, LimitReached in fired
+
+        events: list[Alert] = []
+        warning, limit_reached = self._check_limits(used_minutes)
+        if warning:
+            events.append(WarningThreshold(used_minutes, self.limit_minutes))
+        if limit_reached:
+            events.append(LimitReached(used_minutes, self.limit_minutes))
+        return events, warning, limit_reached
+
+    def _check_limits(self, used_minutes: float) -> tuple[bool, bool]:
+        """Return whether the warning and the limit fire on this tick."""
+        warning = limit_reached = False
+        if used_minutes >= self.limit_minutes - WARNING_MINUTES:
+            warning = not self.warning_shown
+            self.warning_shown = True
+        if used_minutes >= self.limit_minutes:
+            limit_reached = not self.alert_shown
+            self.alert_shown = True
+        return warning, limit_reached
+
+    def _transitions(self, running: dict[str, set[int]]) -> list[Event]:
+        """Return the games that started and stopped since the previous tick."""
+        events: list[Event] = [
+            GameStarted(game, frozenset(pids))
+            for game, pids in running.items()
+            if game not in self._last_running
+        ]
+        events += [GameStopped(game) for game in self._last_running - set(running)]
+        return events
+
+    def _enforce_events(self, events: list[Event]) -> None:
+        """Stop games when time runs out, and keep them stopped."""
+        if not self._last_running:
+            return
+        if self.budgets is None:
+            if self.used_minutes >= self.limit_minutes:
+                with self.metrics.time("enforce"):
+                    self.enforce()
+            return
+        users = self.budgets.over_limit({user for user, _ in self._user_running})
+        if users:
+            with self.metrics.time("enforce"):
+                self.enforce(users)
+
+    def _persist_events(self, events: list[Event]) -> None:
+        deltas: dict[str, float] = {}
+        for event in events:
+            if isinstance(event, MinuteCredited):
+                deltas[event.game] = deltas.get(event.game, 0) + event.seconds
+        with self.metrics.time("persist"):
+            self._persist(deltas)
+
+    def _count_events(self, events: list[Event]) -> None:
+        for event in events:
+            self.metrics.count(EVENT_COUNTERS[type(event)])
+
+    def _persist(self, deltas: dict[str, float]) -> None:
+        """Record this tick's deltas in the store, the history and the sync."""
+        if not self.store.record(self.date, deltas, self.game_times):
+            self.metrics.count("save_failures")
+        if self.budgets is not None and not self.budgets.save():
+            self.metrics.count("save_failures")
+        if self.history is not None:
+            self.history.record(self.date, deltas)
+        if self.sync is not None:
+            self.sync.record(self.date, deltas)
+
+    def _elapsed(self, now: float) -> float:
+        """
+        Seconds since the previous tick.
+
+        The first tick credits nothing, and gaps longer than twice the longest
+        scheduler interval (a suspended machine, a stalled event loop) are
+        capped so that they cannot burn the whole budget at once.
+        """
+        if self._last_tick is None:
+            return 0.0
+        return min(max(now - self._last_tick, 0.0), 2 * self.scheduler.max_interval)
+
+    def _credit(
+        self, running: dict[str, set[int]], elapsed: float
+    ) -> list[MinuteCredited]:
+        """Credit `elapsed` seconds once per running game and return the credits."""
+        events = []
+        for game, pids in running.items():
+            seconds = self._seconds(pids, elapsed, game not in self._last_running)
+            minutes = self.game_times.get(game, 0) + seconds / 60
+            self.game_times[game] = minutes
+            if seconds > 0:
+                events.append(MinuteCredited(self.date, game, seconds, minutes))
+        self._last_running = set(running)
+        return events
+
+    def _credit_users(
+        self, budgets: UserBudgets, running: dict[str, set[int]], elapsed: float
+    ) -> list[MinuteCredited]:
+        """
+        Credit `elapsed` seconds once per account running each game, to the
+        account and to the game's total, and return the credits.
+        """
+        tracker = self.process_tracker
+        user_running: dict[tuple[str, str], set[int]] = {}
+        for game, pids in running.items():
+            for pid in pids:
+                user_running.setdefault((tracker.user(pid), game), set()).add(pid)
+
+        events = []
+        for (user, game), pids in user_running.items():
+            started = (user, game) not in self._user_running
+            seconds = self._seconds(pids, elapsed, started)
+            minutes = budgets.credit(user, game, seconds)
+            self.game_times[game] = self.game_times.get(game, 0) + seconds / 60
+            if seconds > 0:
+                events.append(MinuteCredited(self.date, game, seconds, minutes, user))
+        self._user_running = user_running
+        self._last_running = set(running)
+        return events
+
+    def _seconds(self, pids: set[int], elapsed: float, started: bool) -> float:
+        """
+        Seconds to credit a game for. A game that `started` since the previous
+        tick is only credited from its oldest process' start time.
+        """
+        if not started:
+            return elapsed
+        wall_now = self.wall_clock()
+        entries = [self.process_tracker.entry(pid) for pid in pids]
+        start = min((entry.create_time for entry in entries if entry), default=wall_now)
+        return min(elapsed, max(wall_now - start, 0.0))
+
+    def enforce(self, users: set[str] | None = None) -> EnforcementResult:
+        """
+        Terminate every running tracked game, or only those run by `users`,
+        and their child processes.
+        """
+        tracker = self.process_tracker
+        if users is None:
+            pids = tracker.game_pids()
+        else:
+            pids = {
+                pid
+                for (user, _), game_pids in self._user_running.items()
+                if user in users
+                for pid in game_pids
+            }
+        pids |= tracker.descendants(pids)
+        targets = {}
+        for pid in pids:
+            entry = tracker.entry(pid)
+            if entry is not None:
+                targets[pid] = entry.create_time
+        result = self.enforcer.enforce(targets)
+        self.metrics.count("enforcements")
+        self.metrics.count("processes_killed", len(result.killed))
+        self.metrics.count("enforcement_survivors", len(result.survivors))
+        if result.survivors:
+            print(f"[ERROR] Failed to stop processes: {result.survivors}")
+        return result
+
+    def set_tracked_games(self, tracked_games: Iterable[str]) -> None:
+        """
+        Track a new list of games from now on.
+
+        Playtime already credited today is kept, including that of games that
+        are no longer listed.
+        """
+        self.tracked_games = set(tracked_games)
+        self.matcher = GameMatcher(self.tracked_games)
+        self.process_tracker.set_matcher(self.matcher)
+        for game in self.matcher.names:
+            self.game_times.setdefault(game, 0)
+
+    def set_limit(self, limit_minutes: int) -> None:
+        """
+        Change the daily limit. If it is raised past the time used, the
+        warning and the limit alert can fire again.
+        """
+        self.limit_minutes = limit_minutes
+        if self.budgets is not None:
+            self.budgets.set_limits(self.budgets.limits, limit_minutes)
+            return
+        used_minutes = self.used_minutes
+        if used_minutes < limit_minutes:
+            self.alert_shown = False
+        if used_minutes < limit_minutes - WARNING_MINUTES:
+            self.warning_shown = False
+
+    def set_user_limits(self, limits: dict[str, int]) -> None:
+        """Change the limits of the accounts that have their own."""
+        if self.budgets is not None:
+            self.budgets.set_limits(limits, self.limit_minutes)
+
+    def rollover(self, today: str) -> None:
+        """Close the books on the previous day and start `today` from zero."""
+        self.save()
+        if self.history is not None:
+            self.history.flush()
+        self.date = today
+        self.game_times = {game: 0 for game in self.matcher.names}
+        self.warning_shown = False
+        self.alert_shown = False
+        if self.budgets is not None:
+            self.budgets.rollover(today)
+
+    def save(self) -> None:
+        """Write a full snapshot of the current playtime to the store."""
+        self.store.save(self.date, self.game_times)
+        if self.budgets is not None:
+            self.budgets.save()
+
+    def close(self) -> None:
+        """Save and release the store, the history and the sync client."""
+        self.metrics.export()
+        self.save()
+        self.store.close()
+        if self.history is not None:
+            self.history.close()
+        if self.sync is not None:
+            self.sync.close()
+
+
+class SettingsReloader:
+    """
+    Apply edits of config.json and of the apps list to a running engine.
+
+    `poll` stats both files and re-reads only the one that changed, so it is
+    cheap enough to call before every tick. The limits and the apps list take
+    effect at once; the other settings are only read at startup.
+    """
+
+    def __init__(
+        self, engine: TrackerEngine, settings: Settings, config_file: Path | None
+    ) -> None:
+        """
+        Parameters:
+        engine (TrackerEngine): The engine to update.
+        settings (Settings): The settings the engine was built from.
+        config_file (Path): config.json, or None to only watch the apps list.
+        """
+        self.engine = engine
+        self.settings = settings
+        self.config_file = config_file
+        self._config = FileWatcher(config_file) if config_file is not None else None
+        self._apps_list = FileWatcher(settings.apps_list)
+
+    def poll(self) -> bool:
+        """Reload whatever changed and return True if anything did."""
+        changed = False
+        if self._config is not None and self._config.poll():
+            changed = self._reload_config(self._config)
+        if self._apps_list.poll():
+            self.engine.set_tracked_games(load_tracked_games(self.settings.apps_list))
+            changed = True
+        return changed
+
+    def _reload_config(self, watcher: FileWatcher) -> bool:
+        try:
+            config = load_config(watcher.path)
+        except (json.JSONDecodeError, OSError) as e:
+            # Possibly caught halfway through a save: try again next time
+            print(f"[ERROR] Failed to reload config: {e}")
+            watcher.forget()
+            return False
+
+        settings = Settings.from_config(config, get_base())
+        if settings.limit_minutes != self.settings.limit_minutes:
+            self.engine.set_limit(settings.limit_minutes)
+        if settings.user_limits != self.settings.user_limits:
+            self.engine.set_user_limits(settings.user_limits)
+        if settings.apps_list != self.settings.apps_list:
+            self._apps_list = FileWatcher(settings.apps_list)
+            self.engine.set_tracked_games(load_tracked_games(settings.apps_list))
+        self.settings = settings
+        return True
+
+
+class EngineWorker:
+    """
+    Tick an engine on a background thread.
+
+    Sampling, accounting, enforcement and persistence then never wait for the
+    GUI, so a frozen window or an unanswered dialog does not stop time from
+    being counted. Subscribers are called on the worker thread: a GUI has to
+    hand the reports over to its own thread, e.g. with wx.CallAfter.
+    """
+
+    def __init__(
+        self, engine: TrackerEngine, reloader: SettingsReloader | None = None
+    ) -> None:
+        """
+        Parameters:
+        engine (TrackerEngine): The engine to drive.
+        reloader (SettingsReloader): Polled before every tick, if given.
+        """
+        self.engine = engine
+        self.reloader = reloader
+        self.lock = threading.Lock()  # Held while the engine is in use
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def tick(self) -> TickReport:
+        """Apply the settings that changed and run one tick."""
+        with self.lock:
+            if self.reloader is not None:
+                self.reloader.poll()
+            return self.engine.tick()
+
+    def wake(self) -> None:
+        """Tick as soon as possible instead of waiting for the next interval."""
+        self._wake.set()
+
+    def start(self) -> None:
+        """Tick right away, then every time the engine asks to."""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="TrackerEngine", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop the thread, then save and close the engine."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self.lock:
+            self.engine.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                interval = self.tick().next_interval
+            except Exception as e:  # Keep counting time after a failed tick
+                print(f"[ERROR] Tick failed: {e}")
+                interval = self.engine.scheduler.active_interval
+            self._wake.wait(interval)
+            self._wake.clear()
+
+
+def run(
+    engine: TrackerEngine, interval: float | None = None, ticks: int | None = None
+) -> None:
+    """
+    Drive `engine` forever, or for `ticks` ticks.
+
+    Sleeps for the interval the engine asks for after each tick, or for a fixed
+    `interval` in seconds when one is given.
+    """
+    count = 0
+    while ticks is None or count < ticks:
+        report = engine.tick()
+        count += 1
+        if ticks is None or count < ticks:
+            time.sleep(interval if interval is not None else report.next_interval)
+
+
+def main(argv: list[str] | None = None) -> None:  # pragma: no cover
+    import argparse
+
+    from sync_service import SyncClient
+    from usage_history import UsageHistory
+
+    parser = argparse.ArgumentParser(description="Run the tracker without a GUI.")
+    parser.add_argument("--apps-list", type=Path, default=Path("apps_list.txt"))
+    parser.add_argument("--log-path", type=Path, default=DEFAULT_LOG_PATH)
+    parser.add_argument("--history-path", type=Path, default=None)
+    parser.add_argument("--sync-url", default=None)
+    parser.add_argument("--limit", type=int, default=120)
+    parser.add_argument("--interval", type=float, default=None)
+    parser.add_argument("--ticks", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    history = UsageHistory(args.history_path) if args.history_path else None
+    sync = None
+    if args.sync_url:
+        sync = SyncClient(
+            args.sync_url, cache_path=Settings(log_path=args.log_path).sync_cache_path
+        )
+        sync.start()
+    engine = TrackerEngine(
+        load_tracked_games(args.apps_list),
+        args.limit,
+        args.log_path,
+        history=history,
+        sync=sync,
+    )
+    engine.subscribe(
+        lambda report: print(
+            f"{report.used_minutes:.1f}/{engine.current_limit} min",
+            ", ".join(sorted(report.running)),
+        )
+    )
+    try:
+        run(engine, args.interval, args.ticks)
+    finally:
+        engine.close()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,117 @@
+"""
+tracker_service.py
+
+Service mode of the Game Time Tracker: tracking without a window.
+
+    python game_time_limiter.py --service   track in the background
+    python game_time_limiter.py --status    ask the service, or read the log
+
+The service runs the engine on its worker thread and answers status requests
+on a local socket; wx is never imported, so it stays small and only wakes up
+when the engine ticks. Viewers connect to 127.0.0.1:<status_port>, send one
+line with a command and read one line of JSON back:
+
+    status  ->  {"date": "2025-06-18", "used_minutes": 31.0,
+                 "limit_minutes": 120, "running": ["javaw.exe"],
+                 "game_times": {"javaw.exe": 31.0, ...}, "updated": ...}
+
+With per-account budgets ("per_user" in config.json) the answer also has the
+minutes and limit of every account that played today:
+
+                "users": {"alice": {"used_minutes": 31.0, "limit_minutes": 90}}
+
+The answer is the state after the last tick, so a viewer never touches the
+engine, and closing it never stops tracking. status_client.query_status is
+the viewer side.
+"""
+
+import json
+import socketserver
+import threading
+import time
+from pathlib import Path
+
+from settings import Settings
+from status_client import HOST
+from tracker_engine import EngineWorker, SettingsReloader, TickReport, TrackerEngine
+
+POLL_INTERVAL = 5.0  # Only to notice a shutdown request
+
+
+class StatusBoard:
+    """The state after the last tick, written by the worker thread."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._status: dict = {}
+
+    def update(
+        self,
+        report: TickReport,
+        date: str,
+        limit_minutes: int,
+        users: dict[str, dict] | None = None,
+    ) -> None:
+        status = {
+            "date": date,
+            "used_minutes": report.used_minutes,
+            "limit_minutes": limit_minutes,
+            "running": sorted(report.running),
+            "game_times": report.game_times,
+            "updated": time.time(),
+        }
+        if users is not None:
+            status["users"] = users
+        with self._lock:
+            self._status = status
+
+    def status(self) -> dict:
+        with self._lock:
+            return self._status
+
+
+class StatusHandler(socketserver.StreamRequestHandler):
+    server: "StatusServer"
+
+    def handle(self) -> None:
+        command = self.rfile.readline(64).strip()
+        if command == b"status":
+            reply = self.server.board.status()
+        else:
+            reply = {"error": f"unknown command: {command.decode(errors='replace')}"}
+        self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+
+class StatusServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int, board: StatusBoard) -> None:
+        super().__init__((HOST, port), StatusHandler)
+        self.board = board
+
+
+def serve(settings: Settings, config_file: Path | None = None) -> None:
+    """Track and enforce until interrupted, serving the status to viewers."""
+    try:
+        server = StatusServer(settings.status_port, StatusBoard())
+    except OSError as e:
+        # Most likely another service is already tracking
+        print(f"[ERROR] Failed to open the status socket: {e}")
+        return
+
+    engine = TrackerEngine.from_settings(settings)
+
+    def publish(report: TickReport) -> None:
+        users = engine.budgets.status() if engine.budgets is not None else None
+        server.board.update(report, engine.date, engine.current_limit, users)
+
+    engine.subscribe(publish)
+    worker = EngineWorker(engine, SettingsReloader(engine, settings, config_file))
+    worker.start()
+    try:
+        server.serve_forever(poll_interval=POLL_INTERVAL)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        worker.close()
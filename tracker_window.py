@@ -0,0 +1,372 @@
+"""
+tracker_window.py
+
+The wxPython window of the Game Time Tracker.
+
+It shows the time used today and the playtime per game, and asks for the
+password before closing. All tracking is done by the TrackerEngine built from
+the settings, ticked by an EngineWorker on a background thread; the window
+only redraws when a tick report is posted back to it with wx.CallAfter.
+"""
+
+from pathlib import Path
+
+import wx
+import wx.adv
+
+from settings import Settings, get_base, load_settings
+from tracker_engine import (
+    EngineWorker,
+    SettingsReloader,
+    TickReport,
+    TrackerEngine,
+    load_tracked_games,
+)
+
+
+class GameListModel:
+    """
+    Rows shown in the game list, as (game, whole minutes) pairs.
+
+    Each update is diffed against the previous rows so the list control only
+    redraws the rows whose minutes changed.
+    """
+
+    COLUMNS = ("Game", "Minutes")
+
+    def __init__(self, sort_by: str = "minutes") -> None:
+        """
+        Parameters:
+        sort_by (str): "minutes" to list the most played games first, or "name".
+        """
+        self.sort_by = sort_by
+        self.rows: list[tuple[str, int]] = []
+
+    def update(self, game_times: dict) -> list[int] | None:
+        """
+        Replace the rows with the current playtime.
+
+        Returns:
+            list[int] | None: The indexes of the rows that changed, or None if
+            games were added, removed or reordered and every row needs redrawing.
+        """
+        rows = [(game, int(minutes)) for game, minutes in game_times.items()]
+        if self.sort_by == "minutes":
+            rows.sort(key=lambda row: (-row[1], row[0]))
+        else:
+            rows.sort()
+
+        old_rows, self.rows = self.rows, rows
+        if [game for game, _ in old_rows] != [game for game, _ in rows]:
+            return None
+        return [i for i, (old, new) in enumerate(zip(old_rows, rows)) if old != new]
+
+    def text(self, row: int, column: int) -> str:
+        game, minutes = self.rows[row]
+        if column == 0:
+            return game.removesuffix(".exe")
+        return f"{minutes} min"
+
+
+class GameListCtrl(wx.ListCtrl):
+    """
+    Virtual list of the tracked games and their playtime.
+
+    The control asks for the text of the visible rows only, so the cost of a
+    refresh does not depend on how many games are tracked. Clicking a column
+    header sorts by that column.
+    """
+
+    def __init__(self, parent: wx.Window) -> None:
+        super().__init__(parent, style=wx.LC_REPORT | wx.LC_VIRTUAL | wx.LC_SINGLE_SEL)
+        self.model = GameListModel()
+        self.game_times: dict = {}
+        self.InsertColumn(0, GameListModel.COLUMNS[0], width=200)
+        self.InsertColumn(1, GameListModel.COLUMNS[1], wx.LIST_FORMAT_RIGHT, 90)
+        self.Bind(wx.EVT_LIST_COL_CLICK, self.on_column_click)
+
+    def OnGetItemText(self, item: int, column: int) -> str:
+        return self.model.text(item, column)
+
+    def refresh(self, game_times: dict) -> None:
+        """Redraw the rows that changed since the last refresh."""
+        self.game_times = game_times
+        changed = self.model.update(game_times)
+        if changed is None:
+            self.SetItemCount(len(self.model.rows))
+            self.Refresh()
+        else:
+            for row in changed:
+                self.RefreshItem(row)
+
+    def on_column_click(self, event) -> None:
+        """Sort by name or by playtime, depending on the clicked column."""
+        self.model.sort_by = "name" if event.GetColumn() == 0 else "minutes"
+        self.model.rows = []
+        self.refresh(self.game_times)
+
+
+class GameTimeTracker(wx.Frame):
+    def __init__(
+        self, settings: Settings | None = None, config_file: Path | None = None
+    ) -> None:
+        """
+        Initialize the GameTimeTracker application window.
+
+        Parameters:
+        settings (Settings): The limit, the apps list, the log and the other
+                        options of config.json. Read from config.json if None.
+        config_file (Path): config.json, watched for changes to the limit and
+                        the apps list. Defaults to the one next to the
+                        application when `settings` is not given.
+
+        Initializes various GUI components including a progress bar, toggle button,
+        and game list. Starts a worker thread that ticks the tracking engine
+        at the interval it asks for; each tick report is posted back to the
+        window, which redraws and notifies when the time limit is near.
+        Configures the window layout.
+        """
+
+        super().__init__(None, title="Game Time Tracker", size=wx.Size(350, 300))
+
+        self.base_dir = self.get_base()
+        if settings is None:
+            config_file = config_file or self.base_dir / "config.json"
+            settings = load_settings(config_file)
+        self.engine = TrackerEngine.from_settings(settings)
+        self.limit_minutes = self.engine.current_limit
+        self.reloader = SettingsReloader(self.engine, settings, config_file)
+        self.worker = EngineWorker(self.engine, self.reloader)
+        self.engine.subscribe(self.post_tick)
+        self.report_times: dict = dict(self.engine.game_times)
+        self.drawn_minutes: float | None = None
+        self.notification: wx.adv.NotificationMessage | None = None
+
+        panel = wx.Panel(self)
+        vbox = wx.BoxSizer(wx.VERTICAL)
+
+        # Progress Bar
+        self.progress_bar = wx.Gauge(
+            panel, range=self.limit_minutes, size=wx.Size(320, 25)
+        )
+        vbox.Add(self.progress_bar, flag=wx.ALL | wx.EXPAND, border=10)
+
+        # Toggle Button
+        self.toggle_btn = wx.Button(panel, label="Hide List")
+        self.toggle_btn.Bind(wx.EVT_BUTTON, self.toggle_list)
+        vbox.Add(self.toggle_btn, flag=wx.ALL | wx.EXPAND, border=10)
+
+        # Game List
+        self.game_list = GameListCtrl(panel)
+        vbox.Add(self.game_list, flag=wx.ALL | wx.EXPAND, border=10)
+
+        panel.SetSizer(vbox)
+
+        self.game_list.Hide()  # Initially hide the game list
+        self.SetSize(350, 130)  # Start with the smaller window
+        self.toggle_btn.SetLabel("Show List")
+
+        self.Bind(wx.EVT_CLOSE, self.on_close_attempt)
+
+        self.Show()
+        self.worker.start()  # Runs the first tick at once
+
+    @property
+    def settings(self) -> Settings:
+        return self.reloader.settings
+
+    @property
+    def tracked_games_file(self) -> Path:
+        return self.settings.apps_list
+
+    @property
+    def tracked_games(self) -> set:
+        return self.engine.tracked_games
+
+    @property
+    def game_times(self) -> dict:
+        return self.engine.game_times
+
+    @game_times.setter
+    def game_times(self, value: dict) -> None:
+        self.engine.game_times = value
+
+    @property
+    def log_path(self) -> Path:
+        return self.engine.log_path
+
+    @log_path.setter
+    def log_path(self, value: Path) -> None:
+        self.engine.log_path = value
+
+    def ask_password(self) -> None:
+        """Displays a password prompt before allowing the app to close."""
+        dlg = wx.TextEntryDialog(
+            self,
+            "Enter Admin Password:",
+            "Restricted Access",
+            style=wx.TE_PASSWORD | wx.OK | wx.CANCEL,
+        )
+
+        if dlg.ShowModal() == wx.ID_OK:  # Ensures user can press OK
+            entered_password = dlg.GetValue()
+            dlg.Destroy()
+
+            # Validate the password against the one set in config.json
+            if self.is_password_valid(entered_password, self.settings.password):
+                self.engine.unsubscribe(self.post_tick)  # No reports after this
+                self.worker.close()
+                self.Destroy()  # Close the app
+            else:
+                wx.MessageBox(
+                    "Incorrect Password!", "Access Denied", wx.OK | wx.ICON_ERROR
+                )
+
+        else:
+            dlg.Destroy()  # Close dialog if user cancels
+
+    def get_base(self) -> Path:
+        """
+        Determine the base directory of the application.
+
+        If running as an executable, it is the directory of the executable.
+        If running normally, it is the directory of the script.
+
+        Returns:
+            Path: The base directory of the application.
+        """
+        return get_base()
+
+    @staticmethod
+    def is_password_valid(input_pwd: str, actual_pwd: str) -> bool:
+        """Check if the input password matches the actual password."""
+        return input_pwd == actual_pwd
+
+    def load_tracked_games(self) -> set:
+        """
+        Load tracked games from file.
+
+        Reads the contents of the tracked games file into a set.
+        If the file is missing, an empty set is returned.
+        """
+        return load_tracked_games(self.tracked_games_file)
+
+    def on_close_attempt(self, event):
+        """Intercepts close button clicks and prompts for a password."""
+        self.ask_password()
+
+    def save_game_times(self):
+        """Save the current playtime data to the engine's log file."""
+        with self.worker.lock:
+            self.engine.save()
+
+    def toggle_list(self, event) -> None:
+        """
+        Toggle the visibility of the game list in the application window.
+
+        When the list is shown, the window expands to accommodate it and the button
+        label changes to "Hide List". When the list is hidden, the window shrinks
+        and the button label changes to "Show List".
+
+        Parameters:
+        event: The wxPython event object triggered by the button click.
+        """
+
+        if self.game_list.IsShown():
+            self.game_list.Hide()  # Hide only the list, NOT the button
+            self.SetSize(350, 130)  # Shrink window but keep button visible
+            self.toggle_btn.SetLabel("Show List")
+        else:
+            self.game_list.refresh(self.report_times)  # Catch up while hidden
+            self.game_list.Show()
+            self.SetSize(350, 300)  # Expand window when list is visible
+            self.toggle_btn.SetLabel("Hide List")
+        self.Layout()
+
+    def update_gui(self, event=None) -> None:
+        """
+        Ask the worker thread to tick the tracking engine now.
+
+        The engine samples the running games, credits their playtime, enforces
+        the limit and saves the log on the worker thread, then `on_tick` is
+        called on the GUI thread to refresh the window.
+
+        Parameters:
+        event: Optional wxPython event object triggered by a user interaction.
+        """
+        self.worker.wake()
+
+    def post_tick(self, report: TickReport) -> None:
+        """Hand a tick report from the worker thread over to the GUI thread."""
+        wx.CallAfter(self.on_tick, report)
+
+    def notify(self, message: str, title: str, flags: int) -> None:
+        """
+        Show a desktop notification, which does not wait for an answer.
+        `flags` is a single icon: wx.ICON_INFORMATION, ICON_WARNING or ICON_ERROR.
+        """
+        self.notification = wx.adv.NotificationMessage(title, message, self, flags)
+        self.notification.Show()
+
+    def on_tick(self, report: TickReport) -> None:
+        """
+        Update the graphical user interface of the Game Time Tracker.
+
+        Nothing is redrawn if the tick published no event and the time used
+        and the limit are unchanged. Otherwise this function:
+        - Updates the progress bar to reflect total used minutes.
+        - Sets the window title to show the percentage of time used.
+        - Refreshes the changed rows of the game list, if it is shown.
+        - Notifies when there are 5 minutes left.
+        - Notifies when the time limit is reached.
+
+        The time it takes is kept in the "gui" histogram of the engine metrics.
+        A report that was queued before the window was destroyed is dropped.
+
+        Parameters:
+        report (TickReport): The outcome of the engine tick.
+        """
+        if not self or self.IsBeingDeleted():
+            return
+        with self.engine.metrics.time("gui"):
+            used_minutes = report.used_minutes
+
+            # A tick on which nothing changed has nothing to redraw
+            unchanged = used_minutes == self.drawn_minutes
+            if unchanged and not report.events:
+                if self.engine.current_limit == self.limit_minutes:
+                    return
+            self.drawn_minutes = used_minutes
+
+            # Follow a limit changed in config.json
+            if self.engine.current_limit != self.limit_minutes:
+                self.limit_minutes = self.engine.current_limit
+                self.progress_bar.SetRange(self.limit_minutes)
+
+            # Update progress bar
+            self.progress_bar.SetValue(int(min(used_minutes, self.limit_minutes)))
+
+            # Update percentage in window title
+            percentage_used = (used_minutes / self.limit_minutes) * 100
+            self.SetTitle(f"Game Time Tracker - {percentage_used:.1f}%")
+
+            # Update game list display; a hidden list catches up when shown
+            if self.game_list.IsShown():
+                self.game_list.refresh(report.game_times)
+            self.report_times = report.game_times
+
+            # Show 5-minute warning
+            if report.warning:
+                self.notify(
+                    "Warning: You have 5 minutes left!",
+                    "Time Running Out",
+                    wx.ICON_WARNING,
+                )
+
+            # Games were stopped by the engine when time ran out
+            if report.limit_reached:
+                self.notify(
+                    "Your game time is up for today!",
+                    "Limit Reached",
+                    wx.ICON_ERROR,
+                )
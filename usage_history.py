@@ -0,0 +1,162 @@
+"""
+usage_history.py
+
+Multi-day playtime history kept in SQLite.
+
+There is one row per (date, game) with the minutes played that day. The
+primary key indexes rows by date and a second index covers lookups by game,
+so "the last 7 days per game" stays fast with years of history. Credited time
+is buffered in memory and written in one transaction per flush, so the cost
+of a tick does not depend on the size of the database.
+"""
+
+import argparse
+import datetime
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage (
+    date TEXT NOT NULL,
+    game TEXT NOT NULL,
+    minutes REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (date, game)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS usage_by_game ON usage (game, date);
+"""
+
+UPSERT = """
+INSERT INTO usage (date, game, minutes) VALUES (?, ?, ?)
+ON CONFLICT (date, game) DO UPDATE SET minutes = minutes + excluded.minutes
+"""
+
+
+class UsageHistory:
+    def __init__(
+        self,
+        db_path: Path,
+        flush_interval: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Parameters:
+        db_path (Path): The SQLite database file.
+        flush_interval (float): Seconds to buffer credited time before writing.
+        clock (Callable): Monotonic clock used to time flushes.
+        """
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self._connection: sqlite3.Connection | None = None
+        self._pending: dict[tuple[str, str], float] = {}
+        self._date = ""
+        self._last_flush = clock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Open the database on first use and make sure the schema exists."""
+        if self._connection is None:
+            # Opened by the tick and closed by whoever stops the engine, never
+            # used from two threads at once
+            connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def record(self, date: str, deltas: dict[str, float]) -> None:
+        """
+        Buffer the seconds credited on this tick.
+
+        The buffer is written out every `flush_interval` seconds and whenever
+        the date changes, so each day is closed at midnight.
+        """
+        if date != self._date:
+            if self._date:
+                self.flush()
+            self._date = date
+
+        for game, seconds in deltas.items():
+            if seconds > 0:
+                key = (date, game)
+                self._pending[key] = self._pending.get(key, 0) + seconds / 60
+
+        if self.clock() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered minutes in a single transaction."""
+        self._last_flush = self.clock()
+        if not self._pending:
+            return
+        rows = [
+            (date, game, minutes) for (date, game), minutes in self._pending.items()
+        ]
+        try:
+            with self.connection:
+                self.connection.executemany(UPSERT, rows)
+            self._pending.clear()
+        except sqlite3.Error as e:
+            print(f"[ERROR] Failed to save game history: {e}")
+
+    def close(self) -> None:
+        """Flush and close the database."""
+        self.flush()
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def day(self, date: str) -> dict[str, float]:
+        """Return the minutes played per game on `date`."""
+        self.flush()
+        rows = self.connection.execute(
+            "SELECT game, minutes FROM usage WHERE date = ?", (date,)
+        )
+        return dict(rows.fetchall())
+
+    def last_days(self, days: int, today: str) -> dict[str, dict[str, float]]:
+        """
+        Return the minutes played per game and per date over the last `days`
+        days, ending with `today`.
+        """
+        self.flush()
+        end = datetime.date.fromisoformat(today)
+        start = (end - datetime.timedelta(days=days - 1)).isoformat()
+        rows = self.connection.execute(
+            "SELECT game, date, minutes FROM usage"
+            " WHERE date BETWEEN ? AND ? ORDER BY game, date",
+            (start, today),
+        )
+        history: dict[str, dict[str, float]] = {}
+        for game, date, minutes in rows:
+            history.setdefault(game, {})[date] = minutes
+        return history
+
+    def game(self, game: str, since: str = "") -> dict[str, float]:
+        """Return the minutes played per date for one game."""
+        self.flush()
+        rows = self.connection.execute(
+            "SELECT date, minutes FROM usage WHERE game = ? AND date >= ?"
+            " ORDER BY date",
+            (game, since),
+        )
+        return dict(rows.fetchall())
+
+
+def main(argv: list[str] | None = None) -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(description="Show recent playtime history.")
+    parser.add_argument("db_path", type=Path)
+    parser.add_argument("--days", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    history = UsageHistory(args.db_path)
+    for game, dates in history.last_days(args.days, time.strftime("%Y-%m-%d")).items():
+        print(f"\n[{game}]")
+        for date, minutes in dates.items():
+            print(f"{date} - {minutes:.0f} min")
+    history.close()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
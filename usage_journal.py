@@ -0,0 +1,322 @@
+"""
+usage_journal.py
+
+Append-only playtime journal with periodic compaction into a JSON snapshot.
+
+The snapshot keeps the format of GameTimeLog.json, so load_game_times can
+still read it, and adds the generation of the journal that continues it. Each
+tick appends a few fixed-width text records to the journal next to it:
+
+    D 2025-06-18 0000002a   journal header: day and generation
+    N 0003 javaw.exe        declares game id 3
+    + 0003 000060.000       credits game 3 with 60 seconds
+
+On startup the snapshot is loaded and the journal replayed on top of it if
+their generations match. A record torn by a crash has no trailing newline and
+is ignored. Compaction writes a new snapshot atomically (temp file, fsync,
+rename) with the next generation and only then starts a fresh journal, so a
+crash between the two steps never counts a journal twice.
+
+The plain JSON log store and make_store live here as well, so reading the
+playtime (`--status`) does not import the engine.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Protocol, TextIO
+
+
+def atomic_write_json(path: Path, data: dict) -> None:
+    """Write `data` to `path` through a temporary file and an atomic rename."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("w") as file:
+        json.dump(data, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_game_times(log_path: Path, today: str | None = None) -> dict:
+    """
+    Load playtime from file.
+
+    Reads the contents of the log file into a dictionary with game names as
+    keys and playtime in minutes as values. If the file is missing, or `today`
+    is given and the log is dated another day, an empty dictionary is returned.
+    """
+    if log_path.exists():
+        try:
+            with log_path.open("r") as file:
+                data = json.load(file)
+        except (json.JSONDecodeError, OSError):
+            return {}
+        if today is not None and data.get("date", today) != today:
+            return {}
+        return data.get("game_times", {})
+    return {}
+
+
+class Store(Protocol):
+    """Where the engine loads today's playtime from and records it to."""
+
+    log_path: Path
+
+    def load(self, today: str) -> dict:
+        """Return the playtime of `today` to continue from."""
+
+    def read(self, today: str) -> dict:
+        """Return the playtime of `today` without writing anything."""
+
+    def record(self, date: str, deltas: dict[str, float], game_times: dict) -> bool:
+        """Record the seconds credited on a tick; False if it failed."""
+
+    def save(self, date: str, game_times: dict) -> bool:
+        """Write a full snapshot of the playtime; False if it failed."""
+
+    def close(self) -> None:
+        """Write what is pending and release the files."""
+
+
+class UsageJournal:
+    def __init__(
+        self,
+        log_path: Path,
+        max_bytes: int = 64 * 1024,
+        sync_interval: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Parameters:
+        log_path (Path): The snapshot file; the journal lives next to it.
+        max_bytes (int): Compact once the journal grows past this size.
+        sync_interval (float): Minimum seconds between two fsyncs of the journal.
+                        Records are flushed to the OS on every write, so only a
+                        power cut can lose them, and at most this many seconds.
+        clock (Callable): Monotonic clock used to batch fsyncs.
+        """
+        self.log_path = log_path
+        self.max_bytes = max_bytes
+        self.sync_interval = sync_interval
+        self.clock = clock
+
+        self.date = ""
+        self.generation = 0
+        self.game_times: dict[str, float] = {}
+        self._ids: dict[str, int] = {}
+        self._file: TextIO | None = None
+        self._size = 0
+        self._last_sync = 0.0
+
+    @property
+    def journal_path(self) -> Path:
+        return self.log_path.with_suffix(".journal")
+
+    def read(self, today: str) -> dict:
+        """
+        Rebuild the playtime of `today` from the snapshot and the journal,
+        without writing anything.
+
+        If the stored data belongs to another day, an empty dictionary is
+        returned.
+        """
+        self._read_snapshot()
+        self._replay()
+        if self.date != today:
+            self.date = today
+            self.game_times = {}
+        return dict(self.game_times)
+
+    def load(self, today: str) -> dict:
+        """
+        Rebuild the playtime of `today` and start a fresh journal for it.
+
+        If the stored data belongs to another day, it is compacted away and an
+        empty dictionary is returned.
+        """
+        self.read(today)
+        try:
+            self.compact()
+        except OSError as e:
+            print(f"[ERROR] Failed to save game times: {e}")
+        return dict(self.game_times)
+
+    def record(self, date: str, deltas: dict[str, float], game_times: dict) -> bool:
+        """
+        Append the seconds credited on this tick to the journal.
+
+        A new `date` rolls the journal over to a fresh day first. Returns False
+        if the journal could not be written.
+        """
+        try:
+            if date != self.date:
+                self.date = date
+                self.game_times = {}
+                self.compact()
+
+            records = []
+            for game, seconds in deltas.items():
+                if seconds <= 0:
+                    continue
+                if game not in self._ids:
+                    self._ids[game] = len(self._ids)
+                    records.append(f"N {self._ids[game]:04x} {game}\n")
+                records.append(f"+ {self._ids[game]:04x} {seconds:010.3f}\n")
+                self.game_times[game] = self.game_times.get(game, 0) + seconds / 60
+            if records:
+                self._append("".join(records))
+
+            if self._size > self.max_bytes:
+                self.compact()
+        except OSError as e:
+            print(f"[ERROR] Failed to save game times: {e}")
+            return False
+        return True
+
+    def save(self, date: str, game_times: dict) -> bool:
+        """Replace the stored playtime with `game_times` and compact."""
+        self.date = date
+        self.game_times = dict(game_times)
+        try:
+            self.compact()
+        except OSError as e:
+            print(f"[ERROR] Failed to save game times: {e}")
+            return False
+        return True
+
+    def compact(self) -> None:
+        """Fold the journal into a new snapshot and start an empty journal."""
+        self._close_file()
+        self.generation += 1
+        atomic_write_json(
+            self.log_path,
+            {
+                "date": self.date,
+                "game_times": self.game_times,
+                "journal": self.generation,
+            },
+        )
+        self._ids = {}
+        self._file = self.journal_path.open("w")
+        self._size = 0
+        self._append(f"D {self.date} {self.generation:08x}\n")
+        self._sync()
+
+    def close(self) -> None:
+        """Flush and fsync any pending records."""
+        if self._file is not None:
+            self._sync()
+            self._close_file()
+
+    def _append(self, text: str) -> None:
+        if self._file is None:
+            self._file = self.journal_path.open("a")
+        self._file.write(text)
+        self._file.flush()
+        self._size += len(text)
+        if self.clock() - self._last_sync >= self.sync_interval:
+            self._sync()
+
+    def _sync(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._last_sync = self.clock()
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _read_snapshot(self) -> None:
+        try:
+            with self.log_path.open("r") as file:
+                data = json.load(file)
+        except (json.JSONDecodeError, OSError):
+            data = {}
+        self.date = data.get("date", "")
+        self.game_times = dict(data.get("game_times", {}))
+        self.generation = data.get("journal", 0)
+
+    def _parse_header(self, line: str) -> str | None:
+        """Return the journal's date if it continues the current snapshot."""
+        try:
+            kind, date, generation = line.split(" ")
+            if kind == "D" and int(generation, 16) == self.generation:
+                return date
+        except ValueError:
+            pass
+        return None  # Unreadable, or already folded into the snapshot
+
+    def _replay(self) -> None:
+        """Apply the journal records that continue the current snapshot."""
+        try:
+            with self.journal_path.open("r") as file:
+                lines = file.read().split("\n")
+        except OSError:
+            return
+
+        # The last element is an empty string, or a record torn by a crash
+        lines = lines[:-1]
+        date = self._parse_header(lines[0]) if lines else None
+        if date is None:
+            return
+
+        self.date = date
+        names: dict[str, str] = {}
+        for line in lines[1:]:
+            try:
+                kind, game_id, value = line.split(" ", 2)
+                if kind == "N":
+                    names[game_id] = value
+                elif kind == "+" and game_id in names:
+                    game = names[game_id]
+                    minutes = float(value) / 60
+                    self.game_times[game] = self.game_times.get(game, 0) + minutes
+            except ValueError:
+                break
+
+
+class JsonLogStore:
+    """Persist playtime by rewriting the whole JSON log on every tick."""
+
+    def __init__(self, log_path: Path) -> None:
+        self.log_path = log_path
+
+    def load(self, today: str) -> dict:
+        return load_game_times(self.log_path, today)
+
+    def read(self, today: str) -> dict:
+        return load_game_times(self.log_path, today)
+
+    def record(self, date: str, deltas: dict[str, float], game_times: dict) -> bool:
+        return self.save(date, game_times)
+
+    def save(self, date: str, game_times: dict) -> bool:
+        """
+        Save the current playtime data to a log file.
+
+        This function writes the current date and playtime data for each tracked
+        game to a JSON log file. The log file is stored at the specified log path
+        and replaced atomically, so a crash never leaves a half-written log.
+        Returns False if the log could not be written.
+        """
+        try:
+            atomic_write_json(self.log_path, {"date": date, "game_times": game_times})
+        except (OSError, PermissionError) as e:
+            print(f"[ERROR] Failed to save game times: {e}")
+            return False
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+def make_store(persistence: str, log_path: Path) -> Store:
+    """Return the playtime store for a `persistence` mode: "json" or "journal"."""
+    if persistence == "journal":
+        return UsageJournal(log_path)
+    if persistence == "json":
+        return JsonLogStore(log_path)
+    raise ValueError(f"Unknown persistence mode: {persistence!r}")
@@ -0,0 +1,250 @@
+"""
+usage_report.py
+
+Usage reports over the playtime history of one or more computers.
+
+Usage:
+    python usage_report.py GameTimeHistory.db [laptop.db ...] [--since DATE]
+                           [--until DATE] [--limit 120] [--rollup week]
+                           [--csv usage.csv]
+
+The history is loaded into a NumPy matrix of days x games: one row per day
+from the first date to the last, days without play included as zeros, and
+one column per game. The histories of several computers are added up. Rollups,
+percentiles, trends and over-limit streaks are computed on whole columns, so
+a report over years of history stays interactive.
+"""
+
+import argparse
+import csv
+import sqlite3
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
+PERIODS = ("day", "week", "month", "year")
+PERCENTILES = (50, 90, 99)
+MONDAY = np.datetime64("1969-12-29")  # Weeks are counted from a Monday
+
+
+def write_csv(path: Path, labels: list[str], games: list[str], minutes) -> None:
+    """Write one row per label with the minutes of each game and the total."""
+    totals = minutes.sum(axis=1)
+    with path.open("w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["date", *games, "total"])
+        for label, row, total in zip(labels, np.round(minutes, 1).tolist(), totals):
+            writer.writerow([label, *row, round(float(total), 1)])
+
+
+class Streak(NamedTuple):
+    """Consecutive days on which the limit was reached."""
+
+    start: str
+    end: str
+    days: int
+
+
+class Rollup(NamedTuple):
+    """Minutes per game summed over weeks, months or years."""
+
+    periods: list[str]  # First day of each period
+    games: list[str]
+    minutes: np.ndarray  # periods x games
+    days: np.ndarray  # Days of history in each period
+
+    def per_day(self) -> np.ndarray:
+        """Average minutes per day of each game in each period."""
+        return self.minutes / self.days[:, np.newaxis]
+
+    def to_csv(self, path: Path) -> None:
+        write_csv(path, self.periods, self.games, self.minutes)
+
+
+class UsageMatrix:
+    def __init__(self, dates: np.ndarray, games: list[str], minutes: np.ndarray):
+        """
+        Parameters:
+        dates (np.ndarray): The consecutive days of the rows, as datetime64[D].
+        games (list[str]): The game of each column.
+        minutes (np.ndarray): Minutes played, days x games.
+        """
+        self.dates = dates
+        self.games = games
+        self.minutes = minutes
+
+    @classmethod
+    def from_rows(
+        cls, dates: Iterable[str], games: Iterable[str], minutes: Iterable[float]
+    ) -> "UsageMatrix":
+        """Build the matrix from (date, game, minutes) columns, summing repeats."""
+        days = np.asarray(list(dates), dtype="datetime64[D]")
+        values = np.asarray(list(minutes), dtype=float)
+        if not len(days):
+            return cls(np.array([], dtype="datetime64[D]"), [], np.zeros((0, 0)))
+        names, columns = np.unique(np.asarray(list(games)), return_inverse=True)
+        start = days.min()
+        rows = (days - start).astype(int)
+        matrix = np.zeros((rows.max() + 1, len(names)))
+        np.add.at(matrix, (rows, columns), values)
+        return cls(start + np.arange(len(matrix)), names.tolist(), matrix)
+
+    @classmethod
+    def load(
+        cls, db_paths: Iterable[Path], since: str = "", until: str = "9999-12-31"
+    ) -> "UsageMatrix":
+        """Load and add up the history databases of one or more computers."""
+        dates: list[str] = []
+        games: list[str] = []
+        minutes: list[float] = []
+        for db_path in db_paths:
+            # Read-only, so a report never locks out a running tracker
+            uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+            connection = sqlite3.connect(uri, uri=True)
+            try:
+                rows = connection.execute(
+                    "SELECT date, game, minutes FROM usage"
+                    " WHERE date BETWEEN ? AND ?",
+                    (since, until),
+                ).fetchall()
+            finally:
+                connection.close()
+            if rows:
+                row_dates, row_games, row_minutes = zip(*rows)
+                dates += row_dates
+                games += row_games
+                minutes += row_minutes
+        return cls.from_rows(dates, games, minutes)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def totals(self) -> np.ndarray:
+        """Minutes played per day, all games together."""
+        return self.minutes.sum(axis=1)
+
+    def labels(self) -> list[str]:
+        return self.dates.astype(str).tolist()
+
+    def rollup(self, period: str) -> Rollup:
+        """Sum the minutes per "day", "week" (from Monday), "month" or "year"."""
+        if period == "day":
+            return Rollup(self.labels(), self.games, self.minutes, np.ones(len(self)))
+        if period == "week":
+            keys = MONDAY + (self.dates - MONDAY) // 7 * 7
+        elif period in ("month", "year"):
+            keys = self.dates.astype(f"datetime64[{period[0].upper()}]")
+        else:
+            raise ValueError(f"Unknown period: {period!r}")
+        starts, inverse = np.unique(keys, return_inverse=True)
+        minutes = np.zeros((len(starts), len(self.games)))
+        np.add.at(minutes, inverse, self.minutes)
+        days = np.bincount(inverse, minlength=len(starts))
+        labels = starts.astype("datetime64[D]").astype(str).tolist()
+        return Rollup(labels, self.games, minutes, days)
+
+    def percentiles(self, q: Iterable[float] = PERCENTILES) -> np.ndarray:
+        """Percentiles of the daily minutes, one row per `q` and column per game."""
+        return np.percentile(self.minutes, list(q), axis=0)
+
+    def trend(self) -> np.ndarray:
+        """How many more minutes a day each game is played every week."""
+        if len(self) < 2:
+            return np.zeros(len(self.games))
+        slope = np.polyfit(np.arange(len(self)), self.minutes, 1)[0]
+        return slope * 7
+
+    def over_limit(self, limit_minutes: float) -> np.ndarray:
+        """Whether the daily limit was reached, per day."""
+        return self.totals >= limit_minutes
+
+    def streaks(self, limit_minutes: float) -> list[Streak]:
+        """Every run of consecutive days on which the limit was reached."""
+        flags = np.concatenate(([0], self.over_limit(limit_minutes), [0]))
+        edges = np.flatnonzero(np.diff(flags.astype(np.int8)))
+        starts, ends = edges[::2], edges[1::2]  # `ends` is exclusive
+        dates = self.labels()
+        return [
+            Streak(dates[start], dates[end - 1], int(end - start))
+            for start, end in zip(starts, ends)
+        ]
+
+    def to_csv(self, path: Path) -> None:
+        write_csv(path, self.labels(), self.games, self.minutes)
+
+
+def summary(matrix: UsageMatrix, limit_minutes: float) -> list[str]:
+    """Return the lines of the report printed by the command line."""
+    labels = matrix.labels()
+    first, last = labels[0], labels[-1]
+    totals = matrix.totals
+    p50, p90, p99 = np.percentile(totals, PERCENTILES)
+    lines = [
+        f"{first} - {last}: {len(matrix)} days, {len(matrix.games)} games",
+        f"Per day: {totals.mean():.0f} min on average,"
+        f" p50 {p50:.0f}, p90 {p90:.0f}, p99 {p99:.0f}",
+    ]
+
+    streaks = matrix.streaks(limit_minutes)
+    days_over = int(matrix.over_limit(limit_minutes).sum())
+    lines.append(f"Days at the {limit_minutes} min limit: {days_over}")
+    if streaks:
+        longest = max(streaks, key=lambda streak: streak.days)
+        lines.append(
+            f"Longest streak: {longest.days} days" f" ({longest.start} - {longest.end})"
+        )
+
+    lines.append("")
+    lines.append(f"{'Game':<28}{'Total':>8}{'Avg':>6}{'p90':>6}{'Trend/wk':>10}")
+    sums = matrix.minutes.sum(axis=0)
+    means = matrix.minutes.mean(axis=0)
+    p90s = matrix.percentiles([90])[0]
+    trends = matrix.trend()
+    for i in np.argsort(-sums, kind="stable"):
+        name = matrix.games[i].removesuffix(".exe")[:27]
+        lines.append(
+            f"{name:<28}{sums[i]:>8.0f}{means[i]:>6.0f}{p90s[i]:>6.0f}"
+            f"{trends[i]:>+10.1f}"
+        )
+    return lines
+
+
+def main(argv: list[str] | None = None) -> None:  # pragma: no cover
+    from settings import load_settings
+
+    parser = argparse.ArgumentParser(description="Report playtime over time.")
+    parser.add_argument("db_paths", type=Path, nargs="+")
+    parser.add_argument("--since", default="")
+    parser.add_argument("--until", default="9999-12-31")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--rollup", choices=PERIODS, default="week")
+    parser.add_argument("--csv", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    limit = args.limit if args.limit is not None else load_settings().limit_minutes
+    try:
+        matrix = UsageMatrix.load(args.db_paths, args.since, args.until)
+    except sqlite3.Error as e:
+        print(f"[ERROR] Failed to read game history: {e}")
+        return
+    if not len(matrix):
+        print("No playtime recorded.")
+        return
+
+    print("\n".join(summary(matrix, limit)))
+    rollup = matrix.rollup(args.rollup)
+    print(f"\n{args.rollup.capitalize():<12}{'Total':>8}{'Per day':>9}")
+    for period, total, days in zip(
+        rollup.periods, rollup.minutes.sum(axis=1), rollup.days
+    ):
+        print(f"{period:<12}{total:>8.0f}{total / days:>9.0f}")
+
+    if args.csv is not None:
+        rollup.to_csv(args.csv)
+        print(f"\nWrote {args.csv}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
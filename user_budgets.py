@@ -0,0 +1,148 @@
+"""
+user_budgets.py
+
+Per-account playtime budgets for game_time_limiter.
+
+On a shared computer every account gets its own daily limit: playtime is
+credited per (username, game), and the warning, the limit and enforcement
+apply to each account separately, so one player cannot use up another's
+time. The engine still takes a single sample of the process table per tick;
+the account of each game process is looked up once and cached.
+
+Today's minutes per account are kept in a JSON file next to the playtime log:
+
+    {"date": "2025-06-18",
+     "users": {"alice": {"javaw.exe": 31.0}, "bob": {"steam.exe": 12.5}}}
+"""
+
+import getpass
+import json
+from pathlib import Path
+
+from events import Alert, LimitReached, WarningThreshold
+from usage_journal import atomic_write_json
+
+WARNING_MINUTES = 5
+
+
+def current_user() -> str:
+    """Return the name of the account this process runs as, or ""."""
+    try:
+        return getpass.getuser()
+    except (ImportError, KeyError, OSError):
+        return ""
+
+
+class UserBudgets:
+    """Today's playtime, limit and alerts of each account."""
+
+    def __init__(
+        self,
+        limits: dict[str, int],
+        default_limit: int = 120,
+        log_path: Path | None = None,
+    ) -> None:
+        """
+        Parameters:
+        limits (dict[str, int]): Daily limit in minutes of each account.
+        default_limit (int): The limit of accounts that are not listed.
+        log_path (Path): Where today's minutes per account are kept, or None
+                        to keep them in memory only.
+        """
+        self.limits = dict(limits)
+        self.default_limit = default_limit
+        self.log_path = log_path
+        self.date = ""
+        self.times: dict[str, dict[str, float]] = {}
+        self._warned: set[str] = set()
+        self._alerted: set[str] = set()
+
+    def load(self, today: str) -> None:
+        """Start `today` with the minutes saved earlier that day, if any."""
+        self.date = today
+        self.times = {}
+        if self.log_path is None or not self.log_path.exists():
+            return
+        try:
+            with self.log_path.open("r") as file:
+                data = json.load(file)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"[ERROR] Failed to load user times: {e}")
+            return
+        if data.get("date") == today:
+            self.times = data.get("users", {})
+
+    def save(self) -> bool:
+        """Write today's minutes per account. Returns False if it failed."""
+        if self.log_path is None:
+            return True
+        try:
+            atomic_write_json(self.log_path, {"date": self.date, "users": self.times})
+        except OSError as e:
+            print(f"[ERROR] Failed to save user times: {e}")
+            return False
+        return True
+
+    def rollover(self, today: str) -> None:
+        """Start `today` from zero. The previous day has to be saved first."""
+        self.date = today
+        self.times = {}
+        self._warned.clear()
+        self._alerted.clear()
+
+    def limit(self, user: str) -> int:
+        return self.limits.get(user, self.default_limit)
+
+    def used_minutes(self, user: str) -> float:
+        return sum(self.times.get(user, {}).values())
+
+    def remaining_seconds(self, user: str) -> float:
+        return (self.limit(user) - self.used_minutes(user)) * 60
+
+    def credit(self, user: str, game: str, seconds: float) -> float:
+        """Credit `user` with `seconds` of `game` and return their minutes of it."""
+        games = self.times.setdefault(user, {})
+        minutes = games.get(game, 0) + seconds / 60
+        games[game] = minutes
+        return minutes
+
+    def check_limits(self) -> list[Alert]:
+        """Return the warnings and limits that fire on this tick, per account."""
+        events: list[Alert] = []
+        for user in sorted(self.times):
+            used, limit = self.used_minutes(user), self.limit(user)
+            if used >= limit - WARNING_MINUTES and user not in self._warned:
+                self._warned.add(user)
+                events.append(WarningThreshold(used, limit, user))
+            if used >= limit and user not in self._alerted:
+                self._alerted.add(user)
+                events.append(LimitReached(used, limit, user))
+        return events
+
+    def over_limit(self, users: set[str]) -> set[str]:
+        """Return which of `users` have no time left today."""
+        return {user for user in users if self.used_minutes(user) >= self.limit(user)}
+
+    def set_limits(self, limits: dict[str, int], default_limit: int) -> None:
+        """
+        Change the limits. The warning and the limit alert can fire again for
+        accounts whose limit was raised past the time they used.
+        """
+        self.limits = dict(limits)
+        self.default_limit = default_limit
+        for user in set(self._warned) | self._alerted:
+            used, limit = self.used_minutes(user), self.limit(user)
+            if used < limit:
+                self._alerted.discard(user)
+            if used < limit - WARNING_MINUTES:
+                self._warned.discard(user)
+
+    def status(self) -> dict[str, dict]:
+        """Today's minutes and limit of every account that played."""
+        return {
+            user: {
+                "used_minutes": self.used_minutes(user),
+                "limit_minutes": self.limit(user),
+            }
+            for user in sorted(self.times)
+        }